@@ -52,8 +52,16 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [
+                (
+                    'django.template.loaders.cached.Loader',
+                    [
+                        'django.template.loaders.filesystem.Loader',
+                        'django.template.loaders.app_directories.Loader',
+                    ],
+                ),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -73,7 +81,47 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'OPTIONS': {
+            # BEGIN IMMEDIATE: scriitorii asteapta lock-ul (busy_timeout) in loc sa
+            # esueze cu "database is locked" cand o tranzactie de citire devine de scriere
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # RequestLog si tabela de cache sunt scrise la fiecare request; in fisiere
+    # separate nu mai concureaza pentru lock-ul de scriere al bazei principale
+    'analytics': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'analytics.sqlite3',
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    },
+    'cache': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'cache.sqlite3',
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    },
+    # snapshot read-only al bazei principale, reimprospatat de scheduler
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'PRAGMAS': {'journal_mode': None, 'query_only': True},
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ["hardware.routers.DatabaseRouter"]
+
+CATALOG_READ_REPLICA = False
+CATALOG_SNAPSHOT_MINUTES = 10
+CATALOG_SNAPSHOT_MAX_AGE_SECONDS = 60 * 30
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+    "foreign_keys": True,
 }
 
 CACHES = {
@@ -81,9 +129,52 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.db.DatabaseCache",
         "LOCATION": "django_cache",
         "TIMEOUT": 60 * 60,
-    }
+        # versiunile (pagini, permisiuni, blog) sunt re-create la lipsă, dar un cull
+        # le invalidează pe toate odată; limita implicită de 300 e prea mică
+        "OPTIONS": {"MAX_ENTRIES": 200000, "CULL_FREQUENCY": 10},
+    },
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "hardware-local",
+        "TIMEOUT": 60,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    # incr e atomic doar în LocMem, care e per proces; pentru limite comune între
+    # procese aliasul trebuie mutat pe Redis/Memcached (și RATELIMIT_PROCESSES = 1)
+    "ratelimit": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "hardware-ratelimit",
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    },
+}
+
+# (limită, fereastră în secunde) pentru fiecare scop: ip, username, global.
+# Contoarele sunt per proces: cu N workeri și balansare round-robin fiecare vede ~1/N
+# din cereri, deci limitele de mai jos (totalul dorit) se împart la RATELIMIT_PROCESSES.
+# Nici limita "global" nu e comună între procese; e o aproximare, nu o garanție.
+RATELIMIT_CACHE_ALIAS = "ratelimit"
+RATELIMIT_PROCESSES = 1
+RATELIMITS = {
+    "login": {"ip": (30, 300), "username": (10, 300), "global": (600, 60)},
+    "contact": {"ip": (5, 600), "global": (120, 60)},
+    "register": {"ip": (5, 60 * 60), "global": (60, 60)},
 }
 
+# Adresele proxy-urilor proprii (ex. nginx): doar de la ele se acceptă X-Forwarded-For.
+# Fără proxy lista rămâne goală și IP-ul clientului e REMOTE_ADDR.
+TRUSTED_PROXIES = []
+
+# Sesiuni: L2 "default" + tabela django_session scrisă asincron. L1 "local" (per proces)
+# e oprit: un logout sau un coș salvat de alt worker nu l-ar invalida. Se poate activa
+# (SESSION_LOCAL_TIMEOUT > 0) doar cu un singur proces.
+SESSION_ENGINE = "hardware.sessions"
+SESSION_CACHE_ALIAS = "default"
+SESSION_LOCAL_CACHE_ALIAS = "local"
+SESSION_LOCAL_TIMEOUT = 0
+SESSION_WRITE_BEHIND = True
+SESSION_WRITE_BEHIND_SECONDS = 2
+SESSION_WRITE_BEHIND_MAX_PENDING = 500
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -122,20 +213,59 @@ LOGIN_REDIRECT_URL = "accounts:profile"
 N_MAX_403 = 5
 
 CLEANUP_UNCONFIRMED_MINUTES = 2
+CLEANUP_UNCONFIRMED_CHUNK_SIZE = 1000
 NEWSLETTER_DAY = "marti"
 NEWSLETTER_HOUR = 10
 NEWSLETTER_MIN_AGE_MINUTES = 30
+NEWSLETTER_BATCH_SIZE = 100
+NEWSLETTER_WORKERS = 2
+NEWSLETTER_RATE_LIMIT = 20
 LOG_CLEANUP_INTERVAL_MINUTES = 15
+TOKEN_PURGE_INTERVAL_MINUTES = 60
+ONE_TIME_TOKEN_HOURS = {"confirmare_email": 48}
 REQUESTLOG_RETENTION_DAYS = 14
 PROMO_CLEANUP_DAY = "vineri"
 PROMO_CLEANUP_HOUR = 9
 FEEDBACK_CHECK_INTERVAL_MINUTES = 5
+FEEDBACK_BATCH_SIZE = 200
+PRODUCT_VIEW_FLUSH_INTERVAL_MINUTES = 1
+PRODUCT_OF_DAY_WARM_INTERVAL_MINUTES = 10
+OUTBOX_DRAIN_INTERVAL_MINUTES = 1
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_WORKERS = 2
+OUTBOX_RATE_LIMIT = 20
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE_SECONDS = 60
+OUTBOX_RETRY_MAX_SECONDS = 60 * 60 * 6
+OUTBOX_RETENTION_DAYS = 7
+PROMOTION_ENQUEUE_CHUNK_SIZE = 1000
+RECOMMENDATIONS_REBUILD_MINUTES = 60 * 6
+SCHEDULER_WORKERS = 4
+SCHEDULER_TASK_TIMEOUT_SECONDS = 60 * 10
+SCHEDULER_RETRY_SECONDS = 60 * 5
+SCHEDULER_MAX_SLEEP_SECONDS = 60 * 5
 
 PROFILE_CACHE_SECONDS = 60 * 60 * 24 * 5
+PERMISSION_CACHE_SECONDS = 60 * 60 * 24
+PAGE_CACHE_COMPRESS_MIN_BYTES = 1024
 PER_PAGE_CACHE_SECONDS = 60 * 60 * 24 * 7
+BLOG_PER_PAGE = 10
+BLOG_CACHE_SECONDS = 60 * 60 * 24
+BLOG_FRAGMENT_SECONDS = 60 * 60 * 24
 VIZ_PROD = 4
+# Inelul de produse văzute și rezumatele lor sunt ținute și în L1 "local" (per proces),
+# ca tagul recent_views să nu facă nicio interogare pe cache cald. Procesul care
+# înregistrează vizualizarea sau modifică produsul își actualizează L1 imediat; celelalte
+# procese văd modificarea după cel mult atâtea secunde. 0 = doar cache-ul comun.
+RECENT_VIEWS_LOCAL_CACHE_ALIAS = "local"
+RECENT_VIEWS_LOCAL_TIMEOUT = 30
 EUR_RATE = 4.95
 SITE_URL = "http://localhost:8000"
+SITEMAP_ROOT = BASE_DIR / "sitemaps"
+SITEMAP_GZIP = True
+SITEMAP_MAX_URLS = 50000
+SITEMAP_BUILD_MINUTES = 30
+TEMPLATE_WARMUP = not DEBUG
 
 
 ADMINS = [
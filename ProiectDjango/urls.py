@@ -1,22 +1,17 @@
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap
 from django.urls import include, path
 
 from accounts import views as accounts_views
-from hardware import sitemaps as hardware_sitemaps
-
-sitemaps = {
-    "static": hardware_sitemaps.StaticViewSitemap,
-    "categories": hardware_sitemaps.CategorySitemap,
-    "brands": hardware_sitemaps.BrandSitemap,
-    "posts": hardware_sitemaps.PostSitemap,
-    "products": hardware_sitemaps.product_sitemap,
-    "tutorials": hardware_sitemaps.tutorial_sitemap,
-}
+from hardware import views as hardware_views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="sitemap"),
+    path("sitemap.xml", hardware_views.sitemap_file, name="sitemap"),
+    path(
+        "sitemap-<slug:section>-<int:page>.xml",
+        hardware_views.sitemap_file,
+        name="sitemap_section",
+    ),
     path("confirma_mail/<str:code>/", accounts_views.confirm_email, name="confirm_email"),
     path("blog/", include("core.urls")),
     path("cont/", include("accounts.urls")),
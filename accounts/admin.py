@@ -2,11 +2,13 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
 
-from .models import User
+from hardware.permissions import user_in_group
+
+from .models import OneTimeToken, User
 
 
 def _is_moderator(user: User) -> bool:
-    return user.is_authenticated and user.groups.filter(name="Moderatori").exists()
+    return user_in_group(user, "Moderatori")
 
 
 @admin.register(User)
@@ -26,7 +28,6 @@ class CustomUserAdmin(UserAdmin):
                     "birth_date",
                     "newsletter_opt_in",
                     "email_confirmat",
-                    "cod",
                     "blocat",
                 )
             },
@@ -65,7 +66,6 @@ class CustomUserAdmin(UserAdmin):
                     "birth_date",
                     "newsletter_opt_in",
                     "email_confirmat",
-                    "cod",
                     "blocat",
                 ),
             },
@@ -112,3 +112,11 @@ class CustomUserAdmin(UserAdmin):
         if user.groups.filter(name="Moderatori").exists() and not user.is_staff:
             user.is_staff = True
             user.save(update_fields=["is_staff"])
+
+
+@admin.register(OneTimeToken)
+class OneTimeTokenAdmin(admin.ModelAdmin):
+    list_display = ("user", "purpose", "created_at", "expires_at")
+    list_filter = ("purpose",)
+    search_fields = ("user__username", "user__email")
+    readonly_fields = ("token_hash",)
@@ -0,0 +1,59 @@
+import hashlib
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_pending_codes(apps, schema_editor):
+    """
+    Codurile din linkurile deja trimise rămân valabile: se păstrează ca hash.
+    """
+    User = apps.get_model("accounts", "User")
+    OneTimeToken = apps.get_model("accounts", "OneTimeToken")
+    expires_at = timezone.now() + timedelta(hours=48)
+    pending = User.objects.filter(cod__isnull=False, email_confirmat=False).exclude(cod="")
+    OneTimeToken.objects.bulk_create(
+        [
+            OneTimeToken(
+                user_id=user_id,
+                purpose="confirmare_email",
+                token_hash=hashlib.sha256(code.encode("utf-8")).hexdigest(),
+                expires_at=expires_at,
+            )
+            for user_id, code in pending.values_list("id", "cod").iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_user_blocat"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OneTimeToken",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("purpose", models.CharField(choices=[("confirmare_email", "Confirmare e-mail")], max_length=30)),
+                ("token_hash", models.CharField(max_length=64, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="tokens", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "verbose_name": "Token",
+                "verbose_name_plural": "Tokenuri",
+            },
+        ),
+        migrations.RunPython(copy_pending_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="user",
+            name="cod",
+        ),
+    ]
@@ -13,7 +13,6 @@ class User(AbstractUser):
     street = models.CharField(max_length=120, blank=True)
     birth_date = models.DateField(null=True, blank=True)
     newsletter_opt_in = models.BooleanField(default=False)
-    cod = models.CharField(max_length=100, null=True, blank=True)
     email_confirmat = models.BooleanField(default=False)
     blocat = models.BooleanField(default=False)
     updated_at = models.DateTimeField(auto_now=True)
@@ -33,3 +32,25 @@ class User(AbstractUser):
 
     def __str__(self) -> str:
         return self.get_full_name() or self.username
+
+
+class OneTimeToken(models.Model):
+    """
+    Token de unică folosință (confirmare e-mail etc.); în DB se păstrează doar hash-ul.
+    """
+
+    class Purpose(models.TextChoices):
+        EMAIL_CONFIRM = "confirmare_email", "Confirmare e-mail"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tokens")
+    purpose = models.CharField(max_length=30, choices=Purpose.choices)
+    token_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Token"
+        verbose_name_plural = "Tokenuri"
+
+    def __str__(self) -> str:
+        return f"{self.get_purpose_display()} - {self.user}"
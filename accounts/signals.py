@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from hardware.page_cache import bump_dependency
+from hardware.permissions import bump_permissions, forget_state
+
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_pages(sender, instance: User, update_fields=None, **kwargs) -> None:
+    # login-ul actualizează doar last_login, care nu apare în paginile din cache
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    bump_dependency(instance)
+
+
+def _bump(user_ids) -> None:
+    bump_permissions(user_ids)
+    # din nou după commit, ca o citire concurentă din timpul tranzacției să nu rămână în cache
+    transaction.on_commit(partial(bump_permissions, user_ids))
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_permissions(sender, instance, action, reverse, pk_set, **kwargs) -> None:
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        forget_state(instance)
+        _bump([instance.pk])
+    else:
+        _bump(list(pk_set) if pk_set else None)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs) -> None:
+    if action in ("post_add", "post_remove", "post_clear"):
+        _bump(None)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group(sender, **kwargs) -> None:
+    _bump(None)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OneTimeToken, User
+
+
+def hash_token(raw: str) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def default_ttl(purpose: str) -> timedelta:
+    hours = getattr(settings, "ONE_TIME_TOKEN_HOURS", {}).get(purpose, 48)
+    return timedelta(hours=hours)
+
+
+def issue(user: User, purpose: str, *, ttl: timedelta | None = None) -> str:
+    """
+    Creează un token nou pentru user și scop, înlocuindu-le pe cele anterioare.
+    Întoarce valoarea în clar (se trimite o singură dată, în link).
+    """
+    raw = secrets.token_urlsafe(32)
+    with transaction.atomic():
+        OneTimeToken.objects.filter(user=user, purpose=purpose).delete()
+        OneTimeToken.objects.create(
+            user=user,
+            purpose=purpose,
+            token_hash=hash_token(raw),
+            expires_at=timezone.now() + (ttl or default_ttl(purpose)),
+        )
+    return raw
+
+
+def consume(raw: str, purpose: str) -> User | None:
+    """
+    Validează și consumă tokenul (căutare după hash, pe index unic). Întoarce userul
+    sau None dacă tokenul nu există, a expirat ori a fost deja folosit.
+    """
+    token = (
+        OneTimeToken.objects.select_related("user")
+        .filter(token_hash=hash_token(raw), purpose=purpose, expires_at__gt=timezone.now())
+        .first()
+    )
+    if token is None:
+        return None
+    # DELETE-ul e cel care „câștigă” tokenul, deci două click-uri simultane nu îl folosesc de două ori
+    deleted, _ = OneTimeToken.objects.filter(pk=token.pk).delete()
+    return token.user if deleted else None
+
+
+def purge_expired(now: datetime | None = None) -> int:
+    deleted, _ = OneTimeToken.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
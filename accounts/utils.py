@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from django.core.mail import mail_admins
+from hardware.outbox import enqueue_mail_admins
 
 
 def send_admin_alert(subject: str, message: str, *, error_text: str | None = None) -> None:
@@ -10,4 +10,4 @@ def send_admin_alert(subject: str, message: str, *, error_text: str | None = Non
             f"<div style=\"background:red;color:white;padding:8px\">{error_text}</div>"
         )
     html_message = "\n".join(html_parts)
-    mail_admins(subject, message, html_message=html_message)
+    enqueue_mail_admins(subject, message, html_message=html_message)
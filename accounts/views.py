@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any, Dict
 import logging
-import secrets
 
 from django.conf import settings
 from django.contrib import messages
@@ -12,23 +11,34 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView as DjangoLoginView
 from django.contrib.auth.views import LogoutView as DjangoLogoutView
 from django.contrib.auth.views import PasswordChangeView
-from django.core.cache import cache
 from django.core.mail import EmailMultiAlternatives
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 from django.template.loader import render_to_string
 from django.templatetags.static import static
 from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import FormView, TemplateView
 
+from hardware import page_cache
+from hardware.outbox import enqueue
+from hardware.permissions import user_can
+from hardware.ratelimit import SlidingWindow, ratelimit
+from hardware.utils import get_ip
+
 from .forms import LoginForm, ProfileUpdateForm, RegistrationForm
-from .models import User
+from . import tokens
+from .models import OneTimeToken, User
 from .utils import send_admin_alert
 
 
 logger = logging.getLogger("django")
 LOGIN_FAIL_LIMIT = 3
 LOGIN_FAIL_WINDOW = 120
+# alerta trebuie să vadă toate încercările, nu doar pe cele ale procesului curent
+LOGIN_FAILURES = SlidingWindow(
+    "login_fail", LOGIN_FAIL_LIMIT, LOGIN_FAIL_WINDOW, cache_alias="default"
+)
 
 
 def profile_cache_key(user_id: int) -> str:
@@ -51,6 +61,7 @@ def store_profile_in_session(request: HttpRequest, user: User) -> None:
     }
 
 
+@method_decorator(ratelimit("register"), name="dispatch")
 class RegistrationView(FormView):
     template_name = "accounts/register.html"
     form_class = RegistrationForm
@@ -60,8 +71,8 @@ class RegistrationView(FormView):
         path = reverse("confirm_email", kwargs={"code": code})
         return self.request.build_absolute_uri(path)
 
-    def _send_confirmation_email(self, user: User) -> None:
-        confirm_url = self._build_confirm_url(user.cod)
+    def _send_confirmation_email(self, user: User, code: str) -> None:
+        confirm_url = self._build_confirm_url(code)
         logo_url = self.request.build_absolute_uri(static("hardware/img/toolbox.svg"))
         context = {
             "user": user,
@@ -74,24 +85,24 @@ class RegistrationView(FormView):
         sender = getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@example.com")
         email = EmailMultiAlternatives(subject, text_body, sender, [user.email])
         email.attach_alternative(html_body, "text/html")
-        email.send()
+        enqueue([email])
 
     def form_valid(self, form: RegistrationForm) -> HttpResponse:
         user = form.save(commit=False)
         user.email_confirmat = False
-        user.cod = secrets.token_urlsafe(32)
         user.save()
         try:
             form.save_m2m()
         except AttributeError:
             pass
+        code = tokens.issue(user, OneTimeToken.Purpose.EMAIL_CONFIRM)
         try:
-            self._send_confirmation_email(user)
+            self._send_confirmation_email(user, code)
             messages.success(
                 self.request,
                 "Cont creat. Verifică e-mailul pentru confirmare.",
             )
-            logger.info("Email de confirmare trimis pentru user %s", user.username)
+            logger.info("Email de confirmare pus in coada pentru user %s", user.username)
         except Exception as exc:
             logger.error("Eroare la trimiterea confirmarii email: %s", exc)
             logger.critical("Confirmare email esuata pentru user %s", user.username)
@@ -102,6 +113,7 @@ class RegistrationView(FormView):
         return super().form_valid(form)
 
 
+@method_decorator(ratelimit("login"), name="dispatch")
 class LoginView(DjangoLoginView):
     template_name = "accounts/login.html"
     authentication_form = LoginForm
@@ -125,14 +137,13 @@ class LoginView(DjangoLoginView):
         username = self.request.POST.get("username", "").strip()
         ip = _get_client_ip(self.request)
         if username:
-            cache_key = f"login_fail:{username}:{ip}"
-            count = (cache.get(cache_key) or 0) + 1
-            cache.set(cache_key, count, timeout=LOGIN_FAIL_WINDOW)
-            logger.warning("Autentificare esuata pentru %s (incercare %s)", username, count)
-            if count == LOGIN_FAIL_LIMIT:
+            before, count = LOGIN_FAILURES.hit(f"{username}:{ip}")
+            logger.warning("Autentificare esuata pentru %s (incercare %.0f)", username, count)
+            if before < LOGIN_FAIL_LIMIT <= count:
                 send_admin_alert(
                     "Logari suspecte",
-                    f"3 logari esuate in 2 minute pentru username {username}, IP {ip}",
+                    f"{LOGIN_FAIL_LIMIT} logari esuate in {LOGIN_FAIL_WINDOW // 60} minute "
+                    f"pentru username {username}, IP {ip}",
                 )
         return super().form_invalid(form)
 
@@ -141,7 +152,7 @@ class LogoutView(DjangoLogoutView):
     next_page = reverse_lazy("hardware:home")
 
     def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
-        if request.user.is_authenticated:
+        if user_can(request.user, "hardware.vizualizeaza_oferta"):
             perm = Permission.objects.filter(codename="vizualizeaza_oferta").first()
             if perm:
                 request.user.user_permissions.remove(perm)
@@ -154,16 +165,25 @@ class ProfileView(LoginRequiredMixin, TemplateView):
     template_name = "accounts/profile.html"
 
     def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        # mesajele flash apar o singură dată, deci pagina cu ele nu intră în cache
+        if messages.get_messages(request):
+            response = super().get(request, *args, **kwargs)
+            response["Vary"] = "Cookie"
+            return response
         cache_key = profile_cache_key(request.user.id)
-        cached = cache.get(cache_key)
-        if cached:
+        cached, fingerprint = page_cache.lookup(
+            cache_key,
+            [request.user],
+            variant=request.session.get("profile_data", {}),
+        )
+        if cached is not None:
             response = HttpResponse(cached, content_type="text/html")
             response["Vary"] = "Cookie"
             return response
         response = super().get(request, *args, **kwargs)
         response.render()
         response["Vary"] = "Cookie"
-        cache.set(cache_key, response.content, timeout=settings.PROFILE_CACHE_SECONDS)
+        page_cache.store(cache_key, fingerprint, response.content, settings.PROFILE_CACHE_SECONDS)
         return response
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
@@ -195,28 +215,23 @@ class ProfileUpdateView(LoginRequiredMixin, FormView):
     def form_valid(self, form: ProfileUpdateForm) -> HttpResponse:
         user = form.save()
         store_profile_in_session(self.request, user)
-        cache.delete(profile_cache_key(user.id))
         messages.success(self.request, "Datele de profil au fost actualizate.")
         return super().form_valid(form)
 
 
 def _get_client_ip(request: HttpRequest) -> str:
-    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-    if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-    return request.META.get("REMOTE_ADDR", "")
+    return get_ip(request) or ""
 
 
 def confirm_email(request: HttpRequest, code: str) -> HttpResponse:
-    user = User.objects.filter(cod=code).first()
+    user = tokens.consume(code, OneTimeToken.Purpose.EMAIL_CONFIRM)
     if not user:
         logger.warning("Cod confirmare invalid: %s", code)
         context = {"success": False, "message": "Cod invalid sau expirat."}
         return render(request, "accounts/confirm_email_result.html", context)
 
     user.email_confirmat = True
-    user.cod = None
-    user.save(update_fields=["email_confirmat", "cod"])
+    user.save(update_fields=["email_confirmat"])
     logger.info("Email confirmat pentru user %s", user.username)
     context = {"success": True, "message": "E-mail confirmat cu succes."}
     return render(request, "accounts/confirm_email_result.html", context)
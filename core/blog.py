@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.urls import reverse
+
+from .models import Post
+
+
+BLOG_VERSION_KEY = "blog_version"
+ORDERING = ("-created_at", "-id")
+FIELDS = ("pk", "title", "content", "created_at", "updated_at")
+
+
+def bump_blog() -> None:
+    cache.set(BLOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def blog_version() -> int:
+    cache.add(BLOG_VERSION_KEY, time.time_ns(), timeout=None)
+    return cache.get(BLOG_VERSION_KEY, 0)
+
+
+def _timeout() -> int:
+    return getattr(settings, "BLOG_CACHE_SECONDS", 60 * 60)
+
+
+def _entries(offset: int, limit: int) -> List[Dict[str, Any]]:
+    rows = Post.objects.order_by(*ORDERING).values(*FIELDS)[offset : offset + limit]
+    return [
+        {**row, "url": reverse("core:post_detail", kwargs={"pk": row["pk"]})}
+        for row in rows
+    ]
+
+
+def blog_page(number) -> Page:
+    """
+    O pagină din blog: numărul de articole și articolele paginii sunt ținute în
+    cache sub versiunea blogului, schimbată la orice salvare/ștergere de Post.
+    """
+    version = blog_version()
+    per_page = getattr(settings, "BLOG_PER_PAGE", 10)
+    total = cache.get_or_set(f"blog:{version}:count", Post.objects.count, _timeout())
+    page = Paginator(range(total), per_page).get_page(number)
+    key = f"blog:{version}:page:{page.number}"
+    entries = cache.get(key)
+    if entries is None:
+        entries = _entries((page.number - 1) * per_page, per_page)
+        cache.set(key, entries, _timeout())
+    page.object_list = entries
+    return page
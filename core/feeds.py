@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from django.contrib.syndication.views import Feed
+from django.urls import reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+
+from .blog import blog_page
+
+
+class LatestPostsFeed(Feed):
+    """
+    Ultimele articole, din aceeași pagină din cache ca lista blogului.
+    """
+
+    title = "Blog - Noutăți din proiect"
+    link = reverse_lazy("core:blog_home")
+    description = "Articole publicate în scop demonstrativ pentru aplicația de laborator."
+
+    def items(self):
+        return blog_page(1).object_list
+
+    def item_title(self, item):
+        return item["title"]
+
+    def item_description(self, item):
+        return item["content"]
+
+    def item_link(self, item):
+        return item["url"]
+
+    def item_pubdate(self, item):
+        return item["created_at"]
+
+    def item_updateddate(self, item):
+        return item["updated_at"]
+
+
+class AtomPostsFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .blog import bump_blog
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_blog(sender, instance: Post, **kwargs) -> None:
+    bump_blog()
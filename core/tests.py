@@ -1 +1,46 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import Post
+
+
+@override_settings(BLOG_PER_PAGE=2)
+class BlogTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def setUp(self):
+        cache.clear()
+        self.posts = [Post.objects.create(title=f"Articol {i}", content=f"Conținut {i}") for i in range(5)]
+
+    def test_paginare_si_cache_invalidat_la_salvare(self):
+        response = self.client.get(reverse("core:blog_home"), {"page": 3})
+        self.assertEqual(response.context["page_obj"].paginator.num_pages, 3)
+        self.assertEqual([post["title"] for post in response.context["posts"]], ["Articol 0"])
+
+        with self.assertNumQueries(0, using="default"):
+            self.client.get(reverse("core:blog_home"), {"page": 3})
+
+        self.posts[-1].title = "Articol modificat"
+        self.posts[-1].save()
+        response = self.client.get(reverse("core:blog_home"))
+        self.assertContains(response, "Articol modificat")
+        self.assertContains(response, "?page=2")
+
+    def test_feed_rss_si_atom(self):
+        response = self.client.get(reverse("core:blog_feed"))
+        self.assertContains(response, "<title>Articol 4</title>")
+        self.assertContains(response, reverse("core:post_detail", kwargs={"pk": self.posts[4].pk}))
+        self.assertNotContains(response, "Articol 2")
+
+        Post.objects.create(title="Articol nou", content="Noutate")
+        response = self.client.get(reverse("core:blog_atom"))
+        self.assertContains(response, "<title>Articol nou</title>")
+
+    def test_ordonarea_foloseste_indexul(self):
+        sql, params = Post.objects.order_by("-created_at", "-id")[:2].query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("core_post_created_idx", plan)
@@ -1,10 +1,13 @@
 from django.urls import path
 
+from .feeds import AtomPostsFeed, LatestPostsFeed
 from .views import blog_home, post_detail
 
 app_name = "core"
 
 urlpatterns = [
     path("", blog_home, name="blog_home"),
+    path("feed/rss/", LatestPostsFeed(), name="blog_feed"),
+    path("feed/atom/", AtomPostsFeed(), name="blog_atom"),
     path("<int:pk>/", post_detail, name="post_detail"),
 ]
@@ -1,13 +1,29 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404, render
 
+from hardware.conditional import make_etag, not_modified, set_validators
+
+from .blog import blog_page
 from .models import Post
 
 
 def blog_home(request):
-    posts = Post.objects.order_by("-created_at")
-    return render(request, "core/post_list.html", {"posts": posts})
+    page = blog_page(request.GET.get("page"))
+    context = {
+        "posts": page.object_list,
+        "page_obj": page,
+        "is_paginated": page.has_other_pages(),
+        "fragment_seconds": getattr(settings, "BLOG_FRAGMENT_SECONDS", 60 * 60),
+    }
+    return render(request, "core/post_list.html", context)
 
 
 def post_detail(request, pk):
     post = get_object_or_404(Post, pk=pk)
-    return render(request, "core/post_detail.html", {"post": post})
+    etag = make_etag(request, [pk, post.updated_at], ["core/post_detail.html"])
+    response = not_modified(request, etag) if etag else None
+    if response is None:
+        response = render(request, "core/post_detail.html", {"post": post})
+    if etag:
+        set_validators(response, etag, post.updated_at)
+    return response
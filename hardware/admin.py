@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils import timezone
 
 from . import models
 
@@ -155,6 +156,24 @@ class FeedbackRequestAdmin(admin.ModelAdmin):
     ordering = ("next_send_at",)
 
 
+@admin.register(models.OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("subject", "last_error")
+    readonly_fields = ("created_at", "sent_at", "last_error")
+    ordering = ("-created_at",)
+    actions = ("requeue",)
+
+    @admin.action(description="Reîncearcă trimiterea")
+    def requeue(self, request, queryset):
+        queryset.exclude(status=models.OutboxEmail.Status.SENT).update(
+            status=models.OutboxEmail.Status.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+
+
 admin.site.site_header = "Magazin Hardware - Panou de administrare"
 admin.site.site_title = "Magazin Hardware Admin"
 admin.site.index_title = "Gestionare conținut magazin"
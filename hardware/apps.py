@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
 from django.db.models.signals import post_migrate
 
 
@@ -9,8 +11,16 @@ class HardwareConfig(AppConfig):
 
     def ready(self):
         post_migrate.connect(create_default_groups, sender=self)
+        from .sqlite_tuning import apply_pragmas
+
+        connection_created.connect(apply_pragmas, dispatch_uid="hardware_sqlite_pragmas")
         from . import signals  # noqa: F401
 
+        if getattr(settings, "TEMPLATE_WARMUP", False):
+            from .template_bundle import warm_templates
+
+            warm_templates()
+
 
 def create_default_groups(sender, **kwargs):
     from django.contrib.auth import get_user_model
@@ -0,0 +1,678 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, TextIO, Tuple
+
+import django
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, connection, connections, models, router, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .mailing import batched
+
+
+logger = logging.getLogger("django")
+
+EXCLUDED_APPS = ("auth", "admin", "contenttypes", "sessions")
+CHUNK_SIZE = 2000
+ROWS_PER_INSERT = 500
+COMPRESSIONS = ("none", "gzip", "zstd")
+EXTENSIONS = {"none": ".sql", "gzip": ".sql.gz", "zstd": ".sql.zst"}
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ROWS_MARKER = "-- rows: "
+
+# tipurile pentru care valoarea din values_list diferă de reprezentarea din DB
+_NEEDS_PREP = {
+    "DateField",
+    "DateTimeField",
+    "DecimalField",
+    "DurationField",
+    "JSONField",
+    "TimeField",
+    "UUIDField",
+}
+
+
+class BackupError(Exception):
+    pass
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise BackupError("Compresia zstd necesita pachetul 'zstandard'.") from exc
+    return zstandard
+
+
+def open_binary_output(path: str, compress: str = "none"):
+    if compress == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compress == "zstd":
+        return _zstandard().ZstdCompressor(level=3).stream_writer(open(path, "wb"))
+    return open(path, "wb")
+
+
+def open_output(path: str, compress: str = "none") -> TextIO:
+    return io.TextIOWrapper(open_binary_output(path, compress), encoding="utf-8", newline="\n")
+
+
+def open_input(path: str):
+    """
+    Deschide un dump în mod binar, detectând compresia după primii octeți.
+    """
+    with open(path, "rb") as fh:
+        magic = fh.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, "rb")
+    if magic.startswith(ZSTD_MAGIC):
+        decompressor = _zstandard().ZstdDecompressor()
+        return decompressor.stream_reader(open(path, "rb"), read_across_frames=True)
+    return open(path, "rb")
+
+
+def models_to_dump() -> List[type[models.Model]]:
+    return [
+        model
+        for model in apps.get_models(include_auto_created=True)
+        if not model._meta.app_label.startswith(EXCLUDED_APPS)
+        and not model._meta.proxy
+        and model._meta.managed
+    ]
+
+
+def sql_literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (bytes, memoryview)):
+        return f"X'{bytes(value).hex()}'"
+    text = str(value).replace("'", "''")
+    return f"'{text}'"
+
+
+def _converters(fields: Sequence[models.Field]) -> List[Callable | None]:
+    converters = []
+    for field in fields:
+        if field.get_internal_type() in _NEEDS_PREP:
+            converters.append(
+                lambda value, field=field: field.get_db_prep_value(value, connection)
+            )
+        else:
+            converters.append(None)
+    return converters
+
+
+def table_records(
+    model: type[models.Model], queryset=None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[object, str]]:
+    """
+    Întoarce (pk, "(v1, v2, ...)") pentru fiecare rând al tabelului, citit cu iterator().
+    """
+    fields = model._meta.concrete_fields
+    pk_index = fields.index(model._meta.pk)
+    converters = _converters(fields)
+    queryset = model._base_manager.all() if queryset is None else queryset
+    rows = (
+        queryset.order_by("pk")
+        .values_list(*[field.attname for field in fields])
+        .iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        values = [
+            sql_literal(convert(value) if convert is not None and value is not None else value)
+            for convert, value in zip(converters, row)
+        ]
+        yield row[pk_index], f"({', '.join(values)})"
+
+
+def table_rows(
+    model: type[models.Model], queryset=None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    for _, literal in table_records(model, queryset, chunk_size):
+        yield literal
+
+
+def insert_prefix(model: type[models.Model]) -> str:
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in model._meta.concrete_fields)
+    return f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES\n"
+
+
+def write_inserts(
+    out: TextIO,
+    model: type[models.Model],
+    rows: Iterable[str],
+    rows_per_insert: int = ROWS_PER_INSERT,
+) -> int:
+    """
+    Scrie rândurile ca INSERT-uri cu mai multe VALUES; memoria folosită e de un singur lot.
+    """
+    prefix = insert_prefix(model)
+    count = 0
+    batch: List[str] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= rows_per_insert:
+            out.write(prefix + ",\n".join(batch) + ";\n")
+            count += len(batch)
+            batch = []
+    if batch:
+        out.write(prefix + ",\n".join(batch) + ";\n")
+        count += len(batch)
+    return count
+
+
+def dump_table(
+    out: TextIO,
+    model: type[models.Model],
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    rows_per_insert: int = ROWS_PER_INSERT,
+) -> int:
+    table = model._meta.db_table
+    out.write(f"-- table: {table}\n")
+    count = write_inserts(out, model, table_rows(model, chunk_size=chunk_size), rows_per_insert)
+    out.write(f"{ROWS_MARKER}{table} {count}\n")
+    return count
+
+
+def dump_table_to_file(
+    label: str, path: str, compress: str, chunk_size: int, rows_per_insert: int
+) -> Tuple[str, int, float]:
+    """
+    Punctul de intrare al proceselor worker: scrie un tabel într-un fișier separat.
+    """
+    started = time.monotonic()
+    model = apps.get_model(label)
+    with open_output(path, compress) as out:
+        count = dump_table(out, model, chunk_size=chunk_size, rows_per_insert=rows_per_insert)
+    connections.close_all()
+    return label, count, time.monotonic() - started
+
+
+def init_worker() -> None:
+    django.setup()
+    connections.close_all()
+
+
+def sqlite_backup(
+    path: str,
+    *,
+    pages: int = 1024,
+    progress: Callable[[int, int], None] | None = None,
+) -> None:
+    """
+    Copie online a bazei SQLite prin API-ul .backup(); scrierile concurente sunt permise.
+    """
+    if connection.vendor != "sqlite":
+        raise BackupError("Modul sqlite functioneaza doar cu backend-ul SQLite.")
+
+    def report(status: int, remaining: int, total: int) -> None:
+        if progress is not None:
+            progress(total - remaining, total)
+
+    connection.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        with target:
+            connection.connection.backup(target, pages=pages, progress=report)
+    finally:
+        target.close()
+
+
+def refresh_snapshot(path: str) -> None:
+    """
+    Rescrie snapshot-ul read-only al bazei principale: copia se face într-un fișier
+    temporar și înlocuiește atomic snapshot-ul, deci cititorii nu văd o copie parțială.
+    """
+    temporary = f"{path}.tmp"
+    sqlite_backup(temporary)
+    target = sqlite3.connect(temporary)
+    try:
+        target.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        target.close()
+    os.replace(temporary, path)
+
+
+MANIFEST_NAME = "manifest.json"
+STATE_NAME = "state.json.gz"
+WATERMARK_FIELD = "updated_at"
+# tabele în care rândurile doar se adaugă sau se șterg, niciodată nu se modifică:
+# un watermark pe max(id) ajunge, fără sume de control per rând. ContactMessage nu e
+# aici: `processed` se bifează din admin, deci rândurile ei se verifică prin CRC.
+APPEND_ONLY_MODELS = {"hardware.requestlog", "hardware.pendingproductview"}
+
+
+def watermark_field(model: type[models.Model]) -> str | None:
+    """
+    Câmpul actualizat la fiecare modificare (ex. Product, User); fără el, rândurile
+    modificate sunt detectate prin sume de control.
+    """
+    try:
+        field = model._meta.get_field(WATERMARK_FIELD)
+    except FieldDoesNotExist:
+        return None
+    return field.attname if getattr(field, "auto_now", False) else None
+
+
+def is_append_only(model: type[models.Model]) -> bool:
+    return model._meta.label_lower in APPEND_ONLY_MODELS
+
+
+def load_manifest(directory: str) -> Dict[str, object] | None:
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_manifest(directory: str, manifest: Dict[str, object]) -> None:
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def load_state(directory: str) -> Dict[str, Dict[str, object]]:
+    with gzip.open(os.path.join(directory, STATE_NAME), "rt", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_state(directory: str, state: Dict[str, Dict[str, object]]) -> None:
+    path = os.path.join(directory, STATE_NAME)
+    with gzip.open(f"{path}.tmp", "wt", encoding="utf-8") as fh:
+        json.dump(state, fh, separators=(",", ":"))
+    os.replace(f"{path}.tmp", path)
+
+
+def _watermarks(model: type[models.Model]) -> Dict[str, object]:
+    field = watermark_field(model)
+    aggregates = {"max_id": Max("pk")}
+    if field:
+        aggregates["max_updated"] = Max(field)
+    values = model._base_manager.aggregate(**aggregates)
+    if values.get("max_updated") is not None:
+        values["max_updated"] = values["max_updated"].isoformat()
+    return values
+
+
+def _write_delta_batch(
+    out: TextIO, model: type[models.Model], batch: List[Tuple[object, str]], previous: set
+) -> None:
+    quote = connection.ops.quote_name
+    replaced = [pk for pk, _ in batch if pk in previous]
+    if replaced:
+        out.write(
+            f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} "
+            f"IN ({', '.join(sql_literal(pk) for pk in replaced)});\n"
+        )
+    out.write(insert_prefix(model) + ",\n".join(literal for _, literal in batch) + ";\n")
+
+
+def _write_tombstones(
+    out: TextIO, model: type[models.Model], deleted: Iterable[object], rows_per_insert: int
+) -> int:
+    quote = connection.ops.quote_name
+    prefix = f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} IN ("
+    count = 0
+    for batch in batched(sorted(deleted), rows_per_insert):
+        out.write(prefix + ", ".join(sql_literal(pk) for pk in batch) + ");\n")
+        count += len(batch)
+    return count
+
+
+def dump_table_incremental(
+    out: TextIO,
+    model: type[models.Model],
+    previous: Dict[str, object] | None,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    rows_per_insert: int = ROWS_PER_INSERT,
+) -> Tuple[Dict[str, int], Dict[str, object]]:
+    """
+    Scrie rândurile noi sau modificate față de `previous` (None = tot tabelul) și
+    tombstone-uri (DELETE) pentru rândurile șterse.
+
+    Tabelele cu `updated_at` citesc doar rândurile peste watermark-uri, cele append-only
+    doar rândurile cu id peste max_id; doar pentru restul (unde rândurile pot fi
+    modificate fără dată de modificare) se compară o sumă de control per rând.
+    Întoarce (statistici, starea nouă a tabelului).
+    """
+    table = model._meta.db_table
+    field = watermark_field(model)
+    incremental = bool(field) or is_append_only(model)
+    state = _watermarks(model)
+    out.write(f"-- table: {table}\n")
+
+    if previous is None:
+        queryset = None
+    elif incremental and previous.get("max_id") is not None:
+        condition = Q(pk__gt=previous["max_id"])
+        if field and previous.get("max_updated"):
+            since = datetime.fromisoformat(previous["max_updated"])
+            condition |= Q(**{f"{field}__gt": since})
+        queryset = model._base_manager.filter(condition)
+    else:
+        queryset = None
+
+    if incremental:
+        previous_ids = set(previous.get("ids", [])) if previous else set()
+        previous_sums: Dict[object, int] = {}
+    else:
+        previous_sums = {pk: crc for pk, crc in previous.get("rows", [])} if previous else {}
+        previous_ids = set(previous_sums)
+        if previous and "rows" not in previous:
+            # stare salvată când tabelul era tratat ca append-only: rândurile se rescriu
+            previous_ids = set(previous.get("ids", []))
+
+    changed = 0
+    sums: List[List[object]] = []
+    batch: List[Tuple[object, str]] = []
+    for pk, literal in table_records(model, queryset, chunk_size):
+        if not incremental:
+            crc = zlib.crc32(literal.encode("utf-8"))
+            sums.append([pk, crc])
+            if previous_sums.get(pk) == crc:
+                continue
+        batch.append((pk, literal))
+        if len(batch) >= rows_per_insert:
+            _write_delta_batch(out, model, batch, previous_ids)
+            changed += len(batch)
+            batch = []
+    if batch:
+        _write_delta_batch(out, model, batch, previous_ids)
+        changed += len(batch)
+
+    if incremental:
+        current_ids = list(
+            model._base_manager.order_by("pk").values_list("pk", flat=True).iterator(chunk_size)
+        )
+        state["ids"] = current_ids
+    else:
+        current_ids = [pk for pk, _ in sums]
+        state["rows"] = sums
+    deleted = _write_tombstones(out, model, previous_ids.difference(current_ids), rows_per_insert)
+
+    out.write(f"{ROWS_MARKER}{table} {changed}\n")
+    stats = {"rows": len(current_ids), "changed": changed, "deleted": deleted}
+    return stats, state
+
+
+def backup_incremental(
+    directory: str,
+    *,
+    compress: str = "none",
+    full: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    rows_per_insert: int = ROWS_PER_INSERT,
+    progress: Callable[[str, Dict[str, int]], None] | None = None,
+) -> Dict[str, object]:
+    """
+    Adaugă un backup la lanțul din `directory`: complet dacă nu există manifest
+    (sau `full`), altfel un delta față de starea salvată la backup-ul anterior.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = None if full else load_manifest(directory)
+    previous_state = load_state(directory) if manifest else {}
+    kind = "delta" if manifest else "full"
+    created = timezone.now()
+    name = f"backup_{created:%Y%m%d_%H%M%S_%f}_{kind}{EXTENSIONS[compress]}"
+
+    tables: Dict[str, Dict[str, object]] = {}
+    state: Dict[str, Dict[str, object]] = {}
+    with open_output(os.path.join(directory, name), compress) as out:
+        for model in models_to_dump():
+            table = model._meta.db_table
+            previous = previous_state.get(table) if manifest else None
+            stats, table_state = dump_table_incremental(
+                out, model, previous, chunk_size=chunk_size, rows_per_insert=rows_per_insert
+            )
+            state[table] = table_state
+            tables[table] = {
+                **stats,
+                "max_id": table_state.get("max_id"),
+                "max_updated": table_state.get("max_updated"),
+            }
+            if progress is not None:
+                progress(table, stats)
+
+    entry = {"file": name, "kind": kind, "created": created.isoformat(), "tables": tables}
+    if manifest is None:
+        manifest = {"chain": []}
+    manifest["chain"].append(entry)
+    save_state(directory, state)
+    save_manifest(directory, manifest)
+    return entry
+
+
+TABLE_MARKER = "-- table: "
+
+
+def iter_statements(stream) -> Iterator[Tuple[str, object]]:
+    """
+    Împarte un dump în instrucțiuni complete fără a-l citi întreg în memorie.
+
+    Produce ("table", nume) și ("rows", (nume, n)) pentru marcaje, ("sql", text)
+    pentru fiecare instrucțiune și la final ("end", octeți necomprimați citiți).
+    """
+    buffer: List[str] = []
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="\n")
+    for line in text:
+        if not buffer and line.startswith("--"):
+            if line.startswith(TABLE_MARKER):
+                yield "table", line[len(TABLE_MARKER):].strip()
+            elif line.startswith(ROWS_MARKER):
+                table, count = line[len(ROWS_MARKER):].rsplit(" ", 1)
+                yield "rows", (table, int(count))
+            continue
+        buffer.append(line)
+        if line.rstrip().endswith(";"):
+            statement = "".join(buffer)
+            if sqlite3.complete_statement(statement):
+                yield "sql", statement
+                buffer = []
+    if any(line.strip() for line in buffer):
+        raise BackupError("Dump incomplet: ultima instructiune nu se termina.")
+    text.detach()
+    yield "end", stream.tell()
+
+
+def table_aliases() -> Dict[str, str]:
+    """
+    Baza în care se află fiecare tabel exportat, după DATABASE_ROUTERS.
+    """
+    return {model._meta.db_table: router.db_for_write(model) for model in models_to_dump()}
+
+
+@contextmanager
+def fast_load_pragmas(aliases: Iterable[str] = (DEFAULT_DB_ALIAS,)):
+    """
+    Pe SQLite, dezactivează fsync-ul și ține jurnalul în memorie cât durează încărcarea,
+    apoi revine la valorile anterioare. Nu are efect în interiorul unei tranzacții.
+    """
+    previous: Dict[str, Tuple[str, int]] = {}
+    for alias in aliases:
+        conn = connections[alias]
+        if conn.vendor != "sqlite" or conn.in_atomic_block:
+            continue
+        with conn.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            synchronous = cursor.fetchone()[0]
+            cursor.execute("PRAGMA journal_mode")
+            journal_mode = cursor.fetchone()[0]
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA journal_mode=MEMORY")
+        previous[alias] = (journal_mode, synchronous)
+    try:
+        yield
+    finally:
+        for alias, (journal_mode, synchronous) in previous.items():
+            with connections[alias].cursor() as cursor:
+                cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+                cursor.execute(f"PRAGMA synchronous={int(synchronous)}")
+
+
+def _group_by_alias(aliases: Dict[str, str]) -> Dict[str, List[str]]:
+    grouped: Dict[str, List[str]] = {}
+    for table, alias in aliases.items():
+        grouped.setdefault(alias, []).append(table)
+    return grouped
+
+
+def drop_indexes(aliases: Dict[str, str]) -> List[Tuple[str, str]]:
+    """
+    Șterge indexurile secundare ale tabelelor (SQLite) și întoarce (alias, SQL) pentru recreare.
+    """
+    dropped = []
+    for alias, tables in _group_by_alias(aliases).items():
+        conn = connections[alias]
+        if conn.vendor != "sqlite":
+            continue
+        placeholders = ", ".join(["%s"] * len(tables))
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+                f"AND tbl_name IN ({placeholders})",
+                tables,
+            )
+            indexes = cursor.fetchall()
+            for name, sql in indexes:
+                cursor.execute(f"DROP INDEX {conn.ops.quote_name(name)}")
+                dropped.append((alias, sql))
+    return dropped
+
+
+def create_indexes(statements: Iterable[Tuple[str, str]]) -> None:
+    touched = set()
+    for alias, sql in statements:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(sql)
+        touched.add(alias)
+    for alias in touched:
+        if connections[alias].vendor == "sqlite":
+            with connections[alias].cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+
+def restore_file(
+    path: str,
+    *,
+    batch_statements: int = 200,
+    progress: Callable[[int, int], None] | None = None,
+) -> Dict[str, object]:
+    """
+    Aplică un fișier de backup în tranzacții de câte `batch_statements` instrucțiuni,
+    pe cursorul DB-API (fără overhead-ul de logging al Django), în baza fiecărui tabel.
+
+    Verifică pentru fiecare tabel că nr. de rânduri inserate e cel din marcajul
+    "-- rows:"; întoarce statisticile și diferențele găsite.
+    """
+    aliases = table_aliases()
+    used = sorted(set(aliases.values()) | {DEFAULT_DB_ALIAS})
+    inserted: Dict[str, int] = {}
+    expected: Dict[str, int] = {}
+    statements = 0
+    size = 0
+    table = None
+    for alias in used:
+        connections[alias].ensure_connection()
+    with open_input(path) as stream:
+        items = iter_statements(stream)
+        while True:
+            done = True
+            with ExitStack() as stack:
+                for alias in used:
+                    stack.enter_context(transaction.atomic(using=alias))
+                cursors = {alias: connections[alias].connection.cursor() for alias in used}
+                for kind, payload in items:
+                    if kind == "table":
+                        table = payload
+                    elif kind == "rows":
+                        expected[payload[0]] = payload[1]
+                    elif kind == "end":
+                        size = payload
+                    else:
+                        conn = connections[aliases.get(table, DEFAULT_DB_ALIAS)]
+                        cursor = cursors[conn.alias]
+                        try:
+                            cursor.execute(payload)
+                        except conn.Database.Error as exc:
+                            raise BackupError(
+                                f"Eroare la tabelul {table} ({exc}); restaurarea se face "
+                                "intr-o baza migrata si goala."
+                            ) from exc
+                        statements += 1
+                        if payload.startswith("INSERT"):
+                            inserted[table] = inserted.get(table, 0) + cursor.rowcount
+                        if statements % batch_statements == 0:
+                            done = False
+                            break
+                for cursor in cursors.values():
+                    cursor.close()
+            if progress is not None:
+                progress(statements, sum(inserted.values()))
+            if done:
+                break
+    mismatches = {
+        name: (count, inserted.get(name, 0))
+        for name, count in expected.items()
+        if inserted.get(name, 0) != count
+    }
+    return {
+        "statements": statements,
+        "rows": sum(inserted.values()),
+        "bytes": size,
+        "mismatches": mismatches,
+    }
+
+
+def chain_files(directory: str) -> List[str]:
+    manifest = load_manifest(directory)
+    if manifest is None:
+        raise BackupError(f"Nu exista {MANIFEST_NAME} in {directory}.")
+    return [os.path.join(directory, entry["file"]) for entry in manifest["chain"]]
+
+
+def table_counts(tables: Iterable[str]) -> Dict[str, int]:
+    aliases = table_aliases()
+    counts = {}
+    for table in tables:
+        conn = connections[aliases.get(table, DEFAULT_DB_ALIAS)]
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {conn.ops.quote_name(table)}")
+            counts[table] = cursor.fetchone()[0]
+    return counts
+
+
+def verify_chain(directory: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Compară nr. de rânduri din DB cu cel salvat în manifest la ultimul backup.
+    """
+    manifest = load_manifest(directory)
+    expected = {
+        table: stats["rows"] for table, stats in manifest["chain"][-1]["tables"].items()
+    }
+    actual = table_counts(expected)
+    return {
+        table: (count, actual[table])
+        for table, count in expected.items()
+        if actual[table] != count
+    }
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from django.core.cache import cache
+
+from .models import Product
+from .product_cache import product_version_key, versions_from_cache
+
+
+CART_SUMMARY_TIMEOUT = 60 * 30
+
+
+def cart_summary_key(session_key: str) -> str:
+    return f"cart_summary:{session_key}"
+
+
+def invalidate_cart_summary(session_key: str | None) -> None:
+    if session_key:
+        cache.delete(cart_summary_key(session_key))
+
+
+def _cart_product_ids(cart: Dict[str, Dict[str, Any]]) -> List[int]:
+    return [int(pid) for pid in cart.keys() if str(pid).isdigit()]
+
+
+def _cart_signature(cart: Dict[str, Dict[str, Any]], versions: Dict[int, Any]) -> str:
+    lines = [
+        (pid, int(entry.get("qty", 0)), str(entry.get("price", "0")))
+        for pid, entry in sorted(cart.items())
+    ]
+    payload = json.dumps(
+        [lines, sorted(versions.items())], default=str, separators=(",", ":")
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _compute_summary(
+    cart: Dict[str, Dict[str, Any]], product_ids: List[int]
+) -> Tuple[Dict[str, Any], List[Tuple[str, str]], bool]:
+    rows = Product.objects.filter(id__in=product_ids).values_list(
+        "id", "name", "slug", "price", "stock"
+    )
+    products_map = {row[0]: row for row in rows}
+    notices: List[Tuple[str, str]] = []
+    cart_changed = False
+
+    missing_ids = [pid for pid in product_ids if pid not in products_map]
+    if missing_ids:
+        for pid in missing_ids:
+            cart.pop(str(pid), None)
+        cart_changed = True
+        notices.append(
+            ("warning", "Unele produse nu mai sunt disponibile și au fost scoase din coș.")
+        )
+
+    # Comparam dintr-o singura trecere pretul salvat in sesiune cu pretul curent.
+    line_ids = [pid for pid in product_ids if pid in products_map]
+    snapshot_prices = [str(cart[str(pid)].get("price", "0")) for pid in line_ids]
+    current_prices = [str(products_map[pid][3]) for pid in line_ids]
+    drifted = [
+        pid
+        for pid, old, new in zip(line_ids, snapshot_prices, current_prices)
+        if old != new
+    ]
+    if drifted:
+        for pid in drifted:
+            cart[str(pid)]["price"] = str(products_map[pid][3])
+        cart_changed = True
+        names = ", ".join(products_map[pid][1] for pid in drifted)
+        notices.append(("warning", f"Pretul s-a modificat pentru: {names}."))
+
+    items = []
+    total = Decimal("0")
+    for pid in line_ids:
+        _, name, slug, price, stock = products_map[pid]
+        qty = int(cart[str(pid)].get("qty", 0))
+        if stock <= 0:
+            cart.pop(str(pid), None)
+            cart_changed = True
+            notices.append(("warning", f"{name} nu mai este in stoc si a fost scos din cos."))
+            continue
+        if qty > stock:
+            qty = stock
+            cart[str(pid)]["qty"] = qty
+            cart_changed = True
+            notices.append(
+                (
+                    "warning",
+                    f"Stoc insuficient pentru {name}. Cantitatea a fost ajustata la {qty}.",
+                )
+            )
+        subtotal = price * qty
+        total += subtotal
+        items.append(
+            {
+                "product_id": pid,
+                "name": name,
+                "slug": slug,
+                "price": price,
+                "qty": qty,
+                "subtotal": subtotal,
+                "stock": stock,
+            }
+        )
+    return {"items": items, "total": total}, notices, cart_changed
+
+
+def get_cart_summary(
+    session_key: str | None, cart: Dict[str, Dict[str, Any]]
+) -> Tuple[Dict[str, Any], List[Tuple[str, str]], bool]:
+    """
+    Întoarce (rezumat, notificări, coș_modificat) pentru coșul din sesiune.
+
+    Rezumatul (linii + total) este păstrat în cache și reutilizat cât timp nici coșul,
+    nici versiunile produselor implicate (preț/stoc) nu s-au schimbat.
+    """
+    product_ids = _cart_product_ids(cart)
+    if not product_ids:
+        return {"items": [], "total": Decimal("0")}, [], False
+
+    summary_key = cart_summary_key(session_key) if session_key else None
+    version_keys = [product_version_key(pid) for pid in product_ids]
+    lookup = version_keys + ([summary_key] if summary_key else [])
+    values = cache.get_many(lookup)
+    versions = versions_from_cache(values, product_ids)
+
+    cached = values.get(summary_key) if summary_key else None
+    if cached and cached.get("signature") == _cart_signature(cart, versions):
+        return cached["summary"], [], False
+
+    summary, notices, cart_changed = _compute_summary(cart, product_ids)
+    if summary_key:
+        remaining = {pid: versions[pid] for pid in _cart_product_ids(cart)}
+        cache.set(
+            summary_key,
+            {"signature": _cart_signature(cart, remaining), "summary": summary},
+            timeout=CART_SUMMARY_TIMEOUT,
+        )
+    return summary, notices, cart_changed
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Iterable, Sequence, Tuple
+
+from django.conf import settings
+from django.contrib import messages
+from django.http import HttpRequest, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .context_processors import support_status
+from .page_cache import current_versions
+from .permissions import user_can, user_in_group
+from .product_cache import CATALOG_VERSION_KEY
+from .recommendations import RECOMMENDATIONS_VERSION_KEY
+from .view_tracking import recent_product_ids
+
+
+LAYOUT_TEMPLATES = ("hardware/baza.html",)
+
+Validators = Tuple[Sequence[Any], datetime | None]
+
+_template_versions: dict = {}
+
+
+def template_version(names: Iterable[str]) -> str:
+    """
+    Versiunea șabloanelor = mtime-urile fișierelor; în producție se calculează o
+    singură dată per proces, în DEBUG la fiecare cerere.
+    """
+    names = tuple(names)
+    if not settings.DEBUG and names in _template_versions:
+        return _template_versions[names]
+    stamps = []
+    for name in names:
+        try:
+            stamps.append(os.stat(get_template(name).origin.name).st_mtime_ns)
+        except (OSError, TemplateDoesNotExist):
+            stamps.append(0)
+    version = hashlib.sha1(repr(stamps).encode("utf-8")).hexdigest()[:12]
+    _template_versions[names] = version
+    return version
+
+
+def viewer_state(request: HttpRequest) -> list | None:
+    """
+    Părțile paginii care depind de vizitator (antet, coș, vizualizări recente, footer).
+    None înseamnă că pagina trebuie randată: mesaje flash în așteptare. Cookie-ul CSRF
+    nu intră aici: răspunsul are Vary: Cookie, deci browserul nu refolosește pagina
+    (cu tokenul vechi) după ce cookie-urile se schimbă.
+    """
+    if messages.get_messages(request):
+        return None
+    user = request.user
+    cart = request.session.get("cart", {})
+    state = [
+        user.pk if user.is_authenticated else None,
+        user_in_group(user, "Administratori_site"),
+        user_can(user, "hardware.add_product"),
+        sorted((str(pid), entry.get("qty", 0)) for pid, entry in cart.items()),
+        support_status(request)["support_message"],
+        timezone.localdate().isoformat(),
+    ]
+    if user.is_authenticated:
+        state.append(recent_product_ids(user.id))
+    return state
+
+
+def catalog_state() -> list:
+    """
+    Versiunea catalogului și a recomandărilor, citite cu un singur get_many; bannerul
+    produsului zilei depinde doar de dată și de catalog.
+    """
+    keys = [CATALOG_VERSION_KEY, RECOMMENDATIONS_VERSION_KEY]
+    versions = current_versions(keys)
+    return [versions[key] for key in keys]
+
+
+def make_etag(request: HttpRequest, parts: Sequence[Any], templates: Iterable[str]) -> str | None:
+    state = viewer_state(request)
+    if state is None:
+        return None
+    payload = json.dumps(
+        [list(parts), state, template_version((*templates, *LAYOUT_TEMPLATES))],
+        default=str,
+        separators=(",", ":"),
+    )
+    return f'"{hashlib.sha1(payload.encode("utf-8")).hexdigest()}"'
+
+
+def not_modified(request: HttpRequest, etag: str) -> HttpResponse | None:
+    # doar ETag: Last-Modified singur nu acoperă coșul și celelalte părți per vizitator
+    return get_conditional_response(request, etag=etag)
+
+
+def set_validators(response: HttpResponse, etag: str, last_modified: datetime | None) -> None:
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Cookie"])
+
+
+class ConditionalGetMixin:
+    """
+    Răspunde cu 304 fără randare când validatorii paginii (calculați de
+    `page_validators`, fără a randa) și starea vizitatorului nu s-au schimbat.
+    """
+
+    def page_validators(self) -> Validators | None:
+        return None
+
+    def before_conditional(self) -> None:
+        """
+        Efecte secundare care trebuie să aibă loc și la 304 (de ex. vizualizări).
+        """
+
+    def get(self, request, *args, **kwargs):
+        validators = self.page_validators()
+        etag = None
+        if validators is not None:
+            parts, last_modified = validators
+            self.before_conditional()
+            etag = make_etag(request, parts, [self.template_name])
+            if etag is not None:
+                response = not_modified(request, etag)
+                if response is not None:
+                    set_validators(response, etag, last_modified)
+                    return response
+        response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            set_validators(response, etag, last_modified)
+        return response
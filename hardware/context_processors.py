@@ -5,14 +5,13 @@ from django.core.cache import cache
 from django.utils import timezone
 
 from .models import Category
+from .permissions import user_can, user_in_group
 
 
 def categories_menu(request):
     user = request.user
-    can_view_admin_pages = (
-        user.is_authenticated and user.groups.filter(name="Administratori_site").exists()
-    )
-    can_add_product = user.is_authenticated and user.has_perm("hardware.add_product")
+    can_view_admin_pages = user_in_group(user, "Administratori_site")
+    can_add_product = user_can(user, "hardware.add_product")
     cache_key = "nav_categories"
     categories = cache.get(cache_key)
     if categories is None:
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from django.core.mail import EmailMessage, get_connection
+
+from .models import ScheduledTaskState
+
+
+logger = logging.getLogger("django")
+
+
+class RateLimiter:
+    """
+    Limitează numărul de mesaje trimise pe secundă, comun pentru toate thread-urile.
+    """
+
+    def __init__(self, per_second: float | None) -> None:
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int = 1) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_slot, now)
+            self._next_slot = start + self.interval * count
+        if start > now:
+            time.sleep(start - now)
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def send_batch(messages: List[EmailMessage], limiter: RateLimiter | None = None) -> int:
+    """
+    Trimite un lot de mesaje pe o singură conexiune SMTP.
+    """
+    if limiter is not None:
+        limiter.acquire(len(messages))
+    connection = get_connection()
+    with connection:
+        return connection.send_messages(messages) or 0
+
+
+def dispatch(
+    batches: Iterable[Tuple[Any, List[EmailMessage]]],
+    *,
+    workers: int = 1,
+    rate_limit: float | None = None,
+    on_sent: Callable[[Any, int], None] | None = None,
+) -> int:
+    """
+    Trimite loturile în paralel (cel mult `workers` conexiuni deschise simultan).
+
+    `on_sent(cheie, trimise)` este apelat în thread-ul apelantului după fiecare lot,
+    astfel încât checkpoint-urile pot fi salvate fără acces concurent la DB.
+    Dacă un lot eșuează nu se mai trimit loturi noi, dar cele deja pornite sunt
+    așteptate și raportate prin `on_sent`; abia apoi se ridică prima eroare.
+    """
+    limiter = RateLimiter(rate_limit)
+    total = 0
+    error: Exception | None = None
+    in_flight: Dict[Any, Any] = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="mail") as pool:
+
+        def collect(return_when) -> None:
+            nonlocal total, error
+            done, _ = wait(list(in_flight), return_when=return_when)
+            for future in done:
+                key = in_flight.pop(future)
+                try:
+                    sent = future.result()
+                except Exception as exc:  # noqa: BLE001 - se ridică după ce se golește pool-ul
+                    logger.error("Lotul %s nu a putut fi trimis: %s", key, exc)
+                    error = error or exc
+                    continue
+                total += sent
+                if on_sent is not None:
+                    on_sent(key, sent)
+
+        for key, messages in batches:
+            if len(in_flight) >= max(workers, 1) * 2:
+                collect(FIRST_COMPLETED)
+            if error is not None:
+                break
+            in_flight[pool.submit(send_batch, messages, limiter)] = key
+        while in_flight:
+            collect(FIRST_COMPLETED)
+    if error is not None:
+        raise error
+    return total
+
+
+class MailingCheckpoint:
+    """
+    Progresul unei trimiteri în masă, salvat în ScheduledTaskState.checkpoint.
+
+    `last_id` este ultimul id dintr-un prefix continuu de loturi trimise; loturile
+    terminate în afara ordinii sunt păstrate ca intervale, deci la reluare nu se
+    retrimite niciun mesaj.
+    """
+
+    def __init__(self, name: str, run_key: str, *, resume: bool = False) -> None:
+        self.name = name
+        state, _ = ScheduledTaskState.objects.get_or_create(name=name)
+        data = state.checkpoint or {}
+        if resume and data.get("run") and not data.get("done"):
+            # campania neterminată are prioritate față de cea nouă
+            run_key = data["run"]
+        if data.get("run") != run_key:
+            data = {}
+        self.run_key = run_key
+        self.done = bool(data.get("done"))
+        self.last_id = data.get("last_id", 0)
+        self.ranges: List[Tuple[int, int]] = [tuple(item) for item in data.get("ranges", [])]
+        self.sent = data.get("sent", 0)
+        self._completed: Dict[int, Tuple[int, int]] = {}
+        self._next_seq = 0
+
+    def is_sent(self, item_id: int) -> bool:
+        if item_id <= self.last_id:
+            return True
+        return any(first <= item_id <= last for first, last in self.ranges)
+
+    def mark(self, seq: int, first_id: int, last_id: int, sent: int) -> None:
+        self._completed[seq] = (first_id, last_id)
+        while self._next_seq in self._completed:
+            self.last_id = max(self.last_id, self._completed.pop(self._next_seq)[1])
+            self._next_seq += 1
+        self.sent += sent
+        self._save()
+
+    def finish(self) -> None:
+        self.done = True
+        self._save()
+
+    def _save(self) -> None:
+        ranges = [r for r in self.ranges if r[1] > self.last_id]
+        ranges += [r for r in self._completed.values() if r not in ranges]
+        ScheduledTaskState.objects.filter(name=self.name).update(
+            checkpoint={
+                "run": self.run_key,
+                "done": self.done,
+                "last_id": self.last_id,
+                "ranges": sorted(ranges),
+                "sent": self.sent,
+            }
+        )
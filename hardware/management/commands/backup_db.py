@@ -1,15 +1,36 @@
 from __future__ import annotations
 
 import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-from django.apps import apps
-from django.core.management.base import BaseCommand
-from django.db import models
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from hardware.backup import (
+    CHUNK_SIZE,
+    COMPRESSIONS,
+    EXTENSIONS,
+    ROWS_PER_INSERT,
+    BackupError,
+    backup_incremental,
+    dump_table,
+    dump_table_to_file,
+    init_worker,
+    models_to_dump,
+    open_binary_output,
+    open_output,
+    sqlite_backup,
+)
 
 
 class Command(BaseCommand):
-    help = "Generează un backup SQL cu INSERT-uri pentru tabelele proprii."
+    help = (
+        "Generează un backup: fie SQL cu INSERT-uri pentru tabelele proprii (scris în flux, "
+        "opțional comprimat și în paralel pe tabele), fie o copie online a bazei SQLite."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -17,50 +38,165 @@ class Command(BaseCommand):
             default=None,
             help="Calea fișierului de backup (implicit: backups/backup_<timestamp>.sql)",
         )
+        parser.add_argument(
+            "--mode",
+            choices=("sql", "sqlite"),
+            default="sql",
+            help="sql: dump cu INSERT-uri; sqlite: copie online prin API-ul .backup().",
+        )
+        parser.add_argument("--compress", choices=COMPRESSIONS, default="none")
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="Numărul de procese care exportă tabele în paralel (doar modul sql).",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Adaugă un backup la lanțul din --backup-dir: complet la prima rulare, "
+                "apoi doar rândurile noi/modificate și ștergerile."
+            ),
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Cu --incremental: începe un lanț nou cu un backup complet.",
+        )
+        parser.add_argument("--backup-dir", default="backups")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--rows-per-insert", type=int, default=ROWS_PER_INSERT)
 
     def handle(self, *args, **options):
+        if options["incremental"]:
+            return self._incremental(options)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        compress = options["compress"]
         output_path = options["output"]
         if not output_path:
             os.makedirs("backups", exist_ok=True)
-            output_path = os.path.join("backups", f"backup_{timestamp}.sql")
-
-        models_to_dump = [
-            m
-            for m in apps.get_models()
-            if not m._meta.app_label.startswith("auth")
-            and not m._meta.app_label.startswith("admin")
-            and not m._meta.app_label.startswith("contenttypes")
-            and not m._meta.app_label.startswith("sessions")
-        ]
-
-        def format_value(val):
-            if val is None:
-                return "NULL"
-            if isinstance(val, bool):
-                return "1" if val else "0"
-            if isinstance(val, (int, float)):
-                return str(val)
-            if isinstance(val, datetime):
-                return f"'{val.isoformat(sep=' ')}'"
-            if isinstance(val, models.Model):
-                return str(getattr(val, "pk"))
-            val_str = str(val).replace("'", "''")
-            return f"'{val_str}'"
-
-        lines = []
-        for model in models_to_dump:
-            table = model._meta.db_table
-            fields = [
-                f for f in model._meta.concrete_fields if not isinstance(f, models.AutoField)
-            ]
-            field_names = [f.column for f in fields]
-            for obj in model.objects.all():
-                values = [format_value(getattr(obj, f.attname)) for f in fields]
-                line = f"INSERT INTO {table} ({', '.join(field_names)}) VALUES ({', '.join(values)});"
-                lines.append(line)
-
-        with open(output_path, "w", encoding="utf-8") as fh:
-            fh.write("\n".join(lines))
-
-        self.stdout.write(self.style.SUCCESS(f"Backup salvat în {output_path}"))
+            if options["mode"] == "sqlite":
+                extension = ".sqlite3" + {"gzip": ".gz", "zstd": ".zst"}.get(compress, "")
+            else:
+                extension = EXTENSIONS[compress]
+            output_path = os.path.join("backups", f"backup_{timestamp}{extension}")
+
+        started = time.monotonic()
+        try:
+            if options["mode"] == "sqlite":
+                rows = None
+                self._backup_sqlite(output_path, compress)
+            elif options["jobs"] > 1:
+                rows = self._dump_parallel(output_path, options)
+            else:
+                rows = self._dump(output_path, options)
+        except BackupError as exc:
+            raise CommandError(str(exc)) from exc
+
+        elapsed = time.monotonic() - started
+        size_mb = os.path.getsize(output_path) / (1024 * 1024)
+        summary = f"{size_mb:.1f} MB in {elapsed:.2f}s"
+        if rows is not None:
+            rate = rows / elapsed if elapsed else rows
+            summary = f"{rows} randuri, {summary} ({rate:.0f} randuri/s)"
+        self.stdout.write(self.style.SUCCESS(f"Backup salvat în {output_path}: {summary}"))
+
+    def _incremental(self, options) -> None:
+        if options["mode"] != "sql" or options["jobs"] > 1 or options["output"]:
+            raise CommandError("--incremental nu se combina cu --mode sqlite, --jobs sau --output.")
+
+        def progress(table, stats):
+            self.stdout.write(
+                f"  {table}: {stats['changed']} noi/modificate, {stats['deleted']} sterse, "
+                f"{stats['rows']} in total"
+            )
+
+        started = time.monotonic()
+        try:
+            entry = backup_incremental(
+                options["backup_dir"],
+                compress=options["compress"],
+                full=options["full"],
+                chunk_size=options["chunk_size"],
+                rows_per_insert=options["rows_per_insert"],
+                progress=progress,
+            )
+        except BackupError as exc:
+            raise CommandError(str(exc)) from exc
+        changed = sum(table["changed"] + table["deleted"] for table in entry["tables"].values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backup {entry['kind']} salvat in {options['backup_dir']}/{entry['file']}: "
+                f"{changed} modificari in {time.monotonic() - started:.2f}s"
+            )
+        )
+
+    def _dump(self, output_path: str, options) -> int:
+        total = 0
+        with open_output(output_path, options["compress"]) as out:
+            for model in models_to_dump():
+                table_started = time.monotonic()
+                count = dump_table(
+                    out,
+                    model,
+                    chunk_size=options["chunk_size"],
+                    rows_per_insert=options["rows_per_insert"],
+                )
+                total += count
+                self.stdout.write(
+                    f"  {model._meta.db_table}: {count} randuri in "
+                    f"{time.monotonic() - table_started:.2f}s"
+                )
+        return total
+
+    def _dump_parallel(self, output_path: str, options) -> int:
+        """
+        Fiecare tabel e scris de un proces separat într-un fișier parțial; părțile sunt
+        apoi concatenate în ordine (gzip și zstd acceptă fișiere din mai multe segmente).
+        """
+        labels = [model._meta.label for model in models_to_dump()]
+        parts = [f"{output_path}.part{index}" for index in range(len(labels))]
+        connections.close_all()
+        total = 0
+        try:
+            with ProcessPoolExecutor(max_workers=options["jobs"], initializer=init_worker) as pool:
+                futures = [
+                    pool.submit(
+                        dump_table_to_file,
+                        label,
+                        part,
+                        options["compress"],
+                        options["chunk_size"],
+                        options["rows_per_insert"],
+                    )
+                    for label, part in zip(labels, parts)
+                ]
+                for future in futures:
+                    label, count, elapsed = future.result()
+                    total += count
+                    self.stdout.write(f"  {label}: {count} randuri in {elapsed:.2f}s")
+            with open(output_path, "wb") as out:
+                for part in parts:
+                    with open(part, "rb") as fh:
+                        shutil.copyfileobj(fh, out, 1024 * 1024)
+        finally:
+            for part in parts:
+                if os.path.exists(part):
+                    os.remove(part)
+        return total
+
+    def _backup_sqlite(self, output_path: str, compress: str) -> None:
+        def progress(copied: int, total: int) -> None:
+            percent = copied * 100 // total if total else 100
+            self.stdout.write(f"  copiate {copied}/{total} pagini ({percent}%)")
+
+        target = output_path if compress == "none" else f"{output_path}.tmp"
+        try:
+            sqlite_backup(target, progress=progress)
+            if target != output_path:
+                with open(target, "rb") as src, open_binary_output(output_path, compress) as out:
+                    shutil.copyfileobj(src, out, 1024 * 1024)
+        finally:
+            if target != output_path and os.path.exists(target):
+                os.remove(target)
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from datetime import timedelta
+from itertools import islice
+from typing import Dict
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections, transaction
+from django.db.models import Max
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from hardware.mailing import batched
+from hardware.models import Category, Product, ProductView, RequestLog
+from hardware.sessions import SessionStore as CachedSessionStore, writer
+
+
+LOAD_THREADS = 8
+
+
+def bench_cleanup_unconfirmed(command, size: int) -> None:
+    from hardware.management.commands.run_scheduler import cleanup_unconfirmed_users
+
+    joined = timezone.now() - timedelta(days=1)
+    product_ids = list(Product.objects.values_list("id", flat=True)[:5])
+    started = time.monotonic()
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"bench_neconfirmat_{index}",
+                email=f"bench{index}@example.com",
+                password="!",
+                email_confirmat=False,
+                date_joined=joined,
+            )
+            for index in range(size)
+        ],
+        batch_size=5000,
+    )
+    if product_ids:
+        ProductView.objects.bulk_create(
+            [
+                ProductView(user=user, product_id=product_ids[index % len(product_ids)])
+                for index, user in enumerate(users)
+            ],
+            batch_size=5000,
+        )
+    command.stdout.write(f"Pregatire: {size} useri in {time.monotonic() - started:.2f}s")
+
+    started = time.monotonic()
+    deleted = cleanup_unconfirmed_users(timezone.localtime())
+    elapsed = time.monotonic() - started
+    command.stdout.write(
+        f"cleanup_unconfirmed_users: {deleted} useri in {elapsed:.2f}s "
+        f"({deleted / elapsed if elapsed else deleted:.0f} useri/s)"
+    )
+
+
+def bench_promotion_recipients(command, size: int) -> None:
+    from hardware.recipients import enqueue_promotion, resolve_recipients
+    from hardware.views import MIN_VIEWS_FOR_PROMO, PROMO_TEMPLATES
+
+    product_ids = list(Product.objects.values_list("id", flat=True))
+    category_ids = list(
+        Category.objects.filter(slug__in=PROMO_TEMPLATES).values_list("id", flat=True)
+    )
+    if not product_ids or not category_ids:
+        raise CommandError("Scenariul are nevoie de produse si categorii de promotie.")
+    per_user = len(product_ids)
+    users_count = -(-size // per_user)
+    started = time.monotonic()
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"bench_promo_{index}",
+                email=f"bench_promo{index}@example.com",
+                password="!",
+                email_confirmat=index % 10 != 0,
+            )
+            for index in range(users_count)
+        ],
+        batch_size=5000,
+    )
+    views = (
+        ProductView(user=user, product_id=product_id)
+        for user in users
+        for product_id in product_ids
+    )
+    for chunk in batched(islice(views, size), 10_000):
+        ProductView.objects.bulk_create(chunk)
+    command.stdout.write(
+        f"Pregatire: {size} vizualizari pentru {users_count} useri "
+        f"in {time.monotonic() - started:.2f}s"
+    )
+
+    started = time.monotonic()
+    resolved = sum(1 for _ in resolve_recipients(category_ids, MIN_VIEWS_FOR_PROMO))
+    elapsed = time.monotonic() - started
+    command.stdout.write(
+        f"resolve_recipients: {resolved} destinatari unici in {elapsed:.2f}s "
+        f"({size / elapsed if elapsed else size:.0f} vizualizari/s)"
+    )
+
+    started = time.monotonic()
+    per_category = enqueue_promotion(
+        category_ids,
+        MIN_VIEWS_FOR_PROMO,
+        lambda category_id, email: EmailMessage("Promo", "Corp", None, [email]),
+    )
+    elapsed = time.monotonic() - started
+    queued = sum(per_category.values())
+    command.stdout.write(
+        f"enqueue_promotion: {queued} mesaje in coada in {elapsed:.2f}s "
+        f"({queued / elapsed if elapsed else queued:.0f} mesaje/s)"
+    )
+
+
+def _load_worker(requests: int, slug: str, index: int, results: Dict[str, list]) -> None:
+    latencies, errors, sessions = results["latencies"], results["errors"], results["sessions"]
+    client = Client()
+    try:
+        for step in range(requests):
+            started = time.monotonic()
+            try:
+                kind = step % 4
+                if kind == 0:
+                    response = client.get(reverse("hardware:products"))
+                elif kind == 1:
+                    response = client.get(reverse("hardware:product_detail", args=[slug]))
+                elif kind == 2:
+                    cache.set(f"bench_load:{index}:{step}", step)
+                    response = None
+                else:
+                    session = SessionStore()
+                    session["bench"] = step
+                    session.save()
+                    sessions.append(session.session_key)
+                    response = None
+                if response is not None and response.status_code >= 500:
+                    errors.append(f"HTTP {response.status_code}")
+            except OperationalError as exc:
+                errors.append(str(exc))
+            latencies.append(time.monotonic() - started)
+    finally:
+        cookie = client.cookies.get(settings.SESSION_COOKIE_NAME)
+        if cookie is not None:
+            sessions.append(cookie.value)
+        connections.close_all()
+
+
+def _run_load(command, profile: str, size: int, threads: int) -> None:
+    slug = Product.objects.values_list("slug", flat=True).first()
+    logs_before = RequestLog.objects.count()
+    results: Dict[str, list] = {"latencies": [], "errors": [], "sessions": []}
+    per_thread = max(size // threads, 1)
+    connections.close_all()
+    started = time.monotonic()
+    workers = [
+        threading.Thread(target=_load_worker, args=(per_thread, slug, index, results))
+        for index in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.monotonic() - started
+
+    expected_logs = sum(1 for step in range(per_thread) if step % 4 < 2) * threads
+    lost_logs = expected_logs - (RequestLog.objects.count() - logs_before)
+    latencies, errors = sorted(results["latencies"]), results["errors"]
+    Session.objects.filter(session_key__in=results["sessions"]).delete()
+    cache.delete_many(
+        [f"bench_load:{index}:{step}" for index in range(threads) for step in range(per_thread)]
+    )
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    p50 = statistics.median(latencies) if latencies else 0.0
+    command.stdout.write(
+        f"{profile}: {len(latencies)} operatii in {elapsed:.2f}s "
+        f"({len(latencies) / elapsed:.0f} op/s), p50 {p50 * 1000:.1f} ms, "
+        f"p95 {p95 * 1000:.1f} ms, erori {len(errors)}, loguri pierdute {lost_logs}"
+    )
+    for message in sorted(set(errors))[:3]:
+        command.stdout.write(f"  eroare: {message}")
+
+
+def bench_sqlite_load(command, size: int) -> None:
+    """
+    Încărcare mixtă citire/scriere (pagini de catalog cu RequestLog, cache, sesiuni)
+    pe 8 thread-uri, întâi cu setările implicite SQLite, apoi cu SQLITE_PRAGMAS.
+    """
+    if connection.vendor != "sqlite":
+        raise CommandError("Scenariul sqlite_load are nevoie de backend-ul SQLite.")
+    settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+    original_options = settings_dict.get("OPTIONS", {})
+    first_log_id = RequestLog.objects.aggregate(Max("id"))["id__max"] or 0
+    default_pragmas = {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": None,
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+    }
+    try:
+        settings_dict["OPTIONS"] = {}
+        with override_settings(SQLITE_PRAGMAS=default_pragmas):
+            _run_load(command, "implicit", size, LOAD_THREADS)
+        settings_dict["OPTIONS"] = original_options
+        _run_load(command, "optimizat", size, LOAD_THREADS)
+    finally:
+        settings_dict["OPTIONS"] = original_options
+        connections.close_all()
+        RequestLog.objects.filter(id__gt=first_log_id).delete()
+
+
+bench_sqlite_load.transactional = False
+
+
+def _session_requests(command, engine, label: str, size: int) -> None:
+    keys = []
+    writes_before = Session.objects.count()
+    started = time.monotonic()
+    for index in range(size):
+        if index % 10 == 0:
+            session = engine()
+            session["cart"] = {}
+            session.save()
+            keys.append(session.session_key)
+        session = engine(keys[-1])
+        cart = session.get("cart", {})
+        if index % 3 == 0:
+            cart[str(index)] = {"qty": 1}
+        session["cart"] = cart
+        session.modified = True
+        session.save()
+    elapsed = time.monotonic() - started
+    writer.flush()
+    command.stdout.write(
+        f"{label}: {size} requesturi in {elapsed:.2f}s ({size / elapsed:.0f} req/s), "
+        f"{Session.objects.count() - writes_before} sesiuni in DB"
+    )
+    Session.objects.filter(session_key__in=keys).delete()
+
+
+def bench_session_writes(command, size: int) -> None:
+    """
+    Cereri care ating coșul (două din trei salvează aceleași date): backend-ul DB
+    standard față de sesiunile din cache cu scriere amânată.
+    """
+    with override_settings(SESSION_WRITE_BEHIND_SECONDS=3600):
+        _session_requests(command, SessionStore, "db", size)
+        _session_requests(command, CachedSessionStore, "cache + write-behind", size)
+
+
+bench_session_writes.transactional = False
+
+
+SCENARIOS = {
+    "cleanup_unconfirmed": (bench_cleanup_unconfirmed, 100_000),
+    "promotion_recipients": (bench_promotion_recipients, 1_000_000),
+    "sqlite_load": (bench_sqlite_load, 4000),
+    "session_writes": (bench_session_writes, 5000),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rulează un scenariu de benchmark. Datele generate sunt create într-o "
+        "tranzacție anulată la final (sqlite_load, care rulează pe mai multe "
+        "thread-uri, își șterge singur datele), deci baza de date rămâne neschimbată."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenario", choices=sorted(SCENARIOS))
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=None,
+            help="Dimensiunea setului de date (implicit depinde de scenariu).",
+        )
+
+    def handle(self, *args, **options):
+        func, default_size = SCENARIOS[options["scenario"]]
+        size = options["size"] or default_size
+        if size <= 0:
+            raise CommandError("--size trebuie să fie pozitiv.")
+        if not getattr(func, "transactional", True):
+            func(self, size)
+            self.stdout.write(self.style.SUCCESS("Benchmark terminat."))
+            return
+        with transaction.atomic():
+            func(self, size)
+            transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS("Benchmark terminat (modificarile au fost anulate)."))
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from hardware.recommendations import DEFAULT_TOP_K, build_recommendations
+
+
+class Command(BaseCommand):
+    help = "Recalculează recomandările „cumpărate împreună” și „vizualizate împreună”."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=DEFAULT_TOP_K,
+            help=f"Numărul de recomandări păstrate per produs (implicit: {DEFAULT_TOP_K})",
+        )
+
+    def handle(self, *args, **options):
+        stored = build_recommendations(top_k=options["top_k"])
+        for kind, count in stored.items():
+            self.stdout.write(f"{kind}: {count} recomandari")
+        self.stdout.write(self.style.SUCCESS("Recomandari actualizate."))
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from hardware.sitemap_build import build_sitemaps, sitemap_root
+
+
+class Command(BaseCommand):
+    help = "Generează pe disc sitemap-urile (index + fișiere pe secțiuni)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignoră starea salvată și randează din nou toate fișierele.",
+        )
+
+    def handle(self, *args, **options):
+        stats = build_sitemaps(full=options["full"])
+        self.stdout.write(
+            f"{stats['rendered']} randate, {stats['unchanged']} neschimbate, "
+            f"{stats['removed']} sterse in {sitemap_root()}"
+        )
+        self.stdout.write(self.style.SUCCESS("Sitemap actualizat."))
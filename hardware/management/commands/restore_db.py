@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hardware.backup import (
+    BackupError,
+    chain_files,
+    create_indexes,
+    drop_indexes,
+    fast_load_pragmas,
+    restore_file,
+    table_aliases,
+    verify_chain,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Restaurează un backup făcut cu backup_db: un fișier SQL sau un director cu "
+        "manifest (backup complet urmat de lanțul de delte)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Fișierul de backup sau directorul cu manifest.json.")
+        parser.add_argument(
+            "--batch-statements",
+            type=int,
+            default=200,
+            help="Câte instrucțiuni (INSERT-uri cu mai multe rânduri) intră într-o tranzacție.",
+        )
+        parser.add_argument(
+            "--keep-indexes",
+            action="store_true",
+            help="Nu șterge indexurile secundare pe durata încărcării.",
+        )
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        verbosity = options["verbosity"]
+        is_chain = os.path.isdir(source)
+        aliases = table_aliases()
+        totals = {"rows": 0, "bytes": 0}
+        mismatches = {}
+        started = time.monotonic()
+
+        def progress(statements, rows):
+            if verbosity > 1:
+                self.stdout.write(f"    {statements} instructiuni, {rows} randuri")
+
+        try:
+            files = chain_files(source) if is_chain else [source]
+            with fast_load_pragmas(set(aliases.values())):
+                index_sql = [] if options["keep_indexes"] else drop_indexes(aliases)
+                try:
+                    for path in files:
+                        file_started = time.monotonic()
+                        stats = restore_file(
+                            path,
+                            batch_statements=options["batch_statements"],
+                            progress=progress,
+                        )
+                        elapsed = time.monotonic() - file_started
+                        totals["rows"] += stats["rows"]
+                        totals["bytes"] += stats["bytes"]
+                        mismatches.update(stats["mismatches"])
+                        rates = self._rates(stats["rows"], stats["bytes"], elapsed)
+                        self.stdout.write(
+                            f"  {os.path.basename(path)}: {stats['rows']} randuri "
+                            f"in {elapsed:.2f}s ({rates})"
+                        )
+                finally:
+                    index_started = time.monotonic()
+                    create_indexes(index_sql)
+                    if index_sql:
+                        self.stdout.write(
+                            f"  {len(index_sql)} indexuri reconstruite in "
+                            f"{time.monotonic() - index_started:.2f}s"
+                        )
+            if is_chain:
+                mismatches.update(verify_chain(source))
+        except (BackupError, OSError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        if mismatches:
+            details = ", ".join(
+                f"{table}: asteptat {expected}, gasit {actual}"
+                for table, (expected, actual) in sorted(mismatches.items())
+            )
+            raise CommandError(f"Numarul de randuri nu corespunde: {details}")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Restaurare terminata: {len(files)} fisiere, {totals['rows']} randuri in "
+                f"{elapsed:.2f}s ({self._rates(totals['rows'], totals['bytes'], elapsed)})"
+            )
+        )
+
+    @staticmethod
+    def _rates(rows: int, size: int, elapsed: float) -> str:
+        elapsed = elapsed or 1e-9
+        return f"{size / (1024 * 1024) / elapsed:.1f} MB/s, {rows / elapsed:.0f} randuri/s"
@@ -1,156 +1,283 @@
 import random
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.core.mail import EmailMultiAlternatives, send_mail
-from django.template.loader import render_to_string
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.db import connections, models, transaction
+from django.db.models import Exists, Max, Min, OuterRef
+from django.template.loader import get_template
 from django.urls import reverse
-from django.utils import timezone
 import logging
 
 from accounts.models import User
-from hardware.models import FeedbackRequest, Nota, Product, Promotion, RequestLog
+from accounts.tokens import purge_expired
+from hardware.backup import refresh_snapshot
+from hardware.mailing import MailingCheckpoint, batched, dispatch, send_batch
+from hardware.models import FeedbackRequest, Nota, Promotion, RequestLog
+from hardware.outbox import drain_outbox, purge_sent
+from hardware.page_cache import forget_dependencies
+from hardware.product_of_day import get_product_of_day_banner, pick_product_of_day
+from hardware.recommendations import build_recommendations
+from hardware.routers import REPLICA_DB, replica_path
+from hardware.scheduler import ScheduledTask, Scheduler
+from hardware.sitemap_build import build_sitemaps
+from hardware.view_tracking import flush_views
 
 
-DAY_MAP = {
-    "luni": 0,
-    "marti": 1,
-    "miercuri": 2,
-    "joi": 3,
-    "vineri": 4,
-    "sambata": 5,
-    "duminica": 6,
-}
+logger = logging.getLogger("django")
 
 
-logger = logging.getLogger("django")
+def build_tasks():
+    timeout = settings.SCHEDULER_TASK_TIMEOUT_SECONDS
+    retry = settings.SCHEDULER_RETRY_SECONDS
+    return [
+        ScheduledTask(
+            "cleanup_unconfirmed",
+            cleanup_unconfirmed_users,
+            every_minutes=settings.CLEANUP_UNCONFIRMED_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "cleanup_logs",
+            cleanup_request_logs,
+            every_minutes=settings.LOG_CLEANUP_INTERVAL_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "token_purge",
+            purge_expired_tokens,
+            every_minutes=settings.TOKEN_PURGE_INTERVAL_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "newsletter",
+            send_weekly_newsletter,
+            weekday=settings.NEWSLETTER_DAY,
+            hour=settings.NEWSLETTER_HOUR,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "promo_cleanup",
+            cleanup_expired_promotions,
+            weekday=settings.PROMO_CLEANUP_DAY,
+            hour=settings.PROMO_CLEANUP_HOUR,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "feedback",
+            send_feedback_requests,
+            every_minutes=settings.FEEDBACK_CHECK_INTERVAL_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "product_views",
+            flush_product_views,
+            every_minutes=settings.PRODUCT_VIEW_FLUSH_INTERVAL_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "product_of_day",
+            warm_product_of_day,
+            every_minutes=settings.PRODUCT_OF_DAY_WARM_INTERVAL_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "outbox",
+            send_outbox,
+            every_minutes=settings.OUTBOX_DRAIN_INTERVAL_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "catalog_snapshot",
+            refresh_catalog_snapshot,
+            every_minutes=settings.CATALOG_SNAPSHOT_MINUTES if settings.CATALOG_READ_REPLICA else 0,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "sitemaps",
+            rebuild_sitemaps,
+            every_minutes=settings.SITEMAP_BUILD_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+        ScheduledTask(
+            "recommendations",
+            rebuild_recommendations,
+            every_minutes=settings.RECOMMENDATIONS_REBUILD_MINUTES,
+            timeout=timeout,
+            retry_seconds=retry,
+        ),
+    ]
 
 
 class Command(BaseCommand):
     help = "Ruleaza taskurile programate pentru laborator."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.SCHEDULER_WORKERS,
+            help="Numarul de thread-uri care ruleaza taskurile.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Ruleaza o singura data taskurile scadente si iese.",
+        )
+
     def handle(self, *args, **options):
-        last_run = {
-            "cleanup_unconfirmed": None,
-            "cleanup_logs": None,
-            "newsletter": None,
-            "promo_cleanup": None,
-            "feedback": None,
-        }
-
-        self.stdout.write(self.style.SUCCESS("Scheduler pornit."))
-        while True:
-            now = timezone.localtime()
-
-            if _should_run_every(
-                now,
-                last_run["cleanup_unconfirmed"],
-                settings.CLEANUP_UNCONFIRMED_MINUTES,
-            ):
-                cleanup_unconfirmed_users(now)
-                last_run["cleanup_unconfirmed"] = now
-
-            if _should_run_every(
-                now,
-                last_run["cleanup_logs"],
-                settings.LOG_CLEANUP_INTERVAL_MINUTES,
-            ):
-                cleanup_request_logs(now)
-                last_run["cleanup_logs"] = now
-
-            if _should_run_weekly(
-                now,
-                last_run["newsletter"],
-                settings.NEWSLETTER_DAY,
-                settings.NEWSLETTER_HOUR,
-            ):
-                send_weekly_newsletter(now)
-                last_run["newsletter"] = now
-
-            if _should_run_weekly(
-                now,
-                last_run["promo_cleanup"],
-                settings.PROMO_CLEANUP_DAY,
-                settings.PROMO_CLEANUP_HOUR,
-            ):
-                cleanup_expired_promotions(now)
-                last_run["promo_cleanup"] = now
-
-            if _should_run_every(
-                now,
-                last_run["feedback"],
-                settings.FEEDBACK_CHECK_INTERVAL_MINUTES,
-            ):
-                send_feedback_requests(now)
-                last_run["feedback"] = now
-
-            time.sleep(30)
-
-
-def _should_run_every(now, last_run, minutes):
-    if minutes <= 0:
-        return False
-    if last_run is None:
-        return True
-    delta = now - last_run
-    return delta.total_seconds() >= minutes * 60
-
-
-def _should_run_weekly(now, last_run, day_name, hour):
-    day_index = DAY_MAP.get(str(day_name).lower())
-    if day_index is None:
-        return False
-    if now.weekday() != day_index or now.hour != int(hour):
-        return False
-    if last_run is None:
-        return True
-    return last_run.date() != now.date()
-
-
-def cleanup_unconfirmed_users(now):
+        scheduler = Scheduler(
+            build_tasks(),
+            workers=options["workers"],
+            max_sleep=settings.SCHEDULER_MAX_SLEEP_SECONDS,
+        )
+        if options["once"]:
+            ran = scheduler.run_pending()
+            self.stdout.write(f"Taskuri rulate: {', '.join(ran) or '-'}")
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Scheduler pornit ({scheduler.instance_id})."))
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            scheduler.stop()
+            self.stdout.write("Scheduler oprit.")
+
+
+def cleanup_unconfirmed_users(now, chunk_size=None):
+    """
+    Șterge userii neconfirmați pe intervale de PK, câte un interval per tranzacție.
+    Fiecare interval este șters cu un singur DELETE per tabel dependent, fără
+    Collector și fără semnale per user; paginile din cache sunt invalidate per interval.
+    """
+    chunk_size = chunk_size or settings.CLEANUP_UNCONFIRMED_CHUNK_SIZE
     threshold = now - timedelta(minutes=settings.CLEANUP_UNCONFIRMED_MINUTES)
     users = User.objects.filter(email_confirmat=False, date_joined__lte=threshold)
-    count = users.count()
-    for user in users:
-        logger.warning("Stergere user neconfirmat: %s (%s)", user.username, user.email)
-        user.delete()
-    if count:
-        logger.info("Total useri neconfirmati stersi: %s", count)
+    bounds = users.aggregate(low=Min("pk"), high=Max("pk"))
+    if bounds["low"] is None:
+        return 0
+
+    started = time.monotonic()
+    total = 0
+    for start in range(bounds["low"], bounds["high"] + 1, chunk_size):
+        with transaction.atomic():
+            batch = users.filter(pk__gte=start, pk__lt=start + chunk_size)
+            pks = list(batch.values_list("pk", flat=True))
+            if not pks:
+                continue
+            total += _delete_cascade(batch)
+        forget_dependencies(User, pks)
+    elapsed = time.monotonic() - started
+    logger.info(
+        "Total useri neconfirmati stersi: %s in %.2fs (%.0f useri/s)",
+        total,
+        elapsed,
+        total / elapsed if elapsed else total,
+    )
+    return total
+
+
+def _delete_cascade(queryset) -> int:
+    """
+    DELETE pe bază de subinterogare în tabelele dependente (recursiv), apoi în tabelul
+    însuși. Ca `QuerySet.delete()`, dar fără să încarce rândurile și fără semnale.
+    """
+    model = queryset.model
+    # aceleași relații ca la Collector, inclusiv tabelele many-to-many ascunse
+    relations = [
+        field
+        for field in model._meta.get_fields(include_hidden=True)
+        if field.auto_created and not field.concrete and (field.one_to_one or field.one_to_many)
+    ]
+    for relation in relations:
+        related = relation.related_model._base_manager.filter(
+            **{f"{relation.field.name}__in": queryset.values("pk")}
+        )
+        if relation.on_delete is models.CASCADE:
+            _delete_cascade(related)
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+        elif relation.on_delete is not models.DO_NOTHING:
+            raise ValueError(f"{relation.related_model._meta.label}: on_delete nesuportat")
+    return queryset._raw_delete(queryset.db)
+
+
+NEWSLETTER_TIPS = [
+    "Verifica sculele noi din categoria scule electrice.",
+    "Nu uita de echipamentele de protectie pentru proiectele DIY.",
+    "Cele mai vandute produse sunt actualizate in catalog.",
+    "Incearca un tutorial nou pentru imbunatatirea abilitatilor.",
+]
 
 
 def send_weekly_newsletter(now):
+    # o campanie întreruptă e continuată, chiar dacă reluarea are loc în altă zi
+    checkpoint = MailingCheckpoint("newsletter", now.date().isoformat(), resume=True)
+    if checkpoint.done:
+        logger.info("Newsletterul pentru %s a fost deja trimis.", now.date())
+        return
+    campaign = date.fromisoformat(checkpoint.run_key)
+
     threshold = now - timedelta(minutes=settings.NEWSLETTER_MIN_AGE_MINUTES)
-    users = (
-        User.objects.filter(email_confirmat=True, date_joined__lte=threshold)
+    recipients = (
+        User.objects.filter(
+            email_confirmat=True,
+            date_joined__lte=threshold,
+            id__gt=checkpoint.last_id,
+        )
         .exclude(email="")
+        .order_by("id")
+        .values_list("id", "email", "first_name", "username")
+        .iterator(chunk_size=settings.NEWSLETTER_BATCH_SIZE)
     )
-    if not users.exists():
-        logger.info("Nu exista utilizatori eligibili pentru newsletter.")
-        return
-
-    tips = [
-        "Verifica sculele noi din categoria scule electrice.",
-        "Nu uita de echipamentele de protectie pentru proiectele DIY.",
-        "Cele mai vandute produse sunt actualizate in catalog.",
-        "Incearca un tutorial nou pentru imbunatatirea abilitatilor.",
-    ]
-    products = list(Product.objects.values_list("name", flat=True))
+    product = pick_product_of_day(campaign)
+    produs = product.name if product else "produsele recomandate"
+    subject = f"Newsletter Magazin Hardware - {campaign:%d.%m.%Y}"
     sender = getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@example.com")
 
-    for user in users:
-        tip = random.choice(tips)
-        produs = random.choice(products) if products else "produsele recomandate"
-        subject = f"Newsletter Magazin Hardware - {now:%d.%m.%Y}"
-        body = (
-            f"Salut, {user.first_name or user.username}!\n\n"
-            f"{tip}\n"
-            f"Recomandarea zilei: {produs}.\n\n"
-            "Multumim ca esti alaturi de noi!"
-        )
-        send_mail(subject, body, sender, [user.email])
-    logger.info("Newsletter trimis catre %s utilizatori.", users.count())
+    def batches():
+        pending = (row for row in recipients if not checkpoint.is_sent(row[0]))
+        for seq, rows in enumerate(batched(pending, settings.NEWSLETTER_BATCH_SIZE)):
+            messages = [
+                EmailMessage(
+                    subject,
+                    (
+                        f"Salut, {first_name or username}!\n\n"
+                        f"{random.choice(NEWSLETTER_TIPS)}\n"
+                        f"Recomandarea zilei: {produs}.\n\n"
+                        "Multumim ca esti alaturi de noi!"
+                    ),
+                    sender,
+                    [email],
+                )
+                for _, email, first_name, username in rows
+            ]
+            yield (seq, rows[0][0], rows[-1][0]), messages
+
+    sent = dispatch(
+        batches(),
+        workers=settings.NEWSLETTER_WORKERS,
+        rate_limit=settings.NEWSLETTER_RATE_LIMIT,
+        on_sent=lambda key, count: checkpoint.mark(*key, count),
+    )
+    checkpoint.finish()
+    if not checkpoint.sent:
+        logger.info("Nu exista utilizatori eligibili pentru newsletter.")
+        return
+    logger.info("Newsletter trimis catre %s utilizatori (%s in aceasta rulare).", checkpoint.sent, sent)
 
 
 def cleanup_request_logs(now):
@@ -162,6 +289,46 @@ def cleanup_request_logs(now):
         logger.info("Sterse %s loguri mai vechi de %s zile.", count, settings.REQUESTLOG_RETENTION_DAYS)
 
 
+def purge_expired_tokens(now):
+    count = purge_expired(now)
+    if count:
+        logger.info("Sterse %s tokenuri expirate.", count)
+
+
+def rebuild_sitemaps(now):
+    build_sitemaps()
+
+
+def flush_product_views(now):
+    count = flush_views()
+    if count:
+        logger.info("Salvate %s vizualizari de produse din buffer.", count)
+
+
+def warm_product_of_day(now):
+    get_product_of_day_banner(now.date())
+
+
+def send_outbox(now):
+    drain_outbox()
+    purged = purge_sent(now)
+    if purged:
+        logger.info("Sterse %s emailuri trimise din outbox.", purged)
+
+
+def refresh_catalog_snapshot(now):
+    path = replica_path()
+    if not path:
+        return
+    refresh_snapshot(path)
+    connections[REPLICA_DB].close()
+    logger.info("Snapshot-ul de catalog a fost reimprospatat in %s", path)
+
+
+def rebuild_recommendations(now):
+    build_recommendations()
+
+
 def cleanup_expired_promotions(now):
     promos = Promotion.objects.filter(expires_at__lt=now.date())
     count = promos.count()
@@ -171,36 +338,62 @@ def cleanup_expired_promotions(now):
 
 
 def send_feedback_requests(now):
+    """
+    Trimite cererile de feedback scadente pe loturi: cererile pentru produse deja
+    notate sunt șterse cu un singur DELETE (anti-join pe Nota), restul sunt
+    trimise pe o conexiune comună per lot și avansate cu un bulk_update.
+    """
     due = FeedbackRequest.objects.filter(next_send_at__lte=now)
-    if not due.exists():
-        return
+    rated = Nota.objects.filter(user=OuterRef("user"), product=OuterRef("product"))
+    removed, _ = due.filter(Exists(rated)).delete()
+    if removed:
+        logger.info("Sterse %s cereri de feedback pentru produse deja notate.", removed)
+
     base_url = settings.SITE_URL.rstrip("/")
     sender = getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@example.com")
-
-    for request_item in due:
-        if Nota.objects.filter(user=request_item.user, product=request_item.product).exists():
-            request_item.delete()
-            continue
-        if not request_item.user.email:
-            continue
-        rating_links = []
-        for rating in range(1, 6):
-            url = f"{base_url}{reverse('hardware:rate_product', args=[request_item.product.id, rating])}"
-            rating_links.append({"rating": rating, "url": url})
-
-        context = {
-            "user": request_item.user,
-            "product": request_item.product,
-            "rating_links": rating_links,
-        }
-        subject = f"Feedback pentru {request_item.product.name}"
-        text_body = render_to_string("hardware/emails/feedback_request.txt", context)
-        html_body = render_to_string("hardware/emails/feedback_request.html", context)
-        email = EmailMultiAlternatives(subject, text_body, sender, [request_item.user.email])
-        email.attach_alternative(html_body, "text/html")
-        email.send()
-        request_item.next_send_at = _add_month(request_item.next_send_at)
-        request_item.save(update_fields=["next_send_at"])
+    text_template = get_template("hardware/emails/feedback_request.txt")
+    html_template = get_template("hardware/emails/feedback_request.html")
+    rating_links_cache = {}
+
+    def rating_links(product_id):
+        if product_id not in rating_links_cache:
+            rating_links_cache[product_id] = [
+                {
+                    "rating": rating,
+                    "url": f"{base_url}{reverse('hardware:rate_product', args=[product_id, rating])}",
+                }
+                for rating in range(1, 6)
+            ]
+        return rating_links_cache[product_id]
+
+    pending = due.exclude(user__email="").select_related("user", "product").order_by("id")
+    last_id = 0
+    sent = 0
+    while True:
+        chunk = list(pending.filter(id__gt=last_id)[: settings.FEEDBACK_BATCH_SIZE])
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+        messages = []
+        for request_item in chunk:
+            context = {
+                "user": request_item.user,
+                "product": request_item.product,
+                "rating_links": rating_links(request_item.product_id),
+            }
+            email = EmailMultiAlternatives(
+                f"Feedback pentru {request_item.product.name}",
+                text_template.render(context),
+                sender,
+                [request_item.user.email],
+            )
+            email.attach_alternative(html_template.render(context), "text/html")
+            messages.append(email)
+            request_item.next_send_at = _add_month(request_item.next_send_at)
+        sent += send_batch(messages)
+        FeedbackRequest.objects.bulk_update(chunk, ["next_send_at"])
+    if sent:
+        logger.info("Trimise %s cereri de feedback.", sent)
 
 
 def _add_month(dt: datetime) -> datetime:
@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hardware", "0009_purchases_and_feedback"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductRecommendation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("cumparate", "Cumparate impreuna"), ("vizualizate", "Vizualizate impreuna")], max_length=12)),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                ("product", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="recommendations", to="hardware.product")),
+                ("recommended", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="hardware.product")),
+            ],
+            options={
+                "verbose_name": "Recomandare produs",
+                "verbose_name_plural": "Recomandari produse",
+                "ordering": ["product", "kind", "rank"],
+                "constraints": [models.UniqueConstraint(fields=("product", "kind", "rank"), name="unique_product_recommendation_rank")],
+            },
+        ),
+    ]
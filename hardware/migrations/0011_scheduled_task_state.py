@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hardware", "0010_product_recommendations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduledTaskState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=80, unique=True)),
+                ("last_run_at", models.DateTimeField(blank=True, null=True)),
+                ("last_duration", models.FloatField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                ("locked_by", models.CharField(blank=True, max_length=120)),
+                ("locked_until", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Stare task programat",
+                "verbose_name_plural": "Stari taskuri programate",
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hardware", "0011_scheduled_task_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduledtaskstate",
+            name="checkpoint",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hardware", "0013_outbox_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tutorial",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hardware", "0014_tutorial_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingProductView",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("user_id", models.BigIntegerField()),
+                ("product_id", models.BigIntegerField()),
+                ("viewed_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Vizualizare în așteptare",
+                "verbose_name_plural": "Vizualizări în așteptare",
+                "indexes": [models.Index(fields=["user_id"], name="pendingview_user_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hardware", "0015_pending_product_views"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduledtaskstate",
+            name="retry_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -61,9 +61,6 @@ class Material(models.Model):
     def __str__(self) -> str:
         return self.name
 
-    def get_absolute_url(self):
-        return reverse("hardware:product_detail", kwargs={"slug": self.slug})
-
 
 class Product(models.Model):
     class Condition(models.TextChoices):
@@ -117,6 +114,9 @@ class Product(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    def get_absolute_url(self):
+        return reverse("hardware:product_detail", kwargs={"slug": self.slug})
+
 
 class Accessory(models.Model):
     product = models.ForeignKey(
@@ -144,6 +144,7 @@ class Tutorial(models.Model):
     duration_minutes = models.IntegerField()
     difficulty = models.CharField(max_length=50)
     published_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
     products = models.ManyToManyField(
         Product, related_name="tutorials", blank=True
     )
@@ -231,6 +232,26 @@ class ProductView(models.Model):
         return f"{self.user} -> {self.product} ({self.viewed_at:%Y-%m-%d %H:%M})"
 
 
+class PendingProductView(models.Model):
+    """
+    Vizualizare încă nescrisă în ProductView; fără chei străine, în baza de analytics.
+    """
+
+    user_id = models.BigIntegerField()
+    product_id = models.BigIntegerField()
+    viewed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Vizualizare în așteptare"
+        verbose_name_plural = "Vizualizări în așteptare"
+        indexes = [
+            models.Index(fields=["user_id"], name="pendingview_user_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} -> {self.product_id} ({self.viewed_at:%Y-%m-%d %H:%M})"
+
+
 class Promotion(models.Model):
     name = models.CharField(max_length=120)
     subject = models.CharField(max_length=120)
@@ -322,3 +343,89 @@ class FeedbackRequest(models.Model):
 
     def __str__(self) -> str:
         return f"{self.user} - {self.product} ({self.next_send_at:%Y-%m-%d})"
+
+
+class ProductRecommendation(models.Model):
+    class Kind(models.TextChoices):
+        BOUGHT_TOGETHER = "cumparate", _("Cumparate impreuna")
+        ALSO_VIEWED = "vizualizate", _("Vizualizate impreuna")
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="recommendations",
+    )
+    recommended = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    kind = models.CharField(max_length=12, choices=Kind.choices)
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        verbose_name = "Recomandare produs"
+        verbose_name_plural = "Recomandari produse"
+        ordering = ["product", "kind", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "kind", "rank"], name="unique_product_recommendation_rank"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.product} -> {self.recommended} ({self.kind} #{self.rank})"
+
+
+class ScheduledTaskState(models.Model):
+    name = models.CharField(max_length=80, unique=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_duration = models.FloatField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=120, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    checkpoint = models.JSONField(default=dict, blank=True)
+    retry_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Stare task programat"
+        verbose_name_plural = "Stari taskuri programate"
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class OutboxEmail(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "in_asteptare", _("In asteptare")
+        SENT = "trimis", _("Trimis")
+        DEAD = "esuat", _("Esuat definitiv")
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=14,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Email in asteptare"
+        verbose_name_plural = "Emailuri in asteptare"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_next_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} ({self.get_status_display()})"
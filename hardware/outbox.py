@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from .mailing import RateLimiter, batched
+from .models import OutboxEmail
+
+
+logger = logging.getLogger("django")
+
+MAX_ERROR_LENGTH = 2000
+
+
+def _html_alternative(message: EmailMessage) -> str:
+    for content, mimetype in getattr(message, "alternatives", []):
+        if mimetype == "text/html":
+            return content
+    return ""
+
+
+def enqueue(messages: Iterable[EmailMessage]) -> int:
+    """
+    Pune mesajele în outbox cu un singur INSERT; trimiterea se face din scheduler.
+    """
+    rows = [
+        OutboxEmail(
+            subject=message.subject,
+            body=message.body,
+            html_body=_html_alternative(message),
+            from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=list(message.to),
+        )
+        for message in messages
+        if message.to
+    ]
+    if rows:
+        OutboxEmail.objects.bulk_create(rows)
+    return len(rows)
+
+
+def enqueue_mail(
+    subject: str,
+    body: str,
+    from_email: str | None,
+    recipient_list: Sequence[str],
+    *,
+    html_message: str | None = None,
+) -> int:
+    message = EmailMultiAlternatives(subject, body, from_email, list(recipient_list))
+    if html_message:
+        message.attach_alternative(html_message, "text/html")
+    return enqueue([message])
+
+
+def enqueue_mail_admins(subject: str, message: str, *, html_message: str | None = None) -> int:
+    """
+    Echivalentul lui mail_admins, dar prin outbox.
+    """
+    recipients = [email for _, email in settings.ADMINS]
+    if not recipients:
+        return 0
+    return enqueue_mail(
+        f"{settings.EMAIL_SUBJECT_PREFIX}{subject}",
+        message,
+        settings.SERVER_EMAIL,
+        recipients,
+        html_message=html_message,
+    )
+
+
+def _to_message(row: OutboxEmail) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(row.subject, row.body, row.from_email, row.to)
+    if row.html_body:
+        message.attach_alternative(row.html_body, "text/html")
+    return message
+
+
+def _send_rows(rows: List[OutboxEmail], limiter: RateLimiter) -> List[Tuple[OutboxEmail, str]]:
+    """
+    Trimite un lot pe o singură conexiune; un mesaj respins nu oprește restul lotului.
+    Întoarce (rând, eroare) pentru fiecare mesaj; eroarea e goală la succes.
+    """
+    limiter.acquire(len(rows))
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        return [(row, repr(exc)) for row in rows]
+    results = []
+    try:
+        for row in rows:
+            try:
+                connection.send_messages([_to_message(row)])
+                results.append((row, ""))
+            except Exception as exc:
+                results.append((row, repr(exc)))
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            logger.warning("Conexiunea SMTP a outbox-ului nu s-a inchis corect.")
+    return results
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Backoff exponențial cu jitter: baza * 2^(încercări - 1), plafonat.
+    """
+    base = getattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 60)
+    ceiling = getattr(settings, "OUTBOX_RETRY_MAX_SECONDS", 60 * 60 * 6)
+    delay = min(base * 2 ** max(attempts - 1, 0), ceiling)
+    return timedelta(seconds=delay + random.uniform(0, delay / 10))
+
+
+def _apply_results(
+    results: List[Tuple[OutboxEmail, str]], now: datetime, stats: Dict[str, int]
+) -> None:
+    max_attempts = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 6)
+    for row, error in results:
+        row.attempts += 1
+        if not error:
+            row.status = OutboxEmail.Status.SENT
+            row.sent_at = now
+            row.last_error = ""
+            stats["sent"] += 1
+            continue
+        row.last_error = error[:MAX_ERROR_LENGTH]
+        if row.attempts >= max_attempts:
+            row.status = OutboxEmail.Status.DEAD
+            stats["dead"] += 1
+            logger.error(
+                "Email %s mutat in dead-letter dupa %s incercari: %s",
+                row.id,
+                row.attempts,
+                row.last_error,
+            )
+        else:
+            row.next_attempt_at = now + retry_delay(row.attempts)
+            stats["retried"] += 1
+    OutboxEmail.objects.bulk_update(
+        [row for row, _ in results],
+        ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+    )
+
+
+def drain_outbox(
+    *,
+    batch_size: int | None = None,
+    workers: int | None = None,
+    rate_limit: float | None = None,
+) -> Dict[str, int]:
+    """
+    Trimite mesajele scadente în loturi, pe `workers` conexiuni în paralel,
+    până când coada nu mai are nimic de trimis acum.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 50)
+    workers = max(workers or getattr(settings, "OUTBOX_WORKERS", 2), 1)
+    if rate_limit is None:
+        rate_limit = getattr(settings, "OUTBOX_RATE_LIMIT", None)
+    limiter = RateLimiter(rate_limit)
+    stats = {"sent": 0, "retried": 0, "dead": 0}
+    started = time.monotonic()
+    last_id = 0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outbox") as pool:
+        while True:
+            rows = list(
+                OutboxEmail.objects.filter(
+                    status=OutboxEmail.Status.PENDING,
+                    next_attempt_at__lte=timezone.now(),
+                    id__gt=last_id,
+                ).order_by("id")[: batch_size * workers]
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            chunks = batched(rows, batch_size)
+            for results in pool.map(lambda chunk: _send_rows(chunk, limiter), chunks):
+                _apply_results(results, timezone.now(), stats)
+
+    elapsed = time.monotonic() - started
+    processed = sum(stats.values())
+    if processed:
+        logger.info(
+            "Outbox: %s trimise, %s reprogramate, %s esuate definitiv in %.2fs (%.1f mesaje/s)",
+            stats["sent"],
+            stats["retried"],
+            stats["dead"],
+            elapsed,
+            stats["sent"] / elapsed if elapsed else 0.0,
+        )
+    return stats
+
+
+def purge_sent(now: datetime | None = None) -> int:
+    days = getattr(settings, "OUTBOX_RETENTION_DAYS", 7)
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    deleted, _ = OutboxEmail.objects.filter(
+        status=OutboxEmail.Status.SENT, sent_at__lt=cutoff
+    ).delete()
+    return deleted
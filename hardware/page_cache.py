@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+
+
+DEPENDENCY_TIMEOUT = None
+RAW = "raw"
+ZLIB = "zlib"
+
+
+def dependency_key(instance: Model) -> str:
+    return _dependency_key(instance._meta.label_lower, instance.pk)
+
+
+def _dependency_key(label: str, pk: Any) -> str:
+    return f"page_dep:{label}:{pk}"
+
+
+def bump_dependency(instance: Model) -> None:
+    """
+    Marchează rândul ca modificat; paginile care depind de el devin invalide.
+    """
+    cache.set(dependency_key(instance), time.time_ns(), timeout=DEPENDENCY_TIMEOUT)
+
+
+def forget_dependencies(model: type[Model], pks: Iterable[Any]) -> None:
+    """
+    Invalidează dintr-un singur apel paginile care depind de rândurile `pks` (ex. șterse
+    în masă, fără semnale): o versiune lipsă primește una nouă la următoarea citire.
+    """
+    cache.delete_many([_dependency_key(model._meta.label_lower, pk) for pk in pks])
+
+
+def current_versions(keys: List[str], values: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Versiunile pentru `keys` (din `values`, dacă au fost deja citite). O cheie lipsă
+    (nefolosită încă sau eliminată de cull) primește o versiune nouă prin `add`, deci
+    nimic salvat cu o versiune mai veche nu mai e considerat valid.
+    """
+    values = {key: values.get(key) for key in keys} if values is not None else cache.get_many(keys)
+    missing = [key for key in keys if values.get(key) is None]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=DEPENDENCY_TIMEOUT)
+        values.update(cache.get_many(missing))
+    return values
+
+
+def _fingerprint(versions: Iterable[Any], variant: Any) -> str:
+    payload = json.dumps([list(versions), variant], default=str, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _pack(content: bytes) -> Tuple[str, bytes]:
+    threshold = getattr(settings, "PAGE_CACHE_COMPRESS_MIN_BYTES", 1024)
+    if threshold is not None and len(content) >= threshold:
+        return ZLIB, zlib.compress(content, 6)
+    return RAW, content
+
+
+def _unpack(entry: Tuple[str, bytes]) -> bytes:
+    encoding, content = entry
+    return zlib.decompress(content) if encoding == ZLIB else content
+
+
+def lookup(
+    key: str, dependencies: Iterable[Model], variant: Any = None
+) -> Tuple[bytes | None, str]:
+    """
+    Citește pagina și versiunile dependențelor cu un singur get_many.
+
+    Întoarce (conținut sau None, amprenta curentă); amprenta se dă mai departe lui
+    `store`, ca o modificare făcută în timpul randării să invalideze pagina salvată.
+    """
+    dep_keys = [dependency_key(instance) for instance in dependencies]
+    values = cache.get_many([key, *dep_keys])
+    versions = current_versions(dep_keys, values)
+    fingerprint = _fingerprint((versions.get(dep_key) for dep_key in dep_keys), variant)
+    entry = values.get(key)
+    if entry is None or entry[0] != fingerprint:
+        return None, fingerprint
+    return _unpack(entry[1]), fingerprint
+
+
+def store(key: str, fingerprint: str, content: bytes, timeout: int | None) -> None:
+    cache.set(key, (fingerprint, _pack(content)), timeout=timeout)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, FrozenSet, Iterable
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db.models import Q
+
+from .page_cache import current_versions
+
+
+GLOBAL_VERSION_KEY = "perm_version:all"
+STATE_ATTR = "_hardware_perm_state"
+
+
+def perm_version_key(user_id: int) -> str:
+    return f"perm_version:{user_id}"
+
+
+def perm_state_key(user_id: int) -> str:
+    return f"perm_state:{user_id}"
+
+
+def bump_permissions(user_ids: Iterable[int] | None = None) -> None:
+    """
+    Invalidează permisiunile din cache pentru userii dați; fără useri, pentru toți
+    (de ex. când se schimbă permisiunile unui grup).
+    """
+    version = time.time_ns()
+    if user_ids is None:
+        cache.set(GLOBAL_VERSION_KEY, version, timeout=None)
+        return
+    cache.set_many({perm_version_key(user_id): version for user_id in user_ids}, timeout=None)
+
+
+def forget_state(user) -> None:
+    user.__dict__.pop(STATE_ATTR, None)
+
+
+def _load_state(user) -> Dict[str, FrozenSet[str]]:
+    perms = (
+        Permission.objects.filter(Q(user=user) | Q(group__user=user))
+        .values_list("content_type__app_label", "codename")
+        .distinct()
+    )
+    return {
+        "perms": frozenset(f"{app_label}.{codename}" for app_label, codename in perms),
+        "groups": frozenset(user.groups.values_list("name", flat=True)),
+    }
+
+
+def permission_state(user) -> Dict[str, FrozenSet[str]]:
+    """
+    Permisiunile și grupurile userului: din obiect (aceeași cerere), apoi din cache
+    (validat cu versiunea userului și cea globală, un singur get_many), apoi din DB.
+    O versiune lipsă (eliminată din cache) e re-creată cu o valoare nouă, deci nu
+    poate revalida o stare veche.
+    """
+    state = user.__dict__.get(STATE_ATTR)
+    if state is not None:
+        return state
+    keys = [perm_version_key(user.pk), GLOBAL_VERSION_KEY, perm_state_key(user.pk)]
+    values = cache.get_many(keys)
+    current = current_versions(keys[:2], values)
+    versions = (current[keys[0]], current[keys[1]])
+    cached = values.get(keys[2])
+    if cached is not None and cached[0] == versions:
+        state = cached[1]
+    else:
+        state = _load_state(user)
+        cache.set(
+            keys[2],
+            (versions, state),
+            timeout=getattr(settings, "PERMISSION_CACHE_SECONDS", 60 * 60 * 24),
+        )
+    user.__dict__[STATE_ATTR] = state
+    return state
+
+
+def user_can(user, perm: str) -> bool:
+    """
+    Echivalentul rapid al lui user.has_perm(perm) pentru ModelBackend.
+    """
+    if not user.is_authenticated or not user.is_active:
+        return False
+    if user.is_superuser:
+        return True
+    return perm in permission_state(user)["perms"]
+
+
+def user_in_group(user, name: str) -> bool:
+    if not user.is_authenticated:
+        return False
+    return name in permission_state(user)["groups"]
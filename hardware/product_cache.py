@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+from .models import Product
+
+
+PRODUCT_VERSION_TIMEOUT = None
+
+
+def product_version_key(product_id: int) -> str:
+    return f"product_version:{product_id}"
+
+
+def bump_product_version(product_id: int) -> None:
+    """
+    Marchează produsul ca modificat; orice cache care depinde de pret/stoc devine invalid.
+    """
+    cache.set(
+        product_version_key(product_id),
+        time.time_ns(),
+        timeout=PRODUCT_VERSION_TIMEOUT,
+    )
+
+
+CATALOG_VERSION_KEY = "catalog_version"
+
+
+def bump_catalog_version() -> None:
+    """
+    Orice modificare în catalog (produse, accesorii, categorii, branduri, materiale,
+    tutoriale); folosită pentru ETag-urile paginilor publice.
+    """
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), timeout=PRODUCT_VERSION_TIMEOUT)
+
+
+def versions_from_cache(values: Dict[str, object], product_ids: Iterable[int]) -> Dict[int, object]:
+    return {pid: values.get(product_version_key(pid)) for pid in product_ids}
+
+
+def get_product_versions(product_ids: Iterable[int]) -> Dict[int, object]:
+    product_ids = list(product_ids)
+    if not product_ids:
+        return {}
+    values = cache.get_many([product_version_key(pid) for pid in product_ids])
+    return versions_from_cache(values, product_ids)
+
+
+def local_cache():
+    """
+    L1 în memoria procesului pentru rezumate și inelul de produse văzute, sau None
+    dacă e oprit (RECENT_VIEWS_LOCAL_TIMEOUT = 0).
+    """
+    if local_timeout() <= 0:
+        return None
+    return caches[getattr(settings, "RECENT_VIEWS_LOCAL_CACHE_ALIAS", "local")]
+
+
+def local_timeout() -> int:
+    return getattr(settings, "RECENT_VIEWS_LOCAL_TIMEOUT", 0)
+
+
+PRODUCT_SUMMARY_FIELDS = ("id", "name", "slug", "price", "image_path")
+PRODUCT_SUMMARY_TIMEOUT = 60 * 60 * 24
+
+
+def product_summary_key(product_id: int) -> str:
+    return f"product_summary:{product_id}"
+
+
+def invalidate_product_summary(product_id: int) -> None:
+    cache.delete(product_summary_key(product_id))
+    local = local_cache()
+    if local is not None:
+        local.delete(product_summary_key(product_id))
+
+
+def get_product_summaries(product_ids: Iterable[int]) -> List[Dict[str, object]]:
+    """
+    Întoarce rezumatele (nume, slug, preț, imagine) în ordinea primită: întâi din L1
+    (memoria procesului), apoi cu un singur get_many din cache-ul comun; doar
+    produsele lipsă din ambele sunt citite din DB.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return []
+    keys = {pid: product_summary_key(pid) for pid in product_ids}
+    local = local_cache()
+    summaries: Dict[int, object] = {}
+    if local is not None:
+        cached = local.get_many(list(keys.values()))
+        summaries = {pid: cached[key] for pid, key in keys.items() if key in cached}
+
+    missing = [pid for pid in product_ids if pid not in summaries]
+    if missing:
+        cached = cache.get_many([keys[pid] for pid in missing])
+        shared = {pid: cached[keys[pid]] for pid in missing if keys[pid] in cached}
+        missing = [pid for pid in missing if pid not in shared]
+        fresh: Dict[int, object] = {}
+        if missing:
+            rows = Product.objects.filter(id__in=missing).values(*PRODUCT_SUMMARY_FIELDS)
+            fresh = {row["id"]: row for row in rows}
+            cache.set_many(
+                {keys[pid]: row for pid, row in fresh.items()},
+                timeout=PRODUCT_SUMMARY_TIMEOUT,
+            )
+        loaded = {**shared, **fresh}
+        if local is not None and loaded:
+            local.set_many({keys[pid]: row for pid, row in loaded.items()}, timeout=local_timeout())
+        summaries.update(loaded)
+    return [summaries[pid] for pid in product_ids if pid in summaries]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import date, datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Product
+
+
+def product_of_day_key(day: date) -> str:
+    return f"product_of_day:{day.isoformat()}"
+
+
+def _seconds_until_midnight() -> int:
+    now = timezone.localtime()
+    midnight = timezone.make_aware(
+        datetime.combine(now.date() + timedelta(days=1), time.min)
+    )
+    return max(int((midnight - now).total_seconds()), 60)
+
+
+def pick_product_of_day(day: date) -> Product | None:
+    """
+    Alege determinist un produs pentru ziua dată: hash-ul datei dă un id țintă din
+    intervalul [min(id), max(id)], apoi se ia primul produs disponibil de la acel id
+    (cu revenire la începutul intervalului). Ambele căutări folosesc indexul pe cheia primară.
+    """
+    bounds = Product.objects.aggregate(low=Min("id"), high=Max("id"))
+    if bounds["low"] is None:
+        return None
+    digest = hashlib.sha256(day.isoformat().encode("utf-8")).hexdigest()
+    span = bounds["high"] - bounds["low"] + 1
+    target = bounds["low"] + int(digest, 16) % span
+
+    available = Product.objects.filter(available=True).order_by("id")
+    return available.filter(id__gte=target).first() or available.filter(id__lt=target).first()
+
+
+def get_product_of_day_banner(day: date | None = None) -> str:
+    day = day or timezone.localdate()
+    key = product_of_day_key(day)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["html"]
+
+    product = pick_product_of_day(day)
+    if product is None:
+        html = ""
+        product_id = None
+    else:
+        html = render_to_string("hardware/product_of_day.html", {"product": product})
+        product_id = product.id
+    cache.set(
+        key,
+        {"product_id": product_id, "html": html},
+        timeout=_seconds_until_midnight(),
+    )
+    return html
+
+
+def invalidate_product_of_day(product_id: int) -> None:
+    key = product_of_day_key(timezone.localdate())
+    cached = cache.get(key)
+    if cached is not None and cached.get("product_id") in (product_id, None):
+        cache.delete(key)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+from .utils import get_ip
+
+
+logger = logging.getLogger("django")
+
+GLOBAL = "global"
+IP = "ip"
+USERNAME = "username"
+
+
+@dataclass(frozen=True)
+class SlidingWindow:
+    """
+    Fereastră glisantă aproximată din două ferestre fixe: estimarea este
+    curent + anterior * (partea din fereastra anterioară încă acoperită).
+
+    Contorul curent se crește cu `add` + `incr`, deci fiecare cerere primește o
+    valoare distinctă și pragul nu poate fi „sărit” de cereri concurente. Garanția
+    ține doar pentru un cache cu incr atomic (LocMem, Redis, Memcached); în
+    DatabaseCache incr e get + set, deci sub concurență se pot pierde cereri.
+    """
+
+    name: str
+    limit: int
+    seconds: int
+    cache_alias: str | None = None
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias or getattr(settings, "RATELIMIT_CACHE_ALIAS", "ratelimit")]
+
+    def _keys(self, ident: str, now: float) -> Tuple[str, str, float]:
+        window = int(now // self.seconds)
+        elapsed = (now % self.seconds) / self.seconds
+        prefix = f"rl:{self.name}:{ident}"
+        return f"{prefix}:{window - 1}", f"{prefix}:{window}", 1.0 - elapsed
+
+    def hit(self, ident: str, now: float | None = None) -> Tuple[float, float]:
+        """
+        Înregistrează o cerere; întoarce (estimarea dinainte, estimarea de după).
+        """
+        previous_key, current_key, weight = self._keys(ident, now or time.time())
+        self.cache.add(current_key, 0, timeout=self.seconds * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # cheia a expirat între add și incr
+            self.cache.add(current_key, 1, timeout=self.seconds * 2)
+            current = 1
+        previous = (self.cache.get(previous_key) or 0) * weight
+        return previous + current - 1, previous + current
+
+    def peek(self, ident: str, now: float | None = None) -> float:
+        previous_key, current_key, weight = self._keys(ident, now or time.time())
+        values = self.cache.get_many([previous_key, current_key])
+        return values.get(previous_key, 0) * weight + values.get(current_key, 0)
+
+    def retry_after(self, now: float | None = None) -> int:
+        now = now or time.time()
+        return max(int(math.ceil(self.seconds - now % self.seconds)), 1)
+
+
+def windows_for(group: str) -> List[Tuple[str, SlidingWindow]]:
+    """
+    Ferestrele grupului. Cu un cache per proces fiecare worker numără separat, deci
+    limitele din RATELIMITS (totalul dorit) se împart la RATELIMIT_PROCESSES.
+    """
+    rules: Dict[str, Tuple[int, int]] = getattr(settings, "RATELIMITS", {}).get(group, {})
+    processes = max(getattr(settings, "RATELIMIT_PROCESSES", 1), 1)
+    return [
+        (scope, SlidingWindow(f"{group}:{scope}", max(math.ceil(limit / processes), 1), seconds))
+        for scope, (limit, seconds) in rules.items()
+    ]
+
+
+def request_identity(request, scope: str) -> str | None:
+    if scope == GLOBAL:
+        return "*"
+    if scope == IP:
+        return get_ip(request) or "necunoscut"
+    if scope == USERNAME:
+        username = request.POST.get("username", "").strip().lower()
+        return username or None
+    raise ValueError(f"Scop necunoscut pentru rate limiting: {scope}")
+
+
+def check(request, group: str, scopes: Iterable[str] | None = None) -> int:
+    """
+    Numără cererea în toate ferestrele grupului; întoarce 0 dacă e permisă sau
+    numărul de secunde după care clientul poate reîncerca.
+    """
+    retry_after = 0
+    now = time.time()
+    for scope, window in windows_for(group):
+        if scopes is not None and scope not in scopes:
+            continue
+        ident = request_identity(request, scope)
+        if ident is None:
+            continue
+        _, estimate = window.hit(ident, now)
+        if estimate > window.limit:
+            retry_after = max(retry_after, window.retry_after(now))
+            logger.warning(
+                "Limita %s depasita pentru %s (%.1f > %s)", window.name, ident, estimate, window.limit
+            )
+    return retry_after
+
+
+def too_many_requests(request, retry_after: int):
+    response = render(request, "429.html", {"retry_after": retry_after}, status=429)
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def ratelimit(group: str, *, methods: Iterable[str] = ("POST",)) -> Callable:
+    """
+    Decorator pentru view-uri (pentru clase: method_decorator(..., name="dispatch")).
+    Cererile cu metodele date sunt numărate; peste limită se răspunde cu 429.
+    """
+    methods = {method.upper() for method in methods}
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method in methods:
+                retry_after = check(request, group)
+                if retry_after:
+                    return too_many_requests(request, retry_after)
+            return view(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
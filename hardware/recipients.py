@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import logging
+from itertools import groupby
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Count
+
+from .mailing import batched
+from .models import ProductView
+from .outbox import enqueue
+
+
+logger = logging.getLogger("django")
+
+CHUNK_SIZE = 2000
+
+
+def resolve_recipients(
+    category_ids: Iterable[int], min_views: int
+) -> Iterator[Tuple[int, str, int]]:
+    """
+    Întoarce (user_id, email, categorie) pentru fiecare user eligibil, o singură dată.
+
+    Eligibilitatea (user, categorie) se calculează într-o singură interogare agregată;
+    un user interesat de mai multe categorii o primește pe cea cu cele mai multe
+    vizualizări (la egalitate, categoria cu id-ul mai mic).
+    """
+    category_ids = list(category_ids)
+    if not category_ids:
+        return
+    rows = (
+        ProductView.objects.filter(
+            product__category_id__in=category_ids,
+            user__email_confirmat=True,
+        )
+        .exclude(user__email="")
+        .values("user_id", "user__email", "product__category_id")
+        .annotate(views=Count("id"))
+        .filter(views__gte=min_views)
+        .order_by("user_id", "-views", "product__category_id")
+        .values_list("user_id", "user__email", "product__category_id")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for _, group in groupby(rows, key=lambda row: row[0]):
+        yield next(group)
+
+
+def enqueue_promotion(
+    category_ids: Iterable[int],
+    min_views: int,
+    build_message: Callable[[int, str], EmailMessage],
+    *,
+    chunk_size: int | None = None,
+) -> Dict[int, int]:
+    """
+    Pune în outbox câte un mesaj per destinatar, pe bucăți de `chunk_size`.
+
+    `build_message(categorie, email)` construiește mesajul; întoarce numărul de
+    destinatari pe categorie.
+    """
+    chunk_size = chunk_size or getattr(settings, "PROMOTION_ENQUEUE_CHUNK_SIZE", 1000)
+    per_category: Dict[int, int] = {}
+
+    def messages() -> Iterator[EmailMessage]:
+        for _, email, category_id in resolve_recipients(category_ids, min_views):
+            per_category[category_id] = per_category.get(category_id, 0) + 1
+            yield build_message(category_id, email)
+
+    with transaction.atomic():
+        for chunk in batched(messages(), chunk_size):
+            enqueue(chunk)
+    logger.debug("Destinatari promotie pe categorii: %s", per_category)
+    return per_category
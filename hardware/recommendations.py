@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import time
+from collections import Counter
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ProductRecommendation, ProductView, Purchase
+
+
+RECOMMENDATIONS_VERSION_KEY = "recommendations_version"
+
+
+logger = logging.getLogger("django")
+
+DEFAULT_TOP_K = 6
+MAX_BASKET_SIZE = 50
+CHUNK_SIZE = 2000
+
+
+def _purchase_baskets() -> Iterator[List[int]]:
+    """
+    Un coș = produsele cumpărate de același user în aceeași zi, cele mai recente primele.
+    """
+    rows = (
+        Purchase.objects.order_by("user_id", "-purchased_at", "-id")
+        .values_list("user_id", "purchased_at", "product_id")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    keyed = ((user_id, timezone.localdate(moment), product_id) for user_id, moment, product_id in rows)
+    for _, group in groupby(keyed, key=lambda row: (row[0], row[1])):
+        yield list(dict.fromkeys(product_id for _, _, product_id in group))
+
+
+def _view_baskets() -> Iterator[List[int]]:
+    rows = (
+        ProductView.objects.order_by("user_id", "-viewed_at", "-id")
+        .values_list("user_id", "product_id")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for _, group in groupby(rows, key=lambda row: row[0]):
+        yield list(dict.fromkeys(product_id for _, product_id in group))
+
+
+def co_occurrence(baskets: Iterable[Sequence[int]]) -> Tuple[Counter, Counter]:
+    """
+    Numără perechile (a, b) din fiecare coș într-o matrice rară. Coșurile vin cu
+    cele mai recente produse primele; din coșurile mari se păstrează ultimele
+    MAX_BASKET_SIZE, ca produsele noi să nu fie excluse sistematic.
+
+    Întoarce (frecvența fiecărui produs, numărul de apariții comune pe perechi).
+    Perechile sunt păstrate o singură dată (a < b).
+    """
+    item_counts: Counter = Counter()
+    pair_counts: Counter = Counter()
+    for basket in baskets:
+        items = sorted(set(list(basket)[:MAX_BASKET_SIZE]))
+        item_counts.update(items)
+        for index, first in enumerate(items):
+            for second in items[index + 1 :]:
+                pair_counts[(first, second)] += 1
+    return item_counts, pair_counts
+
+
+def top_neighbours(
+    item_counts: Counter, pair_counts: Counter, top_k: int = DEFAULT_TOP_K
+) -> Dict[int, List[Tuple[float, int]]]:
+    """
+    Păstrează primii top_k vecini per produs, după similaritatea cosinus
+    count(a, b) / sqrt(count(a) * count(b)).
+    """
+    neighbours: Dict[int, List[Tuple[float, int]]] = {}
+    for (first, second), together in pair_counts.items():
+        score = together / math.sqrt(item_counts[first] * item_counts[second])
+        for product_id, other_id in ((first, second), (second, first)):
+            heap = neighbours.setdefault(product_id, [])
+            entry = (score, -other_id)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+    return {
+        product_id: [(score, -neg_id) for score, neg_id in sorted(heap, reverse=True)]
+        for product_id, heap in neighbours.items()
+    }
+
+
+def _store(kind: str, neighbours: Dict[int, List[Tuple[float, int]]]) -> int:
+    rows = [
+        ProductRecommendation(
+            product_id=product_id,
+            recommended_id=other_id,
+            kind=kind,
+            rank=rank,
+            score=score,
+        )
+        for product_id, items in neighbours.items()
+        for rank, (score, other_id) in enumerate(items, start=1)
+    ]
+    with transaction.atomic():
+        ProductRecommendation.objects.filter(kind=kind).delete()
+        ProductRecommendation.objects.bulk_create(rows, batch_size=CHUNK_SIZE)
+    return len(rows)
+
+
+def build_recommendations(top_k: int = DEFAULT_TOP_K) -> Dict[str, int]:
+    stored = {}
+    sources = (
+        (ProductRecommendation.Kind.BOUGHT_TOGETHER, _purchase_baskets),
+        (ProductRecommendation.Kind.ALSO_VIEWED, _view_baskets),
+    )
+    for kind, baskets in sources:
+        item_counts, pair_counts = co_occurrence(baskets())
+        stored[kind] = _store(kind, top_neighbours(item_counts, pair_counts, top_k))
+        logger.info(
+            "Recomandari %s: %s produse, %s perechi, %s randuri salvate",
+            kind,
+            len(item_counts),
+            len(pair_counts),
+            stored[kind],
+        )
+    cache.set(RECOMMENDATIONS_VERSION_KEY, time.time_ns(), timeout=None)
+    return stored
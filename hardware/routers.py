@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+ANALYTICS_DB = "analytics"
+CACHE_DB = "cache"
+REPLICA_DB = "replica"
+
+# modele fără chei străine, scrise la fiecare request; ProductView rămâne în
+# baza principală pentru join-urile cu User/Product și ștergerile în cascadă
+ANALYTICS_MODELS = {"hardware.requestlog", "hardware.pendingproductview"}
+CACHE_APP_LABEL = "django_cache"
+
+
+def _target(app_label: str, model_name: str | None) -> str | None:
+    if app_label == CACHE_APP_LABEL:
+        alias = CACHE_DB
+    elif f"{app_label}.{model_name}" in ANALYTICS_MODELS:
+        alias = ANALYTICS_DB
+    else:
+        return None
+    return alias if alias in settings.DATABASES else None
+
+
+class DatabaseRouter:
+    """
+    Trimite jurnalul de accesări și tabela de cache în fișiere SQLite separate,
+    astfel încât scrierile lor nu mai țin lock-ul bazei principale.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _target(model._meta.app_label, model._meta.model_name)
+
+    def db_for_write(self, model, **hints):
+        return _target(model._meta.app_label, model._meta.model_name)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_DB:
+            return False
+        target = _target(app_label, model_name)
+        if target is not None:
+            return db == target
+        if db in (ANALYTICS_DB, CACHE_DB):
+            return False
+        return None
+
+
+def replica_path() -> str | None:
+    config = settings.DATABASES.get(REPLICA_DB)
+    return str(config["NAME"]) if config else None
+
+
+def catalog_db() -> str:
+    """
+    Aliasul pentru interogările de catalog (doar citire): snapshot-ul read-only dacă
+    CATALOG_READ_REPLICA e activ și snapshot-ul e suficient de recent, altfel baza principală.
+    """
+    path = replica_path()
+    if not getattr(settings, "CATALOG_READ_REPLICA", False) or not path:
+        return DEFAULT_DB_ALIAS
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return DEFAULT_DB_ALIAS
+    if age > getattr(settings, "CATALOG_SNAPSHOT_MAX_AGE_SECONDS", 60 * 30):
+        return DEFAULT_DB_ALIAS
+    return REPLICA_DB
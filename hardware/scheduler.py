@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ScheduledTaskState
+
+
+logger = logging.getLogger("django")
+
+DAY_MAP = {
+    "luni": 0,
+    "marti": 1,
+    "miercuri": 2,
+    "joi": 3,
+    "vineri": 4,
+    "sambata": 5,
+    "duminica": 6,
+}
+
+
+class ScheduledTask:
+    """
+    Un task rulat periodic: fie la fiecare `every_minutes` minute, fie săptămânal
+    în ziua `weekday` (ex. "marti"), în fereastra orei `hour`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[datetime], object],
+        *,
+        every_minutes: float | None = None,
+        weekday: str | None = None,
+        hour: int | None = None,
+        timeout: float = 600,
+        retry_seconds: float = 300,
+    ) -> None:
+        if every_minutes is None and weekday is None:
+            raise ValueError(f"Taskul {name} are nevoie de every_minutes sau weekday.")
+        self.name = name
+        self.func = func
+        self.every_minutes = every_minutes
+        self.weekday = DAY_MAP.get(str(weekday).lower()) if weekday is not None else None
+        self.hour = int(hour or 0)
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+
+    @property
+    def enabled(self) -> bool:
+        if self.every_minutes is not None:
+            return self.every_minutes > 0
+        return self.weekday is not None
+
+    def next_run(self, last_run: datetime | None, now: datetime) -> datetime:
+        if self.every_minutes is not None:
+            if last_run is None:
+                return now
+            return max(last_run + timedelta(minutes=self.every_minutes), now)
+
+        now = timezone.localtime(now)
+        slot = now.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+        slot += timedelta(days=(self.weekday - now.weekday()) % 7)
+        if slot + timedelta(hours=1) <= now:
+            slot += timedelta(days=7)
+        if last_run is not None and last_run >= slot:
+            slot += timedelta(days=7)
+        return max(slot, now)
+
+
+def default_instance_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _load_last_runs(
+    names: Iterable[str],
+) -> Dict[str, Tuple[datetime | None, datetime | None] | None]:
+    names = list(names)
+    existing = {
+        name: (last_run, retry_at)
+        for name, last_run, retry_at in ScheduledTaskState.objects.filter(
+            name__in=names
+        ).values_list("name", "last_run_at", "retry_at")
+    }
+    missing = [name for name in names if name not in existing]
+    if missing:
+        ScheduledTaskState.objects.bulk_create(
+            [ScheduledTaskState(name=name) for name in missing],
+            ignore_conflicts=True,
+        )
+    return {name: existing.get(name) for name in names}
+
+
+def acquire_lock(
+    task: ScheduledTask, instance_id: str, now: datetime
+) -> Tuple[bool, datetime | None, datetime | None, datetime | None]:
+    """
+    Ia lease-ul taskului printr-un UPDATE condiționat (atomic între procese).
+
+    Întoarce (obținut, last_run_at, locked_until, retry_at); valorile sunt citite după
+    UPDATE, deci o rulare făcută între timp de altă instanță este vizibilă.
+    """
+    lease_until = now + timedelta(seconds=task.timeout)
+    updated = (
+        ScheduledTaskState.objects.filter(name=task.name)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(locked_by=instance_id, locked_until=lease_until)
+    )
+    last_run, locked_until, retry_at = (
+        ScheduledTaskState.objects.filter(name=task.name)
+        .values_list("last_run_at", "locked_until", "retry_at")
+        .get()
+    )
+    return bool(updated), last_run, locked_until, retry_at
+
+
+def renew_lock(task: ScheduledTask, instance_id: str) -> bool:
+    """
+    Prelungește lease-ul cât timp taskul rulează; False dacă lease-ul a fost pierdut.
+    """
+    lease_until = timezone.now() + timedelta(seconds=task.timeout)
+    return bool(
+        ScheduledTaskState.objects.filter(name=task.name, locked_by=instance_id).update(
+            locked_until=lease_until
+        )
+    )
+
+
+def release_lock(
+    task: ScheduledTask,
+    instance_id: str,
+    *,
+    last_run_at: datetime | None = None,
+    duration: float | None = None,
+    error: str = "",
+    retry_at: datetime | None = None,
+) -> bool:
+    """
+    Eliberează lease-ul. O rulare reușită (last_run_at) șterge reîncercarea; una
+    eșuată (retry_at) nu avansează last_run_at, ca taskul să fie reluat.
+    """
+    fields: Dict[str, object] = {"locked_by": "", "locked_until": None}
+    result: Dict[str, object] = {}
+    if last_run_at is not None:
+        result = {
+            "last_run_at": last_run_at,
+            "last_duration": duration,
+            "last_error": error,
+            "retry_at": None,
+        }
+    elif retry_at is not None:
+        result = {"last_duration": duration, "last_error": error, "retry_at": retry_at}
+    released = ScheduledTaskState.objects.filter(name=task.name, locked_by=instance_id).update(
+        **fields, **result
+    )
+    if not released and last_run_at is not None:
+        # lease-ul a fost preluat de altă instanță: rularea se înregistrează fără a atinge lock-ul
+        logger.error("Taskul %s si-a pierdut lease-ul in timpul rularii.", task.name)
+        ScheduledTaskState.objects.filter(name=task.name).filter(
+            Q(last_run_at__isnull=True) | Q(last_run_at__lt=last_run_at)
+        ).update(**result)
+    elif not released and result:
+        logger.error("Taskul %s si-a pierdut lease-ul in timpul rularii.", task.name)
+    return bool(released)
+
+
+class LeaseHeartbeat:
+    """
+    Thread care reînnoiește lease-ul la fiecare treime din timeout, ca o rulare
+    lungă să nu poată fi preluată de altă instanță.
+
+    Reînnoirea se oprește la `task.timeout`: thread-ul taskului nu poate fi oprit, dar
+    lease-ul e eliberat și rularea e înregistrată ca eșuată, cu o reîncercare.
+    """
+
+    def __init__(self, task: ScheduledTask, instance_id: str) -> None:
+        self.task = task
+        self.instance_id = instance_id
+        self.lost = False
+        self.expired = False
+        self.retry_at: datetime | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"lease-{task.name}", daemon=True
+        )
+
+    def _run(self) -> None:
+        interval = max(self.task.timeout / 3, 1)
+        deadline = time.monotonic() + self.task.timeout
+        try:
+            while not self._stop.wait(max(min(interval, deadline - time.monotonic()), 0)):
+                if time.monotonic() >= deadline:
+                    self._expire()
+                    return
+                if not renew_lock(self.task, self.instance_id):
+                    self.lost = True
+                    logger.error("Lease-ul taskului %s nu a putut fi reinnoit.", self.task.name)
+                    return
+        finally:
+            close_old_connections()
+
+    def _expire(self) -> None:
+        self.retry_at = timezone.now() + timedelta(seconds=self.task.retry_seconds)
+        self.expired = True
+        logger.error(
+            "Taskul %s depaseste timeout-ul de %ss; lease-ul este eliberat.",
+            self.task.name,
+            self.task.timeout,
+        )
+        release_lock(
+            self.task,
+            self.instance_id,
+            duration=self.task.timeout,
+            error=f"timeout dupa {self.task.timeout}s",
+            retry_at=self.retry_at,
+        )
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class Scheduler:
+    """
+    Ține taskurile într-un heap ordonat după următoarea execuție și doarme exact
+    până la primul termen. Taskurile rulează într-un pool de thread-uri; starea
+    (ultima rulare) și lock-urile sunt persistate în ScheduledTaskState.
+    """
+
+    def __init__(
+        self,
+        tasks: Iterable[ScheduledTask],
+        *,
+        workers: int = 4,
+        max_sleep: float = 300,
+        instance_id: str | None = None,
+    ) -> None:
+        self.tasks = {task.name: task for task in tasks if task.enabled}
+        self.max_sleep = max_sleep
+        self.instance_id = instance_id or default_instance_id()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduler")
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._seq = itertools.count()
+        self._running: Dict[str, Tuple[Future, float]] = {}
+        self._abandoned: set = set()
+        self._condition = threading.Condition()
+        self._stopped = False
+
+    def _push(self, name: str, when: datetime) -> None:
+        heapq.heappush(self._heap, (when, next(self._seq), name))
+
+    def _load(self) -> None:
+        now = timezone.now()
+        for name, state in _load_last_runs(self.tasks).items():
+            last_run, retry_at = state or (None, None)
+            when = self.tasks[name].next_run(last_run, now)
+            if retry_at is not None:
+                when = max(retry_at, now)
+            self._push(name, when)
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def run_forever(self) -> None:
+        self._load()
+        try:
+            while True:
+                with self._condition:
+                    if self._stopped:
+                        break
+                    self._check_timeouts()
+                    due = self._pop_due(timezone.now())
+                    if not due:
+                        self._condition.wait(self._sleep_seconds())
+                        continue
+                for name in due:
+                    self._submit(name)
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def run_pending(self) -> List[str]:
+        """
+        Rulează o singură dată taskurile scadente și așteaptă terminarea lor.
+        """
+        self._load()
+        with self._condition:
+            due = self._pop_due(timezone.now())
+        futures = [self._submit(name) for name in due]
+        for future in futures:
+            future.result()
+        self._pool.shutdown(wait=True)
+        return due
+
+    def _pop_due(self, now: datetime) -> List[str]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name = heapq.heappop(self._heap)
+            due.append(name)
+        return due
+
+    def _sleep_seconds(self) -> float:
+        wait = self.max_sleep
+        if self._heap:
+            wait = min(wait, (self._heap[0][0] - timezone.now()).total_seconds())
+        if self._running:
+            deadlines = [
+                started + self.tasks[name].timeout - time.monotonic()
+                for name, (_, started) in self._running.items()
+            ]
+            if deadlines:
+                wait = min(wait, min(deadlines))
+        return max(wait, 0.05)
+
+    def _check_timeouts(self) -> None:
+        """
+        Abandonează rulările care depășesc timeout-ul: lease-ul e eliberat de heartbeat,
+        iar taskul e reprogramat după retry_seconds. Thread-ul blocat ocupă în
+        continuare un worker, dar rezultatul lui nu mai este înregistrat.
+        """
+        for name, (future, started) in list(self._running.items()):
+            task = self.tasks[name]
+            if future.done() or time.monotonic() - started <= task.timeout:
+                continue
+            del self._running[name]
+            self._abandoned.add(future)
+            logger.error(
+                "Taskul %s depaseste timeout-ul de %ss; se reia peste %ss.",
+                name,
+                task.timeout,
+                task.retry_seconds,
+            )
+            self._push(name, timezone.now() + timedelta(seconds=task.retry_seconds))
+
+    def _submit(self, name: str) -> Future:
+        with self._condition:
+            future = self._pool.submit(self._execute, self.tasks[name])
+            self._running[name] = (future, time.monotonic())
+        future.add_done_callback(lambda done, name=name: self._finished(name, done))
+        return future
+
+    def _finished(self, name: str, future: Future) -> None:
+        try:
+            when = future.result()
+        except Exception:
+            logger.exception("Eroare la programarea taskului %s", name)
+            when = timezone.now() + timedelta(seconds=self.max_sleep)
+        with self._condition:
+            if future in self._abandoned:
+                # reîncercarea e deja programată de _check_timeouts
+                self._abandoned.discard(future)
+                return
+            self._running.pop(name, None)
+            self._push(name, when)
+            self._condition.notify_all()
+
+    def _execute(self, task: ScheduledTask) -> datetime:
+        """
+        Rulează taskul sub lock și întoarce momentul următoarei execuții.
+        """
+        now = timezone.now()
+        try:
+            acquired, last_run, locked_until, retry_at = acquire_lock(task, self.instance_id, now)
+            if not acquired:
+                logger.info("Taskul %s ruleaza deja in alta instanta.", task.name)
+                return max(locked_until or now, now + timedelta(seconds=1))
+            next_run = task.next_run(last_run, now)
+            if retry_at is not None:
+                # după un eșec taskul e restant; reîncercarea înlocuiește programarea
+                next_run = retry_at
+            if next_run > now:
+                release_lock(task, self.instance_id)
+                return next_run
+
+            started = time.monotonic()
+            error = ""
+            heartbeat = LeaseHeartbeat(task, self.instance_id)
+            try:
+                with heartbeat:
+                    task.func(timezone.localtime(now))
+            except Exception as exc:
+                error = repr(exc)
+                logger.exception("Taskul programat %s a esuat", task.name)
+            duration = time.monotonic() - started
+            if heartbeat.expired:
+                # eșecul și reîncercarea sunt deja salvate, iar lease-ul poate fi al altei rulări
+                logger.error("Taskul %s s-a terminat dupa timeout (%.2fs).", task.name, duration)
+                return heartbeat.retry_at
+            if error:
+                # rularea eșuată nu avansează last_run_at: taskul e reluat după retry_seconds
+                retry_at = timezone.now() + timedelta(seconds=task.retry_seconds)
+                release_lock(
+                    task, self.instance_id, duration=duration, error=error, retry_at=retry_at
+                )
+                return retry_at
+            release_lock(
+                task,
+                self.instance_id,
+                last_run_at=now,
+                duration=duration,
+            )
+            logger.info("Taskul %s a rulat in %.2fs", task.name, duration)
+            return task.next_run(now, timezone.now())
+        finally:
+            close_old_connections()
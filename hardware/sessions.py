@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.db import DatabaseError, connections, router, transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger("django")
+
+PendingRow = Tuple[str, datetime]
+
+
+class SessionWriter:
+    """
+    Scrie sesiunile în baza de date din fundal (write-behind).
+
+    Salvările aceleiași sesiuni se suprascriu în coadă, deci mai multe salvări
+    într-un interval devin un singur UPSERT. Dacă apelantul e deja într-un bloc
+    atomic, scrierea se face pe loc, în aceeași tranzacție.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, PendingRow] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _using() -> str:
+        return router.db_for_write(Session)
+
+    def submit(self, session_key: str, session_data: str, expire_date: datetime) -> None:
+        row = {session_key: (session_data, expire_date)}
+        if not getattr(settings, "SESSION_WRITE_BEHIND", True) or (
+            connections[self._using()].in_atomic_block
+        ):
+            with self._lock:
+                self._pending.pop(session_key, None)
+            self._write(row)
+            return
+        with self._lock:
+            self._pending.update(row)
+            size = len(self._pending)
+        self._ensure_thread()
+        if size >= getattr(settings, "SESSION_WRITE_BEHIND_MAX_PENDING", 500):
+            self._wake.set()
+
+    def pending(self, session_key: str) -> PendingRow | None:
+        with self._lock:
+            return self._pending.get(session_key)
+
+    def discard(self, session_key: str) -> None:
+        """
+        Scoate sesiunea din coadă; așteaptă o eventuală scriere în curs, ca o sesiune
+        ștearsă (logout) să nu fie recreată de un lot mai vechi.
+        """
+        with self._flush_lock, self._lock:
+            self._pending.pop(session_key, None)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                self._write(batch)
+            except DatabaseError:
+                logger.exception("Scrierea a %s sesiuni a esuat; se reincearca.", len(batch))
+                with self._lock:
+                    for key, row in batch.items():
+                        self._pending.setdefault(key, row)
+                return 0
+        return len(batch)
+
+    def _write(self, batch: Dict[str, PendingRow]) -> None:
+        using = self._using()
+        rows = [
+            Session(session_key=key, session_data=data, expire_date=expire_date)
+            for key, (data, expire_date) in batch.items()
+        ]
+        with transaction.atomic(using=using):
+            Session.objects.using(using).bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["session_key"],
+                update_fields=["session_data", "expire_date"],
+            )
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="session-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        interval = getattr(settings, "SESSION_WRITE_BEHIND_SECONDS", 2)
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            self.flush()
+
+
+writer = SessionWriter()
+atexit.register(writer.flush)
+
+
+class SessionStore(CachedDBStore):
+    """
+    Sesiuni în cache-ul comun (SESSION_CACHE_ALIAS), cu L1 opțional în memoria
+    procesului (SESSION_LOCAL_TIMEOUT, doar pentru un singur proces: ștergerile și
+    salvările din alte procese nu îl invalidează); tabela de sesiuni e actualizată
+    asincron de `writer`. O salvare cu același conținut ca la încărcare nu scrie nimic.
+    """
+
+    def __init__(self, session_key=None):
+        self._local = caches[getattr(settings, "SESSION_LOCAL_CACHE_ALIAS", "local")]
+        self._saved_digest: str | None = None
+        super().__init__(session_key)
+
+    def _digest(self, data) -> str:
+        return hashlib.sha1(self.serializer().dumps(data)).hexdigest()
+
+    @staticmethod
+    def _local_timeout(expiry_age: int | None = None) -> int:
+        timeout = getattr(settings, "SESSION_LOCAL_TIMEOUT", 0)
+        return timeout if expiry_age is None else min(timeout, expiry_age)
+
+    def load(self):
+        data = None
+        if self._local_timeout() > 0:
+            try:
+                data = self._local.get(self.cache_key)
+            except Exception:
+                data = None
+        if data is None:
+            data = super().load()
+            if data and self.session_key and self._local_timeout() > 0:
+                self._local.set(self.cache_key, data, self._local_timeout())
+        self._saved_digest = self._digest(data)
+        return data
+
+    def _get_session_from_db(self):
+        row = writer.pending(self.session_key) if self.session_key else None
+        if row is not None and row[1] > timezone.now():
+            return self.model(session_key=self.session_key, session_data=row[0], expire_date=row[1])
+        return super()._get_session_from_db()
+
+    def exists(self, session_key):
+        return bool(session_key) and writer.pending(session_key) is not None or super().exists(
+            session_key
+        )
+
+    def create(self):
+        while True:
+            self._session_key = self._get_new_session_key()
+            if self._cache.add(self.cache_key, {}, self.get_expiry_age()):
+                break
+        self.save(must_create=True)
+        self.modified = True
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        digest = self._digest(data)
+        if not must_create and digest == self._saved_digest:
+            return
+        expiry_age = self.get_expiry_age()
+        try:
+            self._cache.set(self.cache_key, data, expiry_age)
+        except Exception:
+            logger.exception("Sesiunea nu a putut fi salvata in cache (%s)", self._cache)
+        if self._local_timeout(expiry_age) > 0:
+            self._local.set(self.cache_key, data, self._local_timeout(expiry_age))
+        writer.submit(self.session_key, self.encode(data), self.get_expiry_date())
+        self._saved_digest = digest
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            session_key = self.session_key
+        if session_key is None:
+            return
+        writer.discard(session_key)
+        self._local.delete(self.cache_key_prefix + session_key)
+        super().delete(session_key)
@@ -3,11 +3,23 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta
 
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import FeedbackRequest, Nota, Purchase
+from .models import (
+    Accessory,
+    Brand,
+    Category,
+    FeedbackRequest,
+    Material,
+    Nota,
+    Product,
+    Purchase,
+    Tutorial,
+)
+from .product_cache import bump_catalog_version, bump_product_version, invalidate_product_summary
+from .product_of_day import invalidate_product_of_day
 
 
 logger = logging.getLogger("django")
@@ -48,3 +60,33 @@ def schedule_feedback_request(sender, instance: Purchase, created: bool, **kwarg
         product=instance.product,
         defaults={"next_send_at": next_send_at},
     )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_caches(sender, instance: Product, **kwargs) -> None:
+    bump_product_version(instance.pk)
+    invalidate_product_summary(instance.pk)
+    invalidate_product_of_day(instance.pk)
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Accessory)
+@receiver(post_delete, sender=Accessory)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+@receiver(post_save, sender=Tutorial)
+@receiver(post_delete, sender=Tutorial)
+def invalidate_catalog(sender, **kwargs) -> None:
+    bump_catalog_version()
+
+
+@receiver(m2m_changed, sender=Product.materials.through)
+@receiver(m2m_changed, sender=Tutorial.products.through)
+def invalidate_catalog_relations(sender, action: str, **kwargs) -> None:
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_catalog_version()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.db.models import QuerySet
+from django.template.loader import render_to_string
+
+from .mailing import batched
+from .sitemaps import SITEMAPS
+
+
+logger = logging.getLogger("django")
+
+INDEX_NAME = "sitemap.xml"
+STATE_NAME = "state.json"
+
+
+class _Site:
+    """
+    Echivalentul lui RequestSite pentru construirea din scheduler (fără request).
+    """
+
+    def __init__(self, domain: str) -> None:
+        self.domain = self.name = domain
+
+
+def sitemap_root() -> Path:
+    return Path(getattr(settings, "SITEMAP_ROOT", settings.BASE_DIR / "sitemaps"))
+
+
+def section_file(section: str, page: int) -> str:
+    return f"sitemap-{section}-{page}.xml"
+
+
+def _write(root: Path, name: str, content: bytes) -> None:
+    """
+    Scrie atomic fișierul (și varianta .gz, dacă SITEMAP_GZIP e activ).
+    """
+    variants = {name: content}
+    if getattr(settings, "SITEMAP_GZIP", True):
+        variants[f"{name}.gz"] = gzip.compress(content, mtime=0)
+    else:
+        (root / f"{name}.gz").unlink(missing_ok=True)
+    for filename, data in variants.items():
+        _replace(root, filename, data)
+
+
+def _replace(root: Path, filename: str, data: bytes) -> None:
+    """
+    Scrie într-un fișier temporar cu nume unic și îl mută peste `filename`; două
+    construiri simultane nu își pot muta una alteia fișierele scrise pe jumătate.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=root, prefix=f".{filename}.", suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(data)
+    try:
+        os.replace(tmp.name, root / filename)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+
+def _load_state(root: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        return json.loads((root / STATE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _page_signatures(sitemap: Sitemap) -> List[str] | None:
+    """
+    Amprenta fiecărei pagini din (pk, dată modificare); doar pentru secțiunile
+    cu queryset și câmp de dată, celelalte sunt randate la fiecare rulare.
+    """
+    items = sitemap.items()
+    date_field = getattr(sitemap, "date_field", None)
+    if not isinstance(items, QuerySet) or not date_field:
+        return None
+    rows = items.values_list("pk", date_field).iterator(chunk_size=5000)
+    return [
+        hashlib.sha1(repr(chunk).encode("utf-8")).hexdigest()
+        for chunk in batched(rows, sitemap.limit)
+    ]
+
+
+def build_sitemaps(*, full: bool = False) -> Dict[str, int]:
+    """
+    Generează pe disc indexul și fișierele pe secțiuni (cel mult SITEMAP_MAX_URLS
+    adrese per fișier). O pagină e randată din nou doar dacă s-au schimbat
+    elementele ei sau datele lor de modificare; fișierele nemodificate își păstrează
+    data (ETag/Last-Modified rămân valabile).
+    """
+    root = sitemap_root()
+    root.mkdir(parents=True, exist_ok=True)
+    state = {} if full else _load_state(root)
+    parsed = urlsplit(settings.SITE_URL)
+    site, protocol = _Site(parsed.netloc), parsed.scheme or "https"
+    files: Dict[str, Dict[str, Any]] = {}
+    stats = {"rendered": 0, "unchanged": 0, "removed": 0}
+    started = time.monotonic()
+
+    for section, sitemap in SITEMAPS.items():
+        if callable(sitemap):
+            sitemap = sitemap()
+        sitemap.limit = getattr(settings, "SITEMAP_MAX_URLS", Sitemap.limit)
+        signatures = _page_signatures(sitemap)
+        pages = len(signatures or []) or sitemap.paginator.num_pages
+        for page in range(1, pages + 1):
+            name = section_file(section, page)
+            previous = state.get(name)
+            signature = signatures[page - 1] if signatures else None
+            exists = (root / name).exists()
+            if signature and previous and previous["signature"] == signature and exists:
+                files[name] = previous
+                stats["unchanged"] += 1
+                continue
+
+            sitemap.latest_lastmod = None
+            urls = sitemap.get_urls(page=page, site=site, protocol=protocol)
+            content = render_to_string("sitemap.xml", {"urlset": urls}).encode("utf-8")
+            digest = hashlib.sha1(content).hexdigest()
+            lastmod = sitemap.latest_lastmod
+            files[name] = {
+                "signature": signature or digest,
+                "digest": digest,
+                "lastmod": lastmod.isoformat() if lastmod else None,
+            }
+            if previous and previous.get("digest") == digest and exists:
+                stats["unchanged"] += 1
+                continue
+            _write(root, name, content)
+            stats["rendered"] += 1
+
+    for path in root.glob("sitemap-*.xml*"):
+        if path.name.removesuffix(".gz") not in files:
+            path.unlink()
+            stats["removed"] += 1
+
+    index = [
+        SitemapIndexItem(
+            f"{settings.SITE_URL.rstrip('/')}/{name}",
+            datetime.fromisoformat(entry["lastmod"]) if entry["lastmod"] else None,
+        )
+        for name, entry in files.items()
+    ]
+    content = render_to_string("sitemap_index.xml", {"sitemaps": index}).encode("utf-8")
+    digest = hashlib.sha1(content).hexdigest()
+    if state.get(INDEX_NAME, {}).get("digest") != digest or not (root / INDEX_NAME).exists():
+        _write(root, INDEX_NAME, content)
+    files[INDEX_NAME] = {"digest": digest}
+
+    _replace(root, STATE_NAME, json.dumps(files, indent=1).encode("utf-8"))
+    logger.info(
+        "Sitemap: %s fisiere randate, %s neschimbate, %s sterse in %.2fs",
+        stats["rendered"],
+        stats["unchanged"],
+        stats["removed"],
+        time.monotonic() - started,
+    )
+    return stats
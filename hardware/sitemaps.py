@@ -42,20 +42,30 @@ class BrandSitemap(Sitemap):
 class PostSitemap(Sitemap):
     changefreq = "weekly"
     priority = 0.6
+    date_field = "updated_at"
 
     def items(self):
         return Post.objects.order_by("-created_at")
 
     def lastmod(self, obj):
-        return obj.created_at
+        return obj.updated_at
 
 
 product_sitemap = GenericSitemap(
-    {"queryset": Product.objects.filter(available=True), "date_field": "updated_at"},
+    {"queryset": Product.objects.filter(available=True).order_by("pk"), "date_field": "updated_at"},
     priority=0.8,
 )
 
 tutorial_sitemap = GenericSitemap(
-    {"queryset": Tutorial.objects.all(), "date_field": "published_at"},
+    {"queryset": Tutorial.objects.order_by("pk"), "date_field": "updated_at"},
     priority=0.5,
 )
+
+SITEMAPS = {
+    "static": StaticViewSitemap,
+    "categories": CategorySitemap,
+    "brands": BrandSitemap,
+    "posts": PostSitemap,
+    "products": product_sitemap,
+    "tutorials": tutorial_sitemap,
+}
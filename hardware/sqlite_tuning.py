@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import Dict
+
+from django.conf import settings
+
+
+logger = logging.getLogger("django")
+
+_TOKEN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# journal_mode trebuie aplicat primul: celelalte setări depind de modul jurnalului
+_FIRST = ("journal_mode",)
+
+
+def pragmas_for(settings_dict: Dict[str, object]) -> Dict[str, object]:
+    """
+    PRAGMA-urile pentru o bază: SQLITE_PRAGMAS, suprascrise de cheia opțională
+    "PRAGMAS" din intrarea corespunzătoare din DATABASES.
+    """
+    pragmas = dict(getattr(settings, "SQLITE_PRAGMAS", {}))
+    pragmas.update(settings_dict.get("PRAGMAS") or {})
+    return pragmas
+
+
+def pragma_statements(pragmas: Dict[str, object]) -> list:
+    ordered = sorted(pragmas.items(), key=lambda item: item[0] not in _FIRST)
+    statements = []
+    for name, value in ordered:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "ON" if value else "OFF"
+        if not _TOKEN.match(str(name)) or not _TOKEN.match(str(value)):
+            raise ValueError(f"PRAGMA invalid: {name}={value!r}")
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def apply_pragmas(sender, connection, **kwargs) -> None:
+    """
+    Receiver pentru connection_created: aplică PRAGMA-urile pe fiecare conexiune SQLite nouă.
+    """
+    if connection.vendor != "sqlite":
+        return
+    statements = pragma_statements(pragmas_for(connection.settings_dict))
+    if not statements:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    logger.debug("PRAGMA aplicate pe %s: %s", connection.alias, "; ".join(statements))
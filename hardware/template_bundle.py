@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from django.template import Template, TemplateSyntaxError, engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+logger = logging.getLogger("django")
+
+TEMPLATE_SUFFIXES = (".html", ".txt", ".xml")
+
+
+def _engine():
+    return engines["django"].engine
+
+
+def _loaders(loaders) -> Iterator:
+    for loader in loaders:
+        if isinstance(loader, CachedLoader):
+            yield from _loaders(loader.loaders)
+        else:
+            yield loader
+
+
+def cached_loader() -> CachedLoader | None:
+    for loader in _engine().template_loaders:
+        if isinstance(loader, CachedLoader):
+            return loader
+    return None
+
+
+def template_names(*, include_third_party: bool = False) -> List[str]:
+    """
+    Numele tuturor șabloanelor din directoarele loaderelor; implicit doar cele din
+    proiect (sub BASE_DIR), fără admin și celelalte aplicații instalate.
+    """
+    base_dir = Path(settings.BASE_DIR).resolve()
+    names = set()
+    for loader in _loaders(_engine().template_loaders):
+        for directory in loader.get_dirs():
+            directory = Path(directory).resolve()
+            if not include_third_party and not directory.is_relative_to(base_dir):
+                continue
+            if not directory.is_dir():
+                continue
+            names.update(
+                path.relative_to(directory).as_posix()
+                for path in directory.rglob("*")
+                if path.is_file() and path.suffix in TEMPLATE_SUFFIXES
+            )
+    return sorted(names)
+
+
+def compile_templates(names: List[str]) -> Tuple[Dict[str, Template], Dict[str, Exception]]:
+    """
+    Parsează șabloanele prin engine; cu loaderul cached rezultatul rămâne în memorie
+    pentru tot procesul, deci cererile nu mai caută și nu mai parsează fișierele.
+    Orice eroare (sintaxă, codare, tag library lipsă) se raportează per șablon,
+    fără să oprească pornirea.
+    """
+    compiled: Dict[str, Template] = {}
+    errors: Dict[str, Exception] = {}
+    engine = _engine()
+    for name in names:
+        try:
+            compiled[name] = engine.get_template(name)
+        except TemplateSyntaxError as exc:
+            errors[name] = exc
+        except Exception as exc:  # noqa: BLE001 - un șablon stricat nu oprește pornirea
+            logger.exception("Sablonul %s nu poate fi incarcat", name)
+            errors[name] = exc
+    return compiled, errors
+
+
+def warm_templates() -> int:
+    """
+    Încarcă la pornire toate șabloanele proiectului în loaderul cached.
+    """
+    if cached_loader() is None:
+        return 0
+    started = time.monotonic()
+    compiled, errors = compile_templates(template_names())
+    for name, exc in errors.items():
+        logger.error("Sablonul %s nu poate fi compilat: %s", name, exc)
+    logger.info("%s sabloane incarcate in %.2fs", len(compiled), time.monotonic() - started)
+    return len(compiled)
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 from django import template
-from django.conf import settings
-from django.utils import timezone
 
-from hardware.models import ProductView
+from hardware.product_cache import get_product_summaries
+from hardware.view_tracking import recent_product_ids
 
 
 register = template.Library()
@@ -15,11 +14,5 @@ def recent_views(context):
     request = context.get("request")
     if not request or not request.user.is_authenticated:
         return {"recent_products": []}
-    today = timezone.localdate()
-    views = (
-        ProductView.objects.filter(user=request.user, viewed_at__date=today)
-        .select_related("product")
-        .order_by("-viewed_at")[: settings.VIZ_PROD]
-    )
-    products = [view.product for view in views]
+    products = get_product_summaries(recent_product_ids(request.user.id))
     return {"recent_products": products}
@@ -0,0 +1,163 @@
+import gzip
+import sqlite3
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import TestCase
+
+from accounts.models import User
+from hardware.backup import (
+    ROWS_MARKER,
+    backup_incremental,
+    load_manifest,
+    load_state,
+    table_aliases,
+)
+from hardware.models import Category, ContactMessage, Product, ProductView, RequestLog
+
+
+class BackupDbTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_dump_comprimat_cu_insert_multi_rand(self):
+        path = Path(self.tmp.name) / "backup.sql.gz"
+
+        call_command(
+            "backup_db", output=str(path), compress="gzip", rows_per_insert=2, stdout=StringIO()
+        )
+
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            dump = fh.read()
+        counts = dict(
+            line[len(ROWS_MARKER):].rsplit(" ", 1)
+            for line in dump.splitlines()
+            if line.startswith(ROWS_MARKER)
+        )
+        self.assertEqual(int(counts["hardware_product"]), Product.objects.count())
+        self.assertEqual(int(counts["hardware_promotion_categories"]), 0)
+        self.assertEqual(
+            dump.count('INSERT INTO "hardware_category"'), -(-Category.objects.count() // 2)
+        )
+
+        target = sqlite3.connect(":memory:")
+        target.execute(
+            'CREATE TABLE "hardware_category" '
+            "(id, name, slug, description, icon_class, color_hex)"
+        )
+        section = dump.split("-- table: hardware_category\n", 1)[1].split(ROWS_MARKER, 1)[0]
+        target.executescript(section)
+        names = [row[0] for row in target.execute('SELECT name FROM "hardware_category" ORDER BY id')]
+        expected = list(Category.objects.order_by("id").values_list("name", flat=True))
+        self.assertEqual(names, expected)
+
+    def _empty_tables(self):
+        for table, alias in reversed(list(table_aliases().items())):
+            with connections[alias].cursor() as cursor:
+                cursor.execute(f"DELETE FROM {connections[alias].ops.quote_name(table)}")
+
+    def test_restore_verifica_numarul_de_randuri(self):
+        path = Path(self.tmp.name) / "backup.sql.gz"
+        call_command("backup_db", output=str(path), compress="gzip", stdout=StringIO())
+        expected = self._snapshot()
+        self._empty_tables()
+
+        out = StringIO()
+        call_command("restore_db", str(path), batch_statements=1, stdout=out)
+
+        self.assertEqual(self._snapshot(), expected)
+        self.assertIn("randuri/s", out.getvalue())
+
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            dump = fh.read()
+        tampered = Path(self.tmp.name) / "alterat.sql"
+        tampered.write_text(
+            dump.replace(f"{ROWS_MARKER}hardware_category ", f"{ROWS_MARKER}hardware_category 9"),
+            encoding="utf-8",
+        )
+        self._empty_tables()
+        with self.assertRaisesMessage(CommandError, "hardware_category"):
+            call_command("restore_db", str(tampered), stdout=StringIO())
+
+    def _snapshot(self):
+        return {
+            model.__name__: list(model.objects.order_by("pk").values())
+            for model in (Category, ContactMessage, Product, ProductView, User)
+        }
+
+    def test_lant_incremental_se_restaureaza_identic(self):
+        directory = self.tmp.name
+        full = backup_incremental(directory, compress="gzip")
+        self.assertEqual(full["kind"], "full")
+
+        product = Product.objects.first()
+        product.price += 10
+        product.save()
+        category = Category.objects.first()
+        category.description = "Descriere noua"
+        category.save()
+        user = User.objects.create(username="nou", email="nou@example.com")
+        ProductView.objects.create(user=user, product=product)
+        removed = Product.objects.exclude(pk=product.pk).filter(views__isnull=True).last()
+        removed.delete()
+
+        delta = backup_incremental(directory, compress="gzip")
+        self.assertEqual(delta["kind"], "delta")
+        tables = delta["tables"]
+        self.assertEqual(tables["hardware_product"]["changed"], 1)
+        self.assertEqual(tables["hardware_product"]["deleted"], 1)
+        self.assertEqual(tables["hardware_category"]["changed"], 1)
+        self.assertEqual(tables["hardware_productview"]["changed"], 1)
+        self.assertEqual(tables["hardware_brand"]["changed"], 0)
+        self.assertEqual(len(load_manifest(directory)["chain"]), 2)
+
+        expected = self._snapshot()
+        self._empty_tables()
+        self.assertFalse(Product.objects.exists())
+
+        call_command("restore_db", directory, stdout=StringIO())
+
+        self.assertEqual(self._snapshot(), expected)
+
+    def test_tabelele_append_only_folosesc_watermark_pe_id(self):
+        logs = [RequestLog.objects.create(path=f"/pagina-{i}/", method="GET") for i in range(3)]
+        backup_incremental(self.tmp.name)
+
+        RequestLog.objects.create(path="/nou/", method="GET")
+        logs[0].delete()
+        delta = backup_incremental(self.tmp.name)
+
+        stats = delta["tables"]["hardware_requestlog"]
+        self.assertEqual((stats["changed"], stats["deleted"]), (1, 1))
+        state = load_state(self.tmp.name)["hardware_requestlog"]
+        self.assertNotIn("rows", state)
+        self.assertEqual(len(state["ids"]), 3)
+
+    def test_mesajele_de_contact_procesate_intra_in_delta(self):
+        message = ContactMessage.objects.create(name="Ion", email="ion@example.com", message="Salut")
+        # lanț început când tabelul era tratat ca append-only (starea are doar id-uri)
+        with mock.patch("hardware.backup.APPEND_ONLY_MODELS", {"hardware.contactmessage"}):
+            backup_incremental(self.tmp.name)
+
+        message.processed = True
+        message.save()
+        delta = backup_incremental(self.tmp.name)
+        self.assertEqual(delta["tables"]["hardware_contactmessage"]["changed"], 1)
+
+        message.email = "ion@exemplu.ro"
+        message.save()
+        delta = backup_incremental(self.tmp.name)
+        self.assertEqual(delta["tables"]["hardware_contactmessage"]["changed"], 1)
+
+        expected = self._snapshot()
+        self._empty_tables()
+        call_command("restore_db", self.tmp.name, stdout=StringIO())
+        self.assertEqual(self._snapshot(), expected)
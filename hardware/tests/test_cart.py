@@ -7,6 +7,7 @@ from hardware.models import Product
 
 
 class CartTests(TestCase):
+    databases = {"default", "analytics", "cache"}
     fixtures = ["seed.json"]
 
     def test_add_to_cart_si_total_corect(self):
@@ -45,3 +46,34 @@ class CartTests(TestCase):
         self.assertEqual(response.status_code, 302)
         cart = self.client.session.get("cart", {})
         self.assertNotIn(str(product.pk), cart)
+
+    def test_pret_modificat_actualizeaza_snapshotul_din_cos(self):
+        product = Product.objects.get(slug="bormasina-percutie-bosch-gsb-13-re")
+        self.client.post(
+            reverse("hardware:cart_add", kwargs={"slug": product.slug}), {"qty": 2}
+        )
+        cart_url = reverse("hardware:cart")
+        self.client.get(cart_url)
+
+        product.price = product.price + Decimal("10.00")
+        product.save()
+
+        response = self.client.get(cart_url)
+        self.assertEqual(response.context["total"], product.price * Decimal("2"))
+        cart = self.client.session.get("cart", {})
+        self.assertEqual(cart[str(product.pk)]["price"], str(product.price))
+
+    def test_stoc_scazut_invalideaza_rezumatul_cosului(self):
+        product = Product.objects.get(slug="bormasina-percutie-bosch-gsb-13-re")
+        self.client.post(
+            reverse("hardware:cart_add", kwargs={"slug": product.slug}), {"qty": 2}
+        )
+        cart_url = reverse("hardware:cart")
+        self.client.get(cart_url)
+
+        product.stock = 1
+        product.save(update_fields=["stock"])
+
+        response = self.client.get(cart_url)
+        self.assertEqual(response.context["items"][0]["qty"], 1)
+        self.assertEqual(response.context["total"], product.price)
@@ -7,6 +7,7 @@ from hardware.models import Brand, Category, Product
 
 
 class CatalogViewTests(TestCase):
+    databases = {"default", "analytics", "cache"}
     fixtures = ["seed.json"]
 
     def test_catalog_list_status_code_si_paginare(self):
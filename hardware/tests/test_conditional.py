@@ -0,0 +1,72 @@
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from hardware.models import Accessory, Product
+
+
+class ConditionalGetTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def setUp(self):
+        cache.clear()
+        self.product = Accessory.objects.first().product
+        self.url = reverse("hardware:product_detail", kwargs={"slug": self.product.slug})
+
+    def _etag(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_al_doilea_get_primeste_304(self):
+        etag = self._etag()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_etag_urmeaza_produsul_accesoriile_si_cosul(self):
+        etag = self._etag()
+        self.product.price += 1
+        self.product.save()
+        changed = self._etag()
+        self.assertNotEqual(changed, etag)
+
+        accessory = Accessory.objects.filter(product=self.product).first()
+        accessory.price = 1
+        accessory.save()
+        accessories = self._etag()
+        self.assertNotEqual(accessories, changed)
+
+        self.client.post(reverse("hardware:cart_add", kwargs={"slug": self.product.slug}), {"qty": 1})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=accessories)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(self._etag(), accessories)
+
+    def test_versiunea_catalogului_eliminata_schimba_etag(self):
+        etag = self._etag()
+        cache.delete("catalog_version")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_pagina_cu_mesaje_nu_are_etag(self):
+        self._etag()
+        self.client.post(reverse("hardware:cart_add", kwargs={"slug": self.product.slug}), {"qty": 1})
+        response = self.client.get(self.url)
+        self.assertTrue(list(get_messages(response.wsgi_request)))
+        self.assertNotIn("ETag", response)
+
+    def test_catalogul_tine_cont_de_filtre(self):
+        url = reverse("hardware:products")
+        etag = self._etag(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(
+            self.client.get(url, {"name": "bosch"}, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+        Product.objects.filter(pk=self.product.pk).update(name="Produs redenumit")
+        self.product.refresh_from_db()
+        self.product.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -5,9 +5,11 @@ from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from hardware import views
+from hardware.outbox import drain_outbox
 
 
 class ContactViewTests(TestCase):
+    databases = {"default", "analytics", "cache"}
     fixtures = ["seed.json"]
 
     @override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
@@ -23,7 +25,7 @@ class ContactViewTests(TestCase):
             "email": "utilizator@example.com",
             "confirm_email": "utilizator@example.com",
             "message_type": "intrebare",
-            "subject": "Intrebare disponibilitate",
+            "subject": "Intrebare Disponibilitate",
             "min_wait_days": 3,
             "message": "Buna ziua, doresc informatii suplimentare despre stoc Popescu",
         }
@@ -33,6 +35,8 @@ class ContactViewTests(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, url)
 
+        self.assertEqual(len(mail.outbox), 0)
+        drain_outbox()
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("Popescu", mail.outbox[0].body)
 
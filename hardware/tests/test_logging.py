@@ -5,6 +5,7 @@ from hardware.models import RequestLog
 
 
 class RequestLoggingTests(TestCase):
+    databases = {"default", "analytics", "cache"}
     fixtures = ["seed.json"]
 
     def test_request_logging_salveaza_in_db_pentru_rute_publice(self):
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from hardware.models import OutboxEmail
+from hardware.outbox import drain_outbox, enqueue_mail
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    OUTBOX_RATE_LIMIT=0,
+    OUTBOX_MAX_ATTEMPTS=2,
+)
+class OutboxTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def test_mesajele_sunt_trimise_doar_la_golirea_cozii(self):
+        for index in range(3):
+            enqueue_mail(f"Subiect {index}", "Corp", None, [f"client{index}@example.com"])
+        self.assertEqual(len(mail.outbox), 0)
+
+        stats = drain_outbox(batch_size=2)
+
+        self.assertEqual(stats["sent"], 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboxEmail.objects.filter(status=OutboxEmail.Status.PENDING).exists())
+        self.assertEqual(drain_outbox()["sent"], 0)
+
+    def test_esecul_reprogrameaza_apoi_muta_in_dead_letter(self):
+        enqueue_mail("Subiect", "Corp", None, ["client@example.com"])
+        failing = mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("smtp indisponibil"),
+        )
+        with failing:
+            self.assertEqual(drain_outbox()["retried"], 1)
+            row = OutboxEmail.objects.get()
+            self.assertGreater(row.next_attempt_at, timezone.now())
+            self.assertEqual(drain_outbox()["retried"], 0)
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(drain_outbox()["dead"], 1)
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, OutboxEmail.Status.DEAD)
+        self.assertIn("smtp indisponibil", row.last_error)
+        self.assertEqual(len(mail.outbox), 0)
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.views import profile_cache_key
+from hardware import page_cache
+
+
+class PageCacheTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="client", password="parola-test-123", email="client@example.com"
+        )
+
+    @override_settings(PAGE_CACHE_COMPRESS_MIN_BYTES=100)
+    def test_pagina_comprimata_e_invalidata_de_salvarea_userului(self):
+        content, fingerprint = page_cache.lookup("pagina", [self.user])
+        self.assertIsNone(content)
+        page_cache.store("pagina", fingerprint, b"<p>profil</p>" * 50, None)
+        self.assertEqual(cache.get("pagina")[1][0], page_cache.ZLIB)
+        self.assertEqual(page_cache.lookup("pagina", [self.user])[0], b"<p>profil</p>" * 50)
+
+        self.user.email = "nou@example.com"
+        self.user.save()
+        self.assertIsNone(page_cache.lookup("pagina", [self.user])[0])
+
+    def test_versiunea_eliminata_din_cache_nu_revalideaza_pagina(self):
+        cache.delete(page_cache.dependency_key(self.user))
+        _, fingerprint = page_cache.lookup("pagina", [self.user])
+        page_cache.store("pagina", fingerprint, b"vechi", None)
+        self.user.first_name = "Nou"
+        self.user.save()
+        # cull: versiunea bump-uită dispare din cache
+        cache.delete(page_cache.dependency_key(self.user))
+        self.assertIsNone(page_cache.lookup("pagina", [self.user])[0])
+
+    def test_profilul_reflecta_modificarile_din_admin(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("accounts:profile"))
+        self.assertContains(response, "client@example.com")
+        self.assertIsNotNone(cache.get(profile_cache_key(self.user.id)))
+
+        self.user.email = "admin-edit@example.com"
+        self.user.save()
+        response = self.client.get(reverse("accounts:profile"))
+        self.assertContains(response, "admin-edit@example.com")
+
+        session = self.client.session
+        session["profile_data"] = {"oras": "Cluj"}
+        session.save()
+        response = self.client.get(reverse("accounts:profile"))
+        self.assertContains(response, "Cluj")
@@ -0,0 +1,61 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from hardware.permissions import GLOBAL_VERSION_KEY, perm_version_key, user_can, user_in_group
+
+
+class PermissionCacheTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="angajat", password="parola-test-123")
+        self.add_product = Permission.objects.get(codename="add_product")
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_cache_intre_cereri_si_invalidare_la_m2m(self):
+        self.assertFalse(user_can(self.fresh_user(), "hardware.add_product"))
+        next_request_user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertFalse(user_can(next_request_user, "hardware.add_product"))
+
+        self.user.user_permissions.add(self.add_product)
+        self.assertTrue(user_can(self.user, "hardware.add_product"))
+        user = self.fresh_user()
+        self.assertTrue(user_can(user, "hardware.add_product"))
+        with self.assertNumQueries(0):
+            self.assertTrue(user_can(user, "hardware.add_product"))
+
+    def test_versiunile_eliminate_nu_revalideaza_permisiuni_retrase(self):
+        keys = [perm_version_key(self.user.pk), GLOBAL_VERSION_KEY]
+        self.user.user_permissions.add(self.add_product)
+        cache.delete_many(keys)
+        self.assertTrue(user_can(self.fresh_user(), "hardware.add_product"))
+
+        self.user.user_permissions.remove(self.add_product)
+        # cull: versiunile dispar, starea veche (cu permisiunea) rămâne în cache
+        cache.delete_many(keys)
+        self.assertFalse(user_can(self.fresh_user(), "hardware.add_product"))
+
+    def test_grupuri_si_permisiunile_grupului(self):
+        group = Group.objects.create(name="Vanzatori")
+        self.assertFalse(user_in_group(self.fresh_user(), "Vanzatori"))
+        group.user_set.add(self.user)
+        self.assertTrue(user_in_group(self.fresh_user(), "Vanzatori"))
+
+        group.permissions.add(self.add_product)
+        self.assertTrue(user_can(self.fresh_user(), "hardware.add_product"))
+
+    def test_oferta_acceptata_si_retrasa_la_logout(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("hardware:oferta")).status_code, 403)
+        self.client.get(reverse("hardware:oferta_accepta"))
+        self.assertEqual(self.client.get(reverse("hardware:oferta")).status_code, 200)
+
+        self.client.post(reverse("accounts:logout"))
+        self.assertFalse(user_can(self.fresh_user(), "hardware.vizualizeaza_oferta"))
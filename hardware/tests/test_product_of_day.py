@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from hardware.models import Product
+from hardware.product_of_day import get_product_of_day_banner, pick_product_of_day
+
+
+class ProductOfDayTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_alegerea_este_determinista_pentru_aceeasi_zi(self):
+        day = date(2025, 3, 14)
+        first = pick_product_of_day(day)
+        self.assertIsNotNone(first)
+        self.assertEqual(pick_product_of_day(day), first)
+
+    def test_bannerul_se_invalideaza_cand_produsul_devine_indisponibil(self):
+        html = get_product_of_day_banner()
+        chosen = next(p for p in Product.objects.all() if p.name in html)
+
+        chosen.available = False
+        chosen.save()
+
+        html = get_product_of_day_banner()
+        self.assertNotIn(chosen.name, html)
+        self.assertIn("Produsul zilei", html)
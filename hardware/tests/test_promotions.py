@@ -0,0 +1,58 @@
+from django.core.mail import EmailMessage
+from django.test import TestCase
+
+from accounts.models import User
+from hardware.models import Category, OutboxEmail, Product, ProductView
+from hardware.recipients import enqueue_promotion, resolve_recipients
+
+
+class PromotionRecipientsTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def setUp(self):
+        self.electric = Category.objects.get(slug="scule-electrice")
+        self.protection = Category.objects.get(slug="echipamente-protectie")
+        electric_products = list(Product.objects.filter(category=self.electric)[:2])
+        protection_product = Product.objects.filter(category=self.protection).first()
+
+        def user(name, confirmed=True, email=None):
+            return User.objects.create(
+                username=name,
+                email=f"{name}@example.com" if email is None else email,
+                email_confirmat=confirmed,
+            )
+
+        self.both = user("ambele")
+        self.only_protection = user("protectie")
+        for product in electric_products + [protection_product]:
+            ProductView.objects.create(user=self.both, product=product)
+        ProductView.objects.create(user=self.only_protection, product=protection_product)
+        for ignored in (user("neconfirmat", confirmed=False), user("faraemail", email="")):
+            ProductView.objects.create(user=ignored, product=protection_product)
+
+    def test_fiecare_user_apare_o_singura_data(self):
+        rows = list(resolve_recipients([self.electric.id, self.protection.id], 1))
+
+        self.assertEqual(
+            rows,
+            [
+                (self.both.id, self.both.email, self.electric.id),
+                (self.only_protection.id, self.only_protection.email, self.protection.id),
+            ],
+        )
+        self.assertEqual(list(resolve_recipients([self.electric.id], 3)), [])
+
+    def test_mesajele_sunt_puse_in_coada_pe_bucati(self):
+        per_category = enqueue_promotion(
+            [self.electric.id, self.protection.id],
+            1,
+            lambda category_id, email: EmailMessage("Promo", str(category_id), None, [email]),
+            chunk_size=1,
+        )
+
+        self.assertEqual(per_category, {self.electric.id: 1, self.protection.id: 1})
+        self.assertEqual(
+            sorted(OutboxEmail.objects.values_list("to", flat=True)),
+            [[self.both.email], [self.only_protection.email]],
+        )
@@ -0,0 +1,100 @@
+import threading
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from hardware.ratelimit import SlidingWindow, windows_for
+
+
+class SlidingWindowTests(SimpleTestCase):
+    def setUp(self):
+        caches["ratelimit"].clear()
+
+    @override_settings(
+        RATELIMIT_PROCESSES=4, RATELIMITS={"login": {"ip": (30, 300), "global": (2, 60)}}
+    )
+    def test_limitele_sunt_impartite_la_procese(self):
+        limits = {scope: window.limit for scope, window in windows_for("login")}
+        self.assertEqual(limits, {"ip": 8, "global": 1})
+
+    def test_fereastra_anterioara_conteaza_proportional(self):
+        window = SlidingWindow("test", 10, 60)
+        for _ in range(8):
+            window.hit("1.2.3.4", now=6000.0)
+        self.assertEqual(window.peek("1.2.3.4", now=6090.0), 4.0)
+        self.assertEqual(window.hit("1.2.3.4", now=6105.0), (2.0, 3.0))
+
+    def test_contoare_atomice_sub_incarcare(self):
+        window = SlidingWindow("incarcare", 100, 3600)
+        crossings = []
+        barrier = threading.Barrier(16)
+
+        def worker():
+            barrier.wait()
+            for _ in range(50):
+                before, after = window.hit("*", now=7200.0)
+                if before < window.limit <= after:
+                    crossings.append(after)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(window.peek("*", now=7200.0), 800)
+        self.assertEqual(crossings, [100])
+
+
+@override_settings(RATELIMITS={"login": {"username": (3, 300)}})
+class LoginRateLimitTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def setUp(self):
+        caches["ratelimit"].clear()
+
+    def test_login_blocat_dupa_limita(self):
+        url = reverse("accounts:login")
+        for _ in range(3):
+            response = self.client.post(url, {"username": "Ana", "password": "gresit"})
+            self.assertEqual(response.status_code, 200)
+        response = self.client.post(url, {"username": "ana", "password": "gresit"})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        response = self.client.post(url, {"username": "altcineva", "password": "gresit"})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(RATELIMITS={"login": {"ip": (3, 300)}})
+    def test_x_forwarded_for_ignorat_fara_proxy_de_incredere(self):
+        url = reverse("accounts:login")
+        statuses = [
+            self.client.post(
+                url, {"username": "ana", "password": "gresit"}, HTTP_X_FORWARDED_FOR=f"10.0.0.{i}"
+            ).status_code
+            for i in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+    @override_settings(RATELIMITS={"login": {"ip": (3, 300)}}, TRUSTED_PROXIES=["127.0.0.1"])
+    def test_x_forwarded_for_de_la_proxy_de_incredere(self):
+        url = reverse("accounts:login")
+        statuses = [
+            self.client.post(
+                url,
+                {"username": "ana", "password": "gresit"},
+                HTTP_X_FORWARDED_FOR=f"1.1.1.1, 10.0.0.{i // 3}",
+            ).status_code
+            for i in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 200, 200])
+
+    def test_alerta_numara_in_cache_comun(self):
+        url = reverse("accounts:login")
+        with mock.patch("accounts.views.send_admin_alert") as alert:
+            for _ in range(3):
+                # alt proces: contoarele locale nu sunt văzute
+                caches["ratelimit"].clear()
+                self.client.post(url, {"username": "ana", "password": "gresit"})
+        alert.assert_called_once()
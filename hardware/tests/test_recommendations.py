@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from hardware.models import Product, ProductRecommendation, Purchase
+from hardware.recommendations import (
+    MAX_BASKET_SIZE,
+    build_recommendations,
+    co_occurrence,
+    top_neighbours,
+)
+
+
+class RecommendationTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def test_top_neighbours_ordoneaza_dupa_scor(self):
+        baskets = [{1, 2}, {1, 2}, {1, 3}, {2, 3}]
+        item_counts, pair_counts = co_occurrence(baskets)
+        neighbours = top_neighbours(item_counts, pair_counts, top_k=1)
+        self.assertEqual(neighbours[1][0][1], 2)
+        self.assertEqual(len(neighbours[3]), 1)
+
+    def test_cosurile_mari_pastreaza_produsele_recente(self):
+        # cele mai recente primele: ID-urile mari (produse noi) trebuie să rămână
+        basket = list(range(MAX_BASKET_SIZE + 100, 0, -1))
+        item_counts, pair_counts = co_occurrence([basket])
+        self.assertEqual(len(item_counts), MAX_BASKET_SIZE)
+        self.assertIn(MAX_BASKET_SIZE + 100, item_counts)
+        self.assertNotIn(1, item_counts)
+
+    def test_recomandarile_apar_pe_pagina_produsului(self):
+        first, second = Product.objects.order_by("id")[:2]
+        buyer = get_user_model().objects.create_user(username="cumparator", password="x")
+        Purchase.objects.create(user=buyer, product=first)
+        Purchase.objects.create(user=buyer, product=second)
+
+        build_recommendations()
+
+        recommendation = ProductRecommendation.objects.get(
+            product=first, kind=ProductRecommendation.Kind.BOUGHT_TOGETHER
+        )
+        self.assertEqual(recommendation.recommended, second)
+        response = self.client.get(
+            reverse("hardware:product_detail", kwargs={"slug": first.slug})
+        )
+        self.assertEqual(response.context["bought_together"], [second])
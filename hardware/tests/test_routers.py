@@ -0,0 +1,49 @@
+import threading
+
+from django.db import connections, router, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from hardware.models import Category, Product, RequestLog
+from hardware.routers import ANALYTICS_DB, CACHE_DB, REPLICA_DB, catalog_db
+
+
+class DatabaseRouterTests(SimpleTestCase):
+    def test_modelele_ajung_in_baza_potrivita(self):
+        self.assertEqual(router.db_for_write(RequestLog), ANALYTICS_DB)
+        self.assertEqual(router.db_for_read(RequestLog), ANALYTICS_DB)
+        self.assertEqual(router.db_for_write(Product), "default")
+
+    def test_migrarile_sunt_separate(self):
+        self.assertTrue(router.allow_migrate_model(ANALYTICS_DB, RequestLog))
+        self.assertFalse(router.allow_migrate_model("default", RequestLog))
+        self.assertFalse(router.allow_migrate_model(ANALYTICS_DB, Product))
+        self.assertTrue(router.allow_migrate(CACHE_DB, "django_cache"))
+        self.assertFalse(router.allow_migrate_model(REPLICA_DB, Product))
+
+    @override_settings(CATALOG_READ_REPLICA=False)
+    def test_catalogul_citeste_din_baza_principala_fara_replica(self):
+        self.assertEqual(catalog_db(), "default")
+
+
+class SeparateWriterTests(TransactionTestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def test_jurnalul_se_scrie_cat_timp_baza_principala_e_blocata(self):
+        errors = []
+
+        def log_request():
+            try:
+                RequestLog.objects.create(path="/catalog/", method="GET")
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        with transaction.atomic():
+            Category.objects.create(name="Scule", slug="scule")
+            worker = threading.Thread(target=log_request)
+            worker.start()
+            worker.join(timeout=10)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(RequestLog.objects.count(), 1)
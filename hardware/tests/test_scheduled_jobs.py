@@ -0,0 +1,197 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from hardware import page_cache
+from hardware.management.commands.run_scheduler import (
+    cleanup_unconfirmed_users,
+    send_feedback_requests,
+    send_weekly_newsletter,
+)
+from hardware.models import FeedbackRequest, Nota, Product, ProductView, ScheduledTaskState
+
+
+class CleanupUnconfirmedUsersTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def test_stergere_pe_bucati_cu_dependente(self):
+        joined = timezone.now() - timedelta(days=1)
+        product = Product.objects.first()
+        for index in range(5):
+            user = User.objects.create(
+                username=f"neconfirmat{index}", email_confirmat=False, date_joined=joined
+            )
+            ProductView.objects.create(user=user, product=product)
+        confirmed = User.objects.create(
+            username="confirmat", email_confirmat=True, date_joined=joined
+        )
+
+        deleted = cleanup_unconfirmed_users(timezone.localtime(), chunk_size=2)
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(list(User.objects.all()), [confirmed])
+        self.assertFalse(ProductView.objects.exists())
+
+    def test_stergerea_pe_seturi_fara_semnale_per_user(self):
+        joined = timezone.now() - timedelta(days=1)
+        product = Product.objects.first()
+        group = Group.objects.create(name="neconfirmati")
+
+        def create(prefix, count):
+            users = []
+            for index in range(count):
+                user = User.objects.create(
+                    username=f"{prefix}{index}", email_confirmat=False, date_joined=joined
+                )
+                ProductView.objects.create(user=user, product=product)
+                user.groups.add(group)
+                users.append(user)
+            return users
+
+        create("mic", 2)
+        with CaptureQueriesContext(connection) as small:
+            cleanup_unconfirmed_users(timezone.localtime())
+
+        users = create("mare", 6)
+        cache.set(page_cache.dependency_key(users[0]), 1)
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+
+        post_delete.connect(receiver, sender=User)
+        self.addCleanup(post_delete.disconnect, receiver, sender=User)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(cleanup_unconfirmed_users(timezone.localtime()), 6)
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(deleted, [])
+        self.assertIsNone(cache.get(page_cache.dependency_key(users[0])))
+        self.assertFalse(User.groups.through.objects.exists())
+        self.assertFalse(ProductView.objects.exists())
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    NEWSLETTER_BATCH_SIZE=2,
+    NEWSLETTER_RATE_LIMIT=0,
+)
+class NewsletterTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def setUp(self):
+        joined = timezone.now() - timedelta(days=1)
+        self.users = [
+            User.objects.create(
+                username=f"abonat{index}",
+                email=f"abonat{index}@example.com",
+                email_confirmat=True,
+                date_joined=joined,
+            )
+            for index in range(5)
+        ]
+
+    def test_trimite_pe_loturi_o_singura_data_pe_zi(self):
+        now = timezone.localtime()
+        send_weekly_newsletter(now)
+        self.assertEqual(len(mail.outbox), 5)
+
+        send_weekly_newsletter(now)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_reluarea_dupa_intrerupere_nu_retrimite(self):
+        now = timezone.localtime()
+        ScheduledTaskState.objects.create(
+            name="newsletter",
+            checkpoint={
+                "run": now.date().isoformat(),
+                "last_id": self.users[1].id,
+                "ranges": [[self.users[3].id, self.users[3].id]],
+                "sent": 3,
+            },
+        )
+
+        send_weekly_newsletter(now)
+
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(recipients, ["abonat2@example.com", "abonat4@example.com"])
+
+    def test_campania_intrerupta_e_reluata_in_alta_zi(self):
+        now = timezone.localtime()
+        campaign = now.date() - timedelta(days=1)
+        ScheduledTaskState.objects.create(
+            name="newsletter",
+            checkpoint={"run": campaign.isoformat(), "last_id": self.users[2].id, "sent": 3},
+        )
+
+        send_weekly_newsletter(now)
+
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["abonat3@example.com", "abonat4@example.com"],
+        )
+        self.assertIn(f"{campaign:%d.%m.%Y}", mail.outbox[0].subject)
+        checkpoint = ScheduledTaskState.objects.get(name="newsletter").checkpoint
+        self.assertEqual((checkpoint["run"], checkpoint["done"]), (campaign.isoformat(), True))
+
+    @override_settings(NEWSLETTER_WORKERS=3)
+    def test_lot_esuat_nu_pierde_loturile_trimise_in_paralel(self):
+        now = timezone.localtime()
+        sent_to = []
+
+        def send_batch(messages, limiter=None):
+            recipients = [message.to[0] for message in messages]
+            if "abonat2@example.com" in recipients:
+                raise RuntimeError("smtp indisponibil")
+            time.sleep(0.05)
+            sent_to.extend(recipients)
+            return len(messages)
+
+        with mock.patch("hardware.mailing.send_batch", side_effect=send_batch):
+            with self.assertRaises(RuntimeError), self.assertLogs("django", level="ERROR"):
+                send_weekly_newsletter(now)
+        self.assertEqual(len(sent_to), 3)
+
+        checkpoint = ScheduledTaskState.objects.get(name="newsletter").checkpoint
+        self.assertEqual(checkpoint["sent"], 3)
+        self.assertFalse(checkpoint.get("done"))
+
+        send_weekly_newsletter(now)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["abonat2@example.com", "abonat3@example.com"],
+        )
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class FeedbackRequestTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def test_trimite_cererile_scadente_si_sterge_pe_cele_notate(self):
+        user = User.objects.create(username="client", email="client@example.com")
+        first, second = Product.objects.order_by("id")[:2]
+        due_at = timezone.now() - timedelta(hours=1)
+        pending = FeedbackRequest.objects.create(user=user, product=first, next_send_at=due_at)
+        FeedbackRequest.objects.create(user=user, product=second, next_send_at=due_at)
+        Nota.objects.create(user=user, product=second, rating=5)
+
+        send_feedback_requests(timezone.now())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(f"/rating/{first.id}/5/", mail.outbox[0].body)
+        self.assertEqual(list(FeedbackRequest.objects.all()), [pending])
+        pending.refresh_from_db()
+        self.assertGreater(pending.next_send_at, timezone.now())
@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from hardware.models import ScheduledTaskState
+from hardware.scheduler import ScheduledTask, Scheduler, acquire_lock, release_lock
+
+
+class ScheduledTaskTests(TransactionTestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def test_next_run_pentru_interval(self):
+        task = ScheduledTask("interval", lambda now: None, every_minutes=5)
+        now = timezone.now()
+        self.assertEqual(task.next_run(None, now), now)
+        self.assertEqual(task.next_run(now, now), now + timedelta(minutes=5))
+
+    def test_next_run_saptamanal_in_fereastra_si_dupa_rulare(self):
+        task = ScheduledTask("saptamanal", lambda now: None, weekday="marti", hour=10)
+        tz = timezone.get_current_timezone()
+        in_window = timezone.make_aware(datetime(2025, 3, 11, 10, 15), tz)
+        self.assertEqual(task.next_run(None, in_window), in_window)
+        self.assertEqual(
+            task.next_run(in_window, in_window),
+            timezone.make_aware(datetime(2025, 3, 18, 10, 0), tz),
+        )
+
+    def test_starea_persistata_impiedica_rularea_dubla(self):
+        calls = []
+        task = ScheduledTask("numarare", calls.append, every_minutes=60)
+
+        self.assertEqual(Scheduler([task], workers=1).run_pending(), ["numarare"])
+        self.assertEqual(Scheduler([task], workers=1).run_pending(), [])
+        self.assertEqual(len(calls), 1)
+        self.assertIsNotNone(ScheduledTaskState.objects.get(name="numarare").last_run_at)
+
+    def test_lock_detinut_de_alta_instanta(self):
+        task = ScheduledTask("blocat", lambda now: None, every_minutes=1)
+        ScheduledTaskState.objects.create(name="blocat")
+        now = timezone.now()
+        self.assertTrue(acquire_lock(task, "instanta-a", now)[0])
+        self.assertFalse(acquire_lock(task, "instanta-b", now)[0])
+
+    def test_lease_reinnoit_cat_timp_taskul_ruleaza(self):
+        leases = []
+
+        def slow(now):
+            leases.append(ScheduledTaskState.objects.get(name="lung").locked_until)
+            time.sleep(1.5)
+            leases.append(ScheduledTaskState.objects.get(name="lung").locked_until)
+            leases.append(acquire_lock(task, "instanta-b", timezone.now())[0])
+
+        task = ScheduledTask("lung", slow, every_minutes=60, timeout=3)
+        Scheduler([task], workers=1, instance_id="instanta-a").run_pending()
+        first, renewed, stolen = leases
+        self.assertGreater(renewed, first)
+        self.assertFalse(stolen)
+        state = ScheduledTaskState.objects.get(name="lung")
+        self.assertIsNotNone(state.last_run_at)
+        self.assertIsNone(state.locked_until)
+
+    def test_lease_eliberat_dupa_timeout(self):
+        release = threading.Event()
+        task = ScheduledTask(
+            "blocat", lambda now: release.wait(10), every_minutes=60, timeout=1, retry_seconds=60
+        )
+        runner = threading.Thread(
+            target=Scheduler([task], workers=1, instance_id="instanta-a").run_pending
+        )
+        runner.start()
+        try:
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                state = ScheduledTaskState.objects.filter(name="blocat").first()
+                if state is not None and state.retry_at is not None:
+                    break
+                time.sleep(0.1)
+            self.assertEqual(state.locked_by, "")
+            self.assertIn("timeout", state.last_error)
+            self.assertTrue(acquire_lock(task, "instanta-b", timezone.now())[0])
+        finally:
+            release.set()
+            runner.join()
+
+        # rularea terminată după timeout nu atinge lease-ul preluat și nu e înregistrată
+        state = ScheduledTaskState.objects.get(name="blocat")
+        self.assertEqual(state.locked_by, "instanta-b")
+        self.assertIsNone(state.last_run_at)
+
+    def test_scheduler_abandoneaza_rularea_blocata(self):
+        task = ScheduledTask("blocat", lambda now: None, every_minutes=60, timeout=1, retry_seconds=30)
+        scheduler = Scheduler([task], workers=1)
+        future = Future()
+        scheduler._running["blocat"] = (future, time.monotonic() - 2)
+
+        scheduler._check_timeouts()
+        self.assertNotIn("blocat", scheduler._running)
+        self.assertEqual([name for _, _, name in scheduler._heap], ["blocat"])
+
+        future.set_result(timezone.now())
+        scheduler._finished("blocat", future)
+        self.assertEqual(len(scheduler._heap), 1)
+        scheduler._pool.shutdown()
+
+    def test_rularea_cu_lease_pierdut_este_inregistrata(self):
+        task = ScheduledTask("preluat", lambda now: None, every_minutes=1)
+        ScheduledTaskState.objects.create(name="preluat", locked_by="instanta-b")
+        now = timezone.now()
+        self.assertFalse(release_lock(task, "instanta-a", last_run_at=now, duration=1.0))
+        state = ScheduledTaskState.objects.get(name="preluat")
+        self.assertEqual(state.last_run_at, now)
+        self.assertEqual(state.locked_by, "instanta-b")
+
+    def test_rularea_esuata_nu_avanseaza_last_run_at(self):
+        def broken(now):
+            raise RuntimeError("smtp indisponibil")
+
+        task = ScheduledTask("esuat", broken, every_minutes=60, retry_seconds=60)
+        Scheduler([task], workers=1).run_pending()
+
+        state = ScheduledTaskState.objects.get(name="esuat")
+        self.assertIsNone(state.last_run_at)
+        self.assertIn("smtp indisponibil", state.last_error)
+        self.assertGreater(state.retry_at, timezone.now())
+        self.assertEqual(Scheduler([task], workers=1).run_pending(), [])
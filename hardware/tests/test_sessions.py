@@ -0,0 +1,76 @@
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from hardware.sessions import SessionStore, writer
+
+
+class SessionStoreTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def setUp(self):
+        caches["local"].clear()
+
+    def test_salvare_fara_modificari_nu_scrie(self):
+        store = SessionStore()
+        store["cart"] = {"1": {"qty": 2}}
+        store.save()
+
+        reloaded = SessionStore(store.session_key)
+        self.assertEqual(reloaded["cart"], {"1": {"qty": 2}})
+        reloaded["cart"] = {"1": {"qty": 2}}
+        with self.assertNumQueries(0), self.assertNumQueries(0, using="cache"):
+            reloaded.save()
+
+    def test_citire_din_baza_cand_cache_ul_e_gol(self):
+        store = SessionStore()
+        store["forbidden_count"] = 3
+        store.save()
+        caches["local"].clear()
+        caches["default"].clear()
+
+        self.assertEqual(SessionStore(store.session_key)["forbidden_count"], 3)
+
+    def test_stergerea_e_vazuta_de_celelalte_instante(self):
+        store = SessionStore()
+        store["_auth_user_id"] = "1"
+        store.save()
+        loaded = SessionStore(store.session_key)
+        self.assertEqual(loaded["_auth_user_id"], "1")
+        # implicit fără L1: alt worker nu poate păstra în memorie o sesiune ștearsă
+        self.assertIsNone(caches["local"].get(loaded.cache_key))
+
+        SessionStore(store.session_key).delete()
+        self.assertNotIn("_auth_user_id", SessionStore(store.session_key))
+
+
+@override_settings(SESSION_LOCAL_TIMEOUT=0, SESSION_WRITE_BEHIND_SECONDS=3600)
+class SessionWriterTests(TransactionTestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def tearDown(self):
+        writer.flush()
+
+    def test_salvarile_repetate_devin_o_singura_scriere(self):
+        store = SessionStore()
+        store["profile_data"] = {"nume": "Ana"}
+        store.save()
+        store["forbidden_count"] = 1
+        store.save()
+        self.assertFalse(Session.objects.filter(session_key=store.session_key).exists())
+
+        self.assertEqual(writer.flush(), 1)
+        row = Session.objects.get(session_key=store.session_key)
+        self.assertEqual(store.decode(row.session_data)["forbidden_count"], 1)
+
+    def test_stergerea_anuleaza_scrierea_in_asteptare(self):
+        store = SessionStore()
+        store["cart"] = {}
+        store["forbidden_count"] = 1
+        store.save()
+        key = store.session_key
+        self.assertTrue(SessionStore().exists(key))
+
+        store.flush()
+        writer.flush()
+        self.assertFalse(Session.objects.filter(session_key=key).exists())
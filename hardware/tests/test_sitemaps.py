@@ -0,0 +1,71 @@
+import gzip
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from hardware.models import Product
+from hardware.sitemap_build import INDEX_NAME, _replace, build_sitemaps, sitemap_root
+
+
+class SitemapBuildTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(SITEMAP_ROOT=tmp.name, SITEMAP_MAX_URLS=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_doar_pagina_modificata_e_randata_din_nou(self):
+        first = build_sitemaps()
+        pages = sorted(path.name for path in sitemap_root().glob("sitemap-products-*.xml"))
+        self.assertEqual(len(pages), (Product.objects.filter(available=True).count() + 1) // 2)
+        self.assertEqual(build_sitemaps()["rendered"], 0)
+
+        product = Product.objects.filter(available=True).order_by("pk").last()
+        product.name = "Produs redenumit"
+        product.save()
+        self.assertEqual(build_sitemaps()["rendered"], 1)
+        self.assertGreater(first["rendered"], 1)
+
+    def test_servire_cu_gzip_si_cereri_conditionale(self):
+        with mock.patch("hardware.sitemap_build.build_sitemaps") as build:
+            response = self.client.get("/sitemap.xml")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response)
+        build.assert_not_called()
+
+        build_sitemaps()
+        response = self.client.get("/sitemap.xml", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        index = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertIn("sitemap-products-1.xml", index)
+
+        response = self.client.get("/sitemap-products-1.xml")
+        self.assertIn("<urlset", b"".join(response.streaming_content).decode())
+        etag = response["ETag"]
+        response = self.client.get("/sitemap-products-1.xml", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get("/sitemap-products-99.xml").status_code, 404)
+
+    def test_scrierile_simultane_folosesc_fisiere_temporare_diferite(self):
+        root = sitemap_root()
+        root.mkdir(parents=True, exist_ok=True)
+        pending = []
+        # două scrieri „în zbor” în același timp: mutarea e amânată
+        with mock.patch(
+            "hardware.sitemap_build.os.replace", side_effect=lambda src, dst: pending.append(src)
+        ):
+            _replace(root, INDEX_NAME, b"<a/>")
+            _replace(root, INDEX_NAME, b"<b/>")
+        self.assertNotEqual(*pending)
+        self.assertEqual(sorted(Path(src).read_bytes() for src in pending), [b"<a/>", b"<b/>"])
+
+        with mock.patch("hardware.sitemap_build.os.replace", side_effect=OSError("disc plin")):
+            with self.assertRaises(OSError):
+                _replace(root, INDEX_NAME, b"<c/>")
+        self.assertEqual(len(list(root.glob(".*.tmp"))), 2)
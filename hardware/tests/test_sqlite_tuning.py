@@ -0,0 +1,35 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from hardware.sqlite_tuning import pragma_statements, pragmas_for
+
+
+class PragmaStatementsTests(SimpleTestCase):
+    def test_journal_mode_primul_si_valori_validate(self):
+        statements = pragma_statements(
+            {"busy_timeout": 100, "journal_mode": "WAL", "foreign_keys": True, "mmap_size": None}
+        )
+        self.assertEqual(
+            statements,
+            ["PRAGMA journal_mode=WAL", "PRAGMA busy_timeout=100", "PRAGMA foreign_keys=ON"],
+        )
+        with self.assertRaises(ValueError):
+            pragma_statements({"cache_size": "1; DROP TABLE x"})
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 100, "synchronous": "NORMAL"})
+    def test_suprascriere_per_baza(self):
+        self.assertEqual(
+            pragmas_for({"PRAGMAS": {"busy_timeout": 250}}),
+            {"busy_timeout": 250, "synchronous": "NORMAL"},
+        )
+
+
+class ConnectionPragmaTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def test_conexiunea_are_pragma_din_setari(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute("PRAGMA temp_store")
+            self.assertEqual(cursor.fetchone()[0], 2)
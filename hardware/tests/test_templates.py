@@ -0,0 +1,57 @@
+import tempfile
+import warnings
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from hardware.template_bundle import cached_loader, compile_templates, template_names, warm_templates
+
+
+class TemplateBundleTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def test_incalzirea_umple_loaderul_cached(self):
+        loader = cached_loader()
+        self.assertIsNotNone(loader)
+        loader.reset()
+        names = template_names()
+        self.assertIn("hardware/baza.html", names)
+        self.assertNotIn("admin/base.html", names)
+
+        self.assertEqual(warm_templates(), len(names))
+        self.assertIn("hardware/catalog_list.html", loader.get_template_cache)
+
+    def test_comanda_raporteaza_timpii_si_erorile(self):
+        out = StringIO()
+        call_command("check_templates", "--repeat", "1", stdout=out)
+        self.assertIn("ms  hardware/baza.html", out.getvalue())
+
+        with tempfile.TemporaryDirectory(dir=settings.BASE_DIR) as tmp:
+            Path(tmp, "stricat.html").write_text("{% if %}", encoding="utf-8")
+            templates = [{**settings.TEMPLATES[0], "DIRS": [tmp]}]
+            with override_settings(TEMPLATES=templates):
+                with self.assertRaisesMessage(CommandError, "nu se compileaza"):
+                    call_command("check_templates", "--repeat", "1", stdout=StringIO(), stderr=StringIO())
+
+    def test_sablon_necitibil_nu_opreste_incalzirea(self):
+        with tempfile.TemporaryDirectory(dir=settings.BASE_DIR) as tmp:
+            Path(tmp, "bun.html").write_text("ok", encoding="utf-8")
+            Path(tmp, "latin1.html").write_bytes("<p>\xe2\xee</p>".encode("latin-1"))
+            Path(tmp, "lipsa.html").write_text("{% load inexistent %}", encoding="utf-8")
+            templates = [{**settings.TEMPLATES[0], "DIRS": [tmp]}]
+            with override_settings(TEMPLATES=templates):
+                with self.assertLogs("django", level="ERROR"):
+                    compiled, errors = compile_templates(["bun.html", "latin1.html", "lipsa.html"])
+                    warm_templates()
+        self.assertEqual(list(compiled), ["bun.html"])
+        self.assertIsInstance(errors["latin1.html"], UnicodeDecodeError)
+        self.assertIn("lipsa.html", errors)
+
+    def test_comanda_nu_schimba_filtrele_de_avertismente(self):
+        before = list(warnings.filters)
+        call_command("check_templates", "--repeat", "1", stdout=StringIO())
+        self.assertEqual(warnings.filters, before)
@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import tokens
+from accounts.models import OneTimeToken, User
+
+
+class OneTimeTokenTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+
+    def setUp(self):
+        self.user = User.objects.create(username="nou", email="nou@example.com")
+
+    def test_linkul_de_confirmare_merge_o_singura_data(self):
+        code = tokens.issue(self.user, OneTimeToken.Purpose.EMAIL_CONFIRM)
+        self.assertNotEqual(OneTimeToken.objects.get().token_hash, code)
+
+        response = self.client.get(reverse("confirm_email", kwargs={"code": code}))
+        self.assertContains(response, "E-mail confirmat cu succes.")
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.email_confirmat)
+
+        response = self.client.get(reverse("confirm_email", kwargs={"code": code}))
+        self.assertContains(response, "Cod invalid sau expirat.")
+
+    def test_tokenurile_expirate_sunt_refuzate_si_sterse(self):
+        code = tokens.issue(
+            self.user, OneTimeToken.Purpose.EMAIL_CONFIRM, ttl=timedelta(minutes=-1)
+        )
+        fresh_user = User.objects.create(username="altul")
+        tokens.issue(fresh_user, OneTimeToken.Purpose.EMAIL_CONFIRM)
+
+        self.assertIsNone(tokens.consume(code, OneTimeToken.Purpose.EMAIL_CONFIRM))
+        self.assertEqual(tokens.purge_expired(timezone.now()), 1)
+        self.assertEqual(list(OneTimeToken.objects.values_list("user", flat=True)), [fresh_user.id])
+
+    def test_cautarea_foloseste_indexul_unic(self):
+        queryset = OneTimeToken.objects.filter(token_hash=tokens.hash_token("x"))
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn("USING INDEX", plan)
@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from hardware.models import PendingProductView, Product, ProductView
+from hardware.templatetags.recent_views import recent_views
+from hardware.view_tracking import (
+    MAX_RECENT_VIEWS,
+    flush_views,
+    recent_product_ids,
+    record_view,
+)
+
+
+class ProductViewTrackingTests(TestCase):
+    databases = {"default", "analytics", "cache"}
+    fixtures = ["seed.json"]
+
+    def setUp(self):
+        cache.clear()
+        caches["local"].clear()
+        self.user = get_user_model().objects.create_user(
+            username="vizitator", password="parola-test-123"
+        )
+
+    def test_vizualizarile_sunt_scrise_la_flush(self):
+        product = Product.objects.first()
+        record_view(self.user.id, product.id)
+        record_view(self.user.id, product.id)
+        self.assertFalse(ProductView.objects.exists())
+
+        self.assertEqual(flush_views(), 1)
+        self.assertEqual(ProductView.objects.filter(user=self.user).count(), 1)
+
+    def test_flush_ignora_userii_si_produsele_sterse(self):
+        first, second = Product.objects.order_by("id")[:2]
+        other = get_user_model().objects.create_user(username="sters", password="parola-test-123")
+        record_view(self.user.id, first.id)
+        record_view(self.user.id, second.id)
+        record_view(other.id, first.id)
+        second.delete()
+        other.delete()
+
+        self.assertEqual(flush_views(), 1)
+        self.assertEqual(
+            list(ProductView.objects.values_list("user_id", "product_id")), [(self.user.id, first.id)]
+        )
+        self.assertFalse(PendingProductView.objects.exists())
+
+    def test_flush_pastreaza_doar_ultimele_vizualizari(self):
+        products = list(Product.objects.all())
+        extra = Product.objects.create(
+            category=products[0].category,
+            brand=products[0].brand,
+            name="Produs extra",
+            slug="produs-extra",
+            price=products[0].price,
+            stock=1,
+        )
+        for product in products + [extra]:
+            record_view(self.user.id, product.id)
+        flush_views([self.user.id])
+
+        views = ProductView.objects.filter(user=self.user)
+        self.assertEqual(views.count(), MAX_RECENT_VIEWS)
+        self.assertTrue(views.filter(product=extra).exists())
+
+    def test_recent_views_citeste_si_bufferul(self):
+        product = Product.objects.first()
+        self.client.force_login(self.user)
+        self.client.get(reverse("hardware:product_detail", kwargs={"slug": product.slug}))
+        self.assertFalse(ProductView.objects.exists())
+
+        response = self.client.get(reverse("hardware:catalog"))
+        self.assertContains(response, "Vizualizate azi")
+
+    @override_settings(VIZ_PROD=2)
+    def test_inelul_recent_este_limitat_si_ordonat(self):
+        first, second, third = Product.objects.order_by("id")[:3]
+        for product in (first, second, third, first):
+            record_view(self.user.id, product.id)
+        self.assertEqual(recent_product_ids(self.user.id), [first.id, third.id])
+
+    def test_tagul_nu_interogheaza_produsele_pe_cache_cald(self):
+        product = Product.objects.first()
+        record_view(self.user.id, product.id)
+        request = RequestFactory().get("/")
+        request.user = self.user
+        recent_views({"request": request})
+
+        with self.assertNumQueries(0, using="default"), self.assertNumQueries(
+            0, using="analytics"
+        ), self.assertNumQueries(0, using="cache"):
+            data = recent_views({"request": request})
+        self.assertEqual([item["id"] for item in data["recent_products"]], [product.id])
+
+        # procesul care modifică produsul sau înregistrează vizualizarea își actualizează L1
+        product.price += 5
+        product.save()
+        other = Product.objects.exclude(pk=product.pk).first()
+        record_view(self.user.id, other.id)
+        data = recent_views({"request": request})
+        self.assertEqual([item["id"] for item in data["recent_products"]], [other.id, product.id])
+        self.assertEqual(data["recent_products"][1]["price"], product.price)
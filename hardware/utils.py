@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import List, Tuple
 from urllib.parse import parse_qsl
 
+from django.conf import settings
 from django.utils import timezone
 
 
@@ -120,7 +121,16 @@ class Accesare:
 
 
 def get_ip(request) -> str | None:
+    """
+    IP-ul clientului. X-Forwarded-For contează doar pentru cereri venite de la un proxy
+    din TRUSTED_PROXIES; altfel clientul ar putea trimite alt IP la fiecare cerere.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR")
+    trusted = getattr(settings, "TRUSTED_PROXIES", ())
     forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-    if forwarded_for:
-        return forwarded_for.split(",")[-1].strip()
-    return request.META.get("REMOTE_ADDR")
+    if forwarded_for and remote_addr in trusted:
+        # de la dreapta: prima adresă care nu e un proxy propriu; cele din stânga pot fi false
+        for address in reversed([part.strip() for part in forwarded_for.split(",")]):
+            if address and address not in trusted:
+                return address
+    return remote_addr
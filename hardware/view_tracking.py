@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import logging
+from array import array
+from datetime import datetime, time as dt_time
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import PendingProductView, Product, ProductView
+from .product_cache import local_cache, local_timeout
+
+
+logger = logging.getLogger("django")
+
+MAX_RECENT_VIEWS = 5
+BUFFER_TIMEOUT = 60 * 60 * 24
+
+
+def _ring_key(user_id: int) -> str:
+    return f"pv_recent:{user_id}"
+
+
+def record_view(user_id: int, product_id: int) -> None:
+    """
+    Adaugă vizualizarea în tabela de așteptare (un INSERT în baza de analytics)
+    și în inelul de produse recente; ProductView e actualizat la flush.
+    """
+    now = timezone.now()
+    PendingProductView.objects.create(user_id=user_id, product_id=product_id, viewed_at=now)
+    ring_key = _ring_key(user_id)
+    ring = _ring_push(cache.get(ring_key), product_id, timezone.localdate(now).toordinal())
+    cache.set(ring_key, ring, timeout=BUFFER_TIMEOUT)
+    local = local_cache()
+    if local is not None:
+        local.set(ring_key, ring, timeout=local_timeout())
+
+
+def _ring_capacity() -> int:
+    return getattr(settings, "VIZ_PROD", 4)
+
+
+def _ring_pairs(raw: bytes | None) -> List[tuple]:
+    ring = array("q")
+    if raw:
+        ring.frombytes(raw)
+    return [(ring[i], ring[i + 1]) for i in range(0, len(ring), 2)]
+
+
+def _ring_pack(pairs: Iterable[tuple]) -> bytes:
+    ring = array("q")
+    for product_id, day in pairs:
+        ring.extend((product_id, day))
+    return ring.tobytes()
+
+
+def _ring_push(raw: bytes | None, product_id: int, day: int) -> bytes:
+    pairs = [pair for pair in _ring_pairs(raw) if pair[0] != product_id]
+    pairs.insert(0, (product_id, day))
+    return _ring_pack(pairs[: _ring_capacity()])
+
+
+def _warm_ring(user_id: int) -> bytes:
+    start = timezone.make_aware(datetime.combine(timezone.localdate(), dt_time.min))
+    viewed = dict(
+        ProductView.objects.filter(user_id=user_id, viewed_at__gte=start)
+        .order_by("-viewed_at")
+        .values_list("product_id", "viewed_at")[: _ring_capacity()]
+    )
+    for product_id, viewed_at in buffered_views(user_id).items():
+        if viewed_at >= start:
+            viewed[product_id] = max(viewed_at, viewed.get(product_id, viewed_at))
+    ordered = sorted(viewed, key=viewed.get, reverse=True)[: _ring_capacity()]
+    raw = _ring_pack(
+        (product_id, timezone.localdate(viewed[product_id]).toordinal())
+        for product_id in ordered
+    )
+    cache.set(_ring_key(user_id), raw, timeout=BUFFER_TIMEOUT)
+    return raw
+
+
+def recent_product_ids(user_id: int) -> List[int]:
+    """
+    ID-urile produselor văzute azi, cele mai noi primele. Pe cache cald (L1) nu atinge
+    nicio bază de date, nici pe cea a cache-ului comun.
+    """
+    ring_key = _ring_key(user_id)
+    local = local_cache()
+    raw = local.get(ring_key) if local is not None else None
+    if raw is None:
+        raw = cache.get(ring_key)
+        if raw is None:
+            raw = _warm_ring(user_id)
+        if local is not None:
+            local.set(ring_key, raw, timeout=local_timeout())
+    today = timezone.localdate().toordinal()
+    return [product_id for product_id, day in _ring_pairs(raw) if day == today]
+
+
+def buffered_views(user_id: int) -> Dict[int, datetime]:
+    return dict(
+        PendingProductView.objects.filter(user_id=user_id)
+        .values("product_id")
+        .annotate(last=Max("viewed_at"))
+        .values_list("product_id", "last")
+    )
+
+
+def flush_views(user_ids: Iterable[int] | None = None) -> int:
+    """
+    Scrie vizualizările în așteptare cu un singur upsert și taie istoricul la ultimele
+    MAX_RECENT_VIEWS printr-un singur DELETE. Vizualizările unor useri sau produse
+    șterse între timp sunt ignorate; rândurile din așteptare sunt șterse doar după
+    commit. Întoarce nr. de rânduri scrise.
+    """
+    pending = PendingProductView.objects.all()
+    if user_ids is not None:
+        pending = pending.filter(user_id__in=list(user_ids))
+    last_id = pending.aggregate(last=Max("id"))["last"]
+    if last_id is None:
+        return 0
+    batch = pending.filter(id__lte=last_id)
+    latest = {
+        (user_id, product_id): viewed_at
+        for user_id, product_id, viewed_at in batch.values("user_id", "product_id")
+        .annotate(last=Max("viewed_at"))
+        .values_list("user_id", "product_id", "last")
+    }
+    users = set(
+        get_user_model().objects.filter(pk__in={uid for uid, _ in latest}).values_list("pk", flat=True)
+    )
+    products = set(
+        Product.objects.filter(pk__in={pid for _, pid in latest}).values_list("pk", flat=True)
+    )
+    rows = [
+        ProductView(user_id=uid, product_id=pid, viewed_at=viewed_at)
+        for (uid, pid), viewed_at in latest.items()
+        if uid in users and pid in products
+    ]
+    if rows:
+        with transaction.atomic():
+            ProductView.objects.bulk_create(
+                rows,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["user", "product"],
+                update_fields=["viewed_at"],
+            )
+            trim_views({row.user_id for row in rows})
+    batch.delete()
+    if len(rows) != len(latest):
+        logger.debug("Ignorate %s vizualizari pentru useri/produse sterse", len(latest) - len(rows))
+    logger.debug("Flush vizualizari: %s randuri", len(rows))
+    return len(rows)
+
+
+def trim_views(user_ids: Iterable[int], keep: int = MAX_RECENT_VIEWS) -> int:
+    nth_newest = (
+        ProductView.objects.filter(user_id=OuterRef("user_id"))
+        .order_by("-viewed_at")
+        .values("viewed_at")[keep - 1 : keep]
+    )
+    deleted, _ = ProductView.objects.filter(
+        user_id__in=list(user_ids),
+        viewed_at__lt=Subquery(nth_newest),
+    ).delete()
+    return deleted
@@ -3,23 +3,24 @@ from __future__ import annotations
 import json
 import logging
 from datetime import datetime, time, timedelta
-from decimal import Decimal
 from pathlib import Path
 from typing import Any, Dict, List
 
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.db import connection
-from django.db.models import Count
+from django.db import connections, router
+from django.db.models import Count, prefetch_related_objects
 from django.core.cache import cache
-from django.core.mail import send_mail, send_mass_mail
-from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
+from django.core.mail import EmailMessage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
 from django.utils.safestring import mark_safe
 from django.views.decorators.http import require_POST
 from django.views.generic import DetailView, ListView, TemplateView
@@ -36,7 +37,7 @@ from .models import (
     Brand,
     Category,
     Product,
-    ProductView,
+    ProductRecommendation,
     Promotion,
     Purchase,
     Nota,
@@ -44,12 +45,20 @@ from .models import (
     RequestLog,
     Tutorial,
 )
+from .cart_summary import get_cart_summary, invalidate_cart_summary
+from .conditional import ConditionalGetMixin, catalog_state
+from .outbox import enqueue_mail
+from .permissions import user_can, user_in_group
+from .ratelimit import ratelimit
+from .recipients import enqueue_promotion
+from .routers import catalog_db
+from .sitemap_build import INDEX_NAME, section_file, sitemap_root
 from .utils import Accesare, get_request_count
+from .view_tracking import record_view
 
 
 logger = logging.getLogger("django")
 
-MAX_RECENT_VIEWS = 5
 MIN_VIEWS_FOR_PROMO = 2
 
 PROMO_TEMPLATES = {
@@ -88,8 +97,7 @@ def custom_403(request: HttpRequest, exception=None) -> HttpResponse:
 
 def _is_site_admin(user) -> bool:
     return user.is_authenticated and (
-        user.is_superuser
-        or user.groups.filter(name="Administratori_site").exists()
+        user.is_superuser or user_in_group(user, "Administratori_site")
     )
 
 
@@ -207,7 +215,7 @@ class AboutView(TemplateView):
         return context
 
 
-class ProductsListView(ListView):
+class ProductsListView(ConditionalGetMixin, ListView):
     template_name = "hardware/catalog_list.html"
     context_object_name = "products"
     paginate_by = ProductFilterForm.DEFAULT_PER_PAGE
@@ -259,7 +267,8 @@ class ProductsListView(ListView):
 
     def get_queryset(self):
         queryset = (
-            Product.objects.select_related("category", "brand")
+            Product.objects.using(catalog_db())
+            .select_related("category", "brand")
             .prefetch_related("materials")
         )
         if self.current_category:
@@ -378,6 +387,21 @@ class ProductsListView(ListView):
     def get_paginate_by(self, queryset):
         return self.per_page or self.form_class.DEFAULT_PER_PAGE
 
+    def page_validators(self):
+        # per_page și categoria din query au efecte (cache, mesaje) la randare
+        if "per_page" in self.request.GET or "category" in self.request.GET:
+            return None
+        # filtrele din query și per_page memorat; produsele, categoriile etc. intră prin
+        # versiunea catalogului
+        owner = self.current_category or self.current_brand
+        parts = [
+            sorted(self.request.GET.lists()),
+            cache.get(_per_page_cache_key(self.request)),
+            owner._meta.label_lower if owner is not None else None,
+            owner.pk if owner is not None else None,
+        ]
+        return [*parts, *catalog_state()], None
+
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
         cart = _get_cart(self.request)
@@ -451,16 +475,40 @@ class BrandProductsView(ProductsListView):
         )
 
 
-class ProductDetailView(DetailView):
+class ProductDetailView(ConditionalGetMixin, DetailView):
     template_name = "hardware/product_detail.html"
     context_object_name = "product"
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    prefetch = ("materials", "accessories", "tutorials")
+    _product = None
+
+    def page_validators(self):
+        # un singur SELECT; același obiect e folosit și la randare (get_object)
+        self._product = (
+            Product.objects.select_related("category", "brand")
+            .filter(slug=self.kwargs["slug"], available=True)
+            .first()
+        )
+        if self._product is None:
+            return None
+        return [self._product.pk, self._product.updated_at, *catalog_state()], self._product.updated_at
+
+    def before_conditional(self) -> None:
+        if self.request.user.is_authenticated:
+            record_view(self.request.user.id, self._product.pk)
+
+    def get_object(self, queryset=None):
+        if self._product is None:
+            return super().get_object(queryset)
+        prefetch_related_objects([self._product], *self.prefetch)
+        return self._product
+
     def get_queryset(self):
         return (
             Product.objects.select_related("category", "brand")
-            .prefetch_related("materials", "accessories", "tutorials")
+            .prefetch_related(*self.prefetch)
             .filter(available=True)
         )
 
@@ -472,35 +520,30 @@ class ProductDetailView(DetailView):
         entry = cart.get(str(self.object.pk))
         context["in_cart"] = bool(entry)
         context["cart_qty"] = int(entry.get("qty", 0)) if entry else 0
-        if self.request.user.is_authenticated:
-            _record_product_view(self.request.user, self.object)
+        recommendations = list(
+            ProductRecommendation.objects.filter(
+                product=self.object, recommended__available=True
+            ).select_related("recommended")
+        )
+        context["bought_together"] = [
+            rec.recommended
+            for rec in recommendations
+            if rec.kind == ProductRecommendation.Kind.BOUGHT_TOGETHER
+        ]
+        context["also_viewed"] = [
+            rec.recommended
+            for rec in recommendations
+            if rec.kind == ProductRecommendation.Kind.ALSO_VIEWED
+        ]
         return context
 
 
-def _record_product_view(user, product: Product) -> None:
-    view, created = ProductView.objects.get_or_create(
-        user=user,
-        product=product,
-        defaults={"viewed_at": timezone.now()},
-    )
-    if not created:
-        view.viewed_at = timezone.now()
-        view.save(update_fields=["viewed_at"])
-    logger.debug("Vizualizare produs inregistrata: %s / %s", user.username, product.slug)
-
-    views = ProductView.objects.filter(user=user).order_by("-viewed_at")
-    if views.count() > MAX_RECENT_VIEWS:
-        for stale in views[MAX_RECENT_VIEWS:]:
-            stale.delete()
-        logger.info("Curatate vizualizari vechi pentru user %s", user.username)
-
-
 class ProductCreateView(FormView):
     template_name = "hardware/product_create.html"
     form_class = ProductCreateForm
 
     def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
-        if not request.user.has_perm("hardware.add_product"):
+        if not user_can(request.user, "hardware.add_product"):
             return render_403(
                 request,
                 titlu="Eroare adaugare produse",
@@ -523,9 +566,7 @@ def interzis(request: HttpRequest) -> HttpResponse:
 
 
 def oferta(request: HttpRequest) -> HttpResponse:
-    if not request.user.is_authenticated or not request.user.has_perm(
-        "hardware.vizualizeaza_oferta"
-    ):
+    if not user_can(request.user, "hardware.vizualizeaza_oferta"):
         return render_403(
             request,
             titlu="Eroare afisare oferta",
@@ -541,6 +582,8 @@ def accepta_oferta(request: HttpRequest) -> HttpResponse:
             titlu="Eroare afisare oferta",
             mesaj_personalizat="Nu ai voie să vizualizezi oferta.",
         )
+    if user_can(request.user, "hardware.vizualizeaza_oferta"):
+        return redirect("hardware:oferta")
     from django.contrib.auth.models import Permission
 
     perm = Permission.objects.filter(codename="vizualizeaza_oferta").first()
@@ -576,28 +619,11 @@ class PromotionView(FormView):
         promotion.categories.set(categories)
 
         sender = getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@example.com")
-        emails = []
-        User = get_user_model()
+        bodies = {}
         for category in categories:
             template_name = PROMO_TEMPLATES.get(category.slug)
             if not template_name:
                 continue
-            user_ids = (
-                ProductView.objects.filter(product__category=category)
-                .values("user")
-                .annotate(cnt=Count("id"))
-                .filter(cnt__gte=MIN_VIEWS_FOR_PROMO)
-                .values_list("user", flat=True)
-            )
-            recipients = list(
-                User.objects.filter(id__in=user_ids, email_confirmat=True)
-                .exclude(email="")
-                .values_list("email", flat=True)
-            )
-            logger.debug("Categorie %s are %s destinatari", category.slug, len(recipients))
-            if not recipients:
-                logger.warning("Nu exista destinatari pentru categoria %s", category.slug)
-                continue
             context = {
                 "subject": data["subject"],
                 "expires_at": expires_at,
@@ -606,12 +632,24 @@ class PromotionView(FormView):
                 "coupon_code": data["coupon_code"],
                 "category": category,
             }
-            body = render_to_string(template_name, context)
-            emails.append((data["subject"], body, sender, recipients))
-
-        if emails:
-            send_mass_mail(tuple(emails), fail_silently=False)
-            logger.info("Promotii trimise catre %s categorii", len(emails))
+            bodies[category.id] = render_to_string(template_name, context)
+
+        per_category = enqueue_promotion(
+            bodies,
+            MIN_VIEWS_FOR_PROMO,
+            lambda category_id, email: EmailMessage(
+                data["subject"], bodies[category_id], sender, [email]
+            ),
+        )
+        for category in categories:
+            if category.id in bodies and not per_category.get(category.id):
+                logger.warning("Nu exista destinatari pentru categoria %s", category.slug)
+        if per_category:
+            logger.info(
+                "Promotie pusa in coada pentru %s destinatari din %s categorii",
+                sum(per_category.values()),
+                len(per_category),
+            )
         else:
             logger.warning("Nu s-au trimis promotii (fara destinatari).")
 
@@ -626,6 +664,7 @@ def _get_cart(request: HttpRequest) -> Dict[str, Dict[str, Any]]:
 def _save_cart(request: HttpRequest, cart: Dict[str, Dict[str, Any]]) -> None:
     request.session["cart"] = cart
     request.session.modified = True
+    invalidate_cart_summary(request.session.session_key)
 
 
 def _redirect_back(request: HttpRequest) -> HttpResponse:
@@ -635,62 +674,16 @@ def _redirect_back(request: HttpRequest) -> HttpResponse:
 
 def cart_detail(request: HttpRequest) -> HttpResponse:
     cart = _get_cart(request)
-    items = []
-    total = Decimal("0")
-    product_ids = [int(pid) for pid in cart.keys() if str(pid).isdigit()]
-    products_map = {
-        product.id: product
-        for product in Product.objects.filter(id__in=product_ids)
-    }
-    missing_ids = [pid for pid in product_ids if pid not in products_map]
-    if missing_ids:
-        for pid in missing_ids:
-            cart.pop(str(pid), None)
-        _save_cart(request, cart)
-        messages.warning(request, "Unele produse nu mai sunt disponibile și au fost scoase din coș.")
-
-    cart_updated = False
-    for product_id, entry in list(cart.items()):
-        product = products_map.get(int(product_id))
-        if not product:
-            continue
-        price = Decimal(str(entry.get("price", "0")))
-        qty = int(entry.get("qty", 0))
-        if product.stock <= 0:
-            cart.pop(str(product_id), None)
-            cart_updated = True
-            messages.warning(
-                request,
-                f"{product.name} nu mai este in stoc si a fost scos din cos.",
-            )
-            continue
-        if qty > product.stock:
-            qty = product.stock
-            cart[str(product_id)]["qty"] = qty
-            cart_updated = True
-            messages.warning(
-                request,
-                f"Stoc insuficient pentru {product.name}. Cantitatea a fost ajustata la {qty}.",
-            )
-        subtotal = price * qty
-        total += subtotal
-        items.append(
-            {
-                "product_id": int(product_id),
-                "name": product.name,
-                "slug": product.slug,
-                "price": price,
-                "qty": qty,
-                "subtotal": subtotal,
-                "stock": product.stock,
-            }
-        )
-    if cart_updated:
-        _save_cart(request, cart)
+    summary, notices, cart_changed = get_cart_summary(request.session.session_key, cart)
+    for level, text in notices:
+        getattr(messages, level)(request, text)
+    if cart_changed:
+        request.session["cart"] = cart
+        request.session.modified = True
 
     context = {
-        "items": items,
-        "total": total,
+        "items": summary["items"],
+        "total": summary["total"],
     }
     return render(request, "hardware/cart.html", context)
 
@@ -902,6 +895,7 @@ def rate_product(request: HttpRequest, product_id: int, rating: int) -> HttpResp
     return redirect("hardware:product_detail", slug=product.slug)
 
 
+@method_decorator(ratelimit("contact"), name="dispatch")
 class ContactView(FormView):
     template_name = "hardware/contact.html"
     form_class = ContactForm
@@ -931,7 +925,7 @@ class ContactView(FormView):
             body_lines.append(f"Vârstă: {data['age_display']}")
         body_lines.append("")
         body_lines.append(message_text)
-        send_mail(subject, "\n".join(body_lines), sender, [recipient])
+        enqueue_mail(subject, "\n".join(body_lines), sender, [recipient])
 
         messages_dir = Path(__file__).resolve().parent / "Mesaje"
         messages_dir.mkdir(parents=True, exist_ok=True)
@@ -984,12 +978,27 @@ class TutorialsListView(ListView):
         )
 
 
-class TutorialDetailView(DetailView):
+class TutorialDetailView(ConditionalGetMixin, DetailView):
     template_name = "hardware/tutorial_detail.html"
     context_object_name = "tutorial"
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    _tutorial = None
+
+    def page_validators(self):
+        self._tutorial = Tutorial.objects.filter(slug=self.kwargs["slug"]).first()
+        if self._tutorial is None:
+            return None
+        parts = [self._tutorial.pk, self._tutorial.updated_at, *catalog_state()]
+        return parts, self._tutorial.updated_at
+
+    def get_object(self, queryset=None):
+        if self._tutorial is None:
+            return super().get_object(queryset)
+        prefetch_related_objects([self._tutorial], "products")
+        return self._tutorial
+
     def get_queryset(self):
         return Tutorial.objects.prefetch_related("products")
 
@@ -1139,7 +1148,7 @@ def log_view(request: HttpRequest) -> HttpResponse:
             )
 
     accesari_list = [Accesare.from_request_log(log) for log in selected_logs]
-    sql_queries = connection.queries if sql_enabled else []
+    sql_queries = connections[router.db_for_read(RequestLog)].queries if sql_enabled else []
     sql_total = len(sql_queries) * len(accesari_list)
 
     table_param = params.get("tabel")
@@ -1233,3 +1242,38 @@ def info(request: HttpRequest) -> HttpResponse:
         ],
     }
     return render(request, "hardware/info.html", context)
+
+
+SITEMAP_RETRY_AFTER = 60
+
+
+def sitemap_file(request: HttpRequest, section: str | None = None, page: int | None = None):
+    """
+    Servește sitemap-urile generate pe disc de scheduler (varianta .gz dacă clientul
+    o acceptă), cu ETag/Last-Modified pentru cereri condiționale. Cererile nu
+    generează nimic: până la prima rulare a taskului se răspunde cu 503.
+    """
+    name = INDEX_NAME if section is None else section_file(section, page)
+    path = sitemap_root() / name
+    if section is None and not path.exists():
+        response = HttpResponse(
+            "Sitemap-ul este in curs de generare.", status=503, content_type="text/plain"
+        )
+        response["Retry-After"] = str(SITEMAP_RETRY_AFTER)
+        return response
+    if not path.exists():
+        raise Http404("Sitemap inexistent.")
+    compressed = path.with_name(f"{name}.gz")
+    use_gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "") and compressed.exists()
+    served = compressed if use_gzip else path
+    stat = served.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        response = FileResponse(served.open("rb"), content_type="application/xml", filename=name)
+        if use_gzip:
+            response["Content-Encoding"] = "gzip"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response